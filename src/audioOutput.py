@@ -0,0 +1,159 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+import numpy as np
+import sounddevice as sd
+
+import constants as const
+
+
+class _Clip:
+    __slots__ = ("priority", "seq", "data", "pos", "fade_in", "queued_at", "done", "on_start")
+
+    def __init__(self, priority, seq, data, on_start=None):
+        self.priority = priority
+        self.seq = seq
+        self.data = data
+        self.pos = 0
+        self.fade_in = False
+        self.queued_at = time.monotonic()
+        self.done = threading.Event()
+        self.on_start = on_start
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class AudioOutput:
+    """Відтворює звук через один постійно відкритий потік з чергою кліпів за пріоритетом
+
+    Правила черги:
+    - кліпи з однаковим пріоритетом грають по черзі, у порядку надходження;
+    - кліп з вищим пріоритетом (будильник над відповіддю, відповідь над проміжними фразами) перериває поточний:
+      той плавно затихає за один блок і повертається в чергу, а потім продовжується трохи раніше місця зупинки;
+    - проміжна фраза, яка чекала в черзі довше за AUDIO_CHATTER_TTL, вже неактуальна і пропускається із записом
+      в журнал.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Separate from _lock, which the audio callback takes, so opening a device never stalls playback
+        self._open_lock = threading.Lock()
+        self._queue = []
+        self._current = None
+        self._stream = None
+        self._samplerate = None
+        self._channels = None
+        self._seq = itertools.count()
+
+    def _ensure_stream(self):
+        if self._stream is not None:
+            return
+        with self._open_lock:
+            # Two clips may arrive at once (a reply and a reminder); only the first one opens the stream
+            if self._stream is not None:
+                return
+            device = sd.query_devices(kind="output")
+            self._samplerate = int(device["default_samplerate"])
+            self._channels = max(1, min(2, device["max_output_channels"]))
+            stream = sd.OutputStream(samplerate=self._samplerate, channels=self._channels, dtype="float32",
+                                     blocksize=const.AUDIO_BLOCKSIZE, callback=self._callback)
+            stream.start()
+            self._stream = stream
+        logging.info("Audio output stream opened at %d Hz, %d channel(s).", self._samplerate, self._channels)
+
+    def _prepare(self, data, samplerate):
+        """Один раз переводить кліп у частоту і кількість каналів пристрою"""
+        data = np.asarray(data, dtype=np.float32)
+        if data.ndim == 1:
+            data = data[:, np.newaxis]
+        if samplerate != self._samplerate and len(data):
+            length = int(round(len(data) * self._samplerate / samplerate))
+            source_t = np.arange(len(data)) / samplerate
+            target_t = np.arange(length) / self._samplerate
+            data = np.stack([np.interp(target_t, source_t, data[:, ch]) for ch in range(data.shape[1])], axis=1)
+        if data.shape[1] != self._channels:
+            data = np.repeat(data.mean(axis=1, keepdims=True), self._channels, axis=1)
+        return np.ascontiguousarray(data, dtype=np.float32)
+
+    def play(self, data, samplerate, priority=const.AUDIO_PRIORITY_REPLY, on_start=None):
+        """Ставить кліп у чергу і повертає подію, яка встановиться після його відтворення
+
+        on_start викликається з потоку відтворення, коли кліп починає звучати, тож має бути швидким.
+        """
+        self._ensure_stream()
+        clip = _Clip(priority, next(self._seq), self._prepare(data, samplerate), on_start)
+        with self._lock:
+            heapq.heappush(self._queue, clip)
+        return clip.done
+
+    def is_active(self):
+        with self._lock:
+            return self._current is not None or bool(self._queue)
+
+    def stop(self):
+        """Зупиняє поточний кліп і очищає чергу"""
+        with self._lock:
+            clips = self._queue + ([self._current] if self._current else [])
+            self._queue.clear()
+            self._current = None
+        for clip in clips:
+            clip.done.set()
+
+    def close(self):
+        self.stop()
+        with self._open_lock:
+            if self._stream is not None:
+                self._stream.stop()
+                self._stream.close()
+                self._stream = None
+
+    def _next_clip(self):
+        while self._queue:
+            clip = heapq.heappop(self._queue)
+            if (clip.priority == const.AUDIO_PRIORITY_CHATTER and clip.pos == 0
+                    and time.monotonic() - clip.queued_at > const.AUDIO_CHATTER_TTL):
+                logging.info("Dropped stale chatter clip that waited %.1fs.", time.monotonic() - clip.queued_at)
+                clip.done.set()
+                continue
+            if clip.on_start is not None:
+                clip.on_start()
+                clip.on_start = None
+            return clip
+        return None
+
+    def _callback(self, outdata, frames, time_info, status):
+        outdata.fill(0)
+        with self._lock:
+            current = self._current
+            if current is not None and self._queue and self._queue[0].priority < current.priority:
+                # Fade the preempted clip out over this block and resume it slightly earlier later on
+                n = min(frames, len(current.data) - current.pos)
+                ramp = np.linspace(1.0, 0.0, n, dtype=np.float32)[:, np.newaxis]
+                outdata[:n] = current.data[current.pos:current.pos + n] * ramp
+                current.pos = max(0, current.pos + n - int(const.AUDIO_RESUME_REWIND * self._samplerate))
+                current.fade_in = True
+                heapq.heappush(self._queue, current)
+                self._current = None
+                return
+
+            filled = 0
+            while filled < frames:
+                if current is None:
+                    current = self._current = self._next_clip()
+                    if current is None:
+                        break
+                n = min(frames - filled, len(current.data) - current.pos)
+                chunk = current.data[current.pos:current.pos + n]
+                if current.fade_in:
+                    chunk = chunk * np.linspace(0.0, 1.0, n, dtype=np.float32)[:, np.newaxis]
+                    current.fade_in = False
+                outdata[filled:filled + n] = chunk
+                current.pos += n
+                filled += n
+                if current.pos >= len(current.data):
+                    current.done.set()
+                    current = self._current = None
@@ -1,12 +1,18 @@
 import asyncio
+import contextvars
+import hashlib
+import importlib.util
+import io
 import json
 import logging
 import os
 import random
 import re
 import sys
+import threading
+import time
 import webbrowser
-from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
 from ctypes import cast, POINTER
 from datetime import datetime
 from datetime import timedelta
@@ -15,80 +21,128 @@ from urllib.parse import quote_plus
 import geocoder
 import psutil
 import pyautogui
+import pyperclip
 import python_weather
 import requests
-import sounddevice as sd
 import soundfile as sf
 import speech_recognition as sr
 from bs4 import BeautifulSoup
+import comtypes
 from comtypes import CLSCTX_ALL
 from gtts import gTTS
 from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 
+import calculator
 import constants as const
-from constants import CMD_CHANGE_ACCENT_COLOR
-
-executor = ThreadPoolExecutor(max_workers=const.MAX_WORKERS)
+import events
+import executors
+import messages
+import metrics
+from processLauncher import ProcessLauncher
+from profiler import CommandProfiler
+import numberWords
+import textNormalizer
+import tracing
+from audioOutput import AudioOutput
+from chatIndex import ChatIndex
+from commandScheduler import CommandScheduler, ResourceBusy
+from scheduler import Scheduler
+from supervisor import TaskSupervisor
+from systemMonitor import SystemMonitor
+from watchdog import LoopWatchdog
 
 _PROGRAMS_CACHE = None
 _PROGRAMS_CACHE_LOCK = asyncio.Lock()
+_CHAT_SEARCH_REPLY_PREFIX = const.RESPONSE_CHAT_SEARCH_RESULTS.split("{}")[0]
+
+supervisor = TaskSupervisor()
+scheduler = Scheduler(supervisor)
+process_launcher = ProcessLauncher(supervisor)
+chat_index = ChatIndex()
+system_monitor = SystemMonitor()
+audio_output = AudioOutput()
+command_profiler = CommandProfiler()
+command_scheduler = CommandScheduler()
+metrics_exporter = metrics.MetricsExporter()
+loop_watchdog = LoopWatchdog()
+
+
+def _lane_metric(attribute):
+    return lambda: {name: getattr(lane, attribute) for name, lane in executors.LANES.items()}
+
+
+# Values that already live elsewhere are read only when metrics are scraped
+metrics.REGISTRY.gauge("avrora_executor_queued_tasks", "Tasks waiting for a worker, by executor lane.", ("lane",),
+                       fn=_lane_metric("queued"))
+metrics.REGISTRY.gauge("avrora_executor_active_tasks", "Tasks running right now, by executor lane.", ("lane",),
+                       fn=_lane_metric("active"))
+metrics.REGISTRY.counter("avrora_executor_failed_tasks_total", "Tasks that raised, by executor lane.", ("lane",),
+                         fn=_lane_metric("failed"))
+metrics.REGISTRY.counter("avrora_executor_busy_seconds_total", "Time spent running tasks, by executor lane.",
+                         ("lane",), fn=_lane_metric("busy_time"))
+metrics.REGISTRY.gauge("avrora_chat_index_messages", "Messages in the chat search index.", fn=lambda: len(chat_index))
+metrics.REGISTRY.gauge("avrora_scheduled_jobs", "Pending reminders and alarms.", fn=lambda: len(scheduler.pending()))
+metrics.REGISTRY.gauge("avrora_background_tasks", "Live supervised tasks, by category.", ("category",),
+                       fn=lambda: {category: stats["live"] for category, stats in supervisor.stats().items()})
+metrics.REGISTRY.gauge("avrora_background_task_oldest_seconds", "Age of the oldest live task, by category.",
+                       ("category",),
+                       fn=lambda: {category: stats["oldest"] for category, stats in supervisor.stats().items()})
+metrics.REGISTRY.gauge("avrora_command_queue_waiting", "Commands waiting for a resource, by resource.",
+                       ("resource",),
+                       fn=lambda: {name: stats["waiting"] for name, stats in command_scheduler.stats().items()})
+metrics.REGISTRY.gauge("avrora_launched_processes", "Launched programs that are still running.",
+                       fn=lambda: len(process_launcher.running()))
+metrics.REGISTRY.gauge("avrora_audio_playing", "1 while speech or an alarm is playing.",
+                       fn=lambda: int(audio_output.is_active()))
+
+# The bus of the client that issued the current command; tasks started from it inherit it
+_event_bus = contextvars.ContextVar("event_bus", default=None)
+
+# While several intents run at once, each one collects its replies here instead of speaking over the others
+_speech_capture = contextvars.ContextVar("speech_capture", default=None)
 
 
 async def run_command(command):
-    """Виконує команду для терміналу"""
-    logging.info(f"Executing system command: '{command}'")
-    loop = asyncio.get_running_loop()
-    process = await loop.run_in_executor(executor, os.system, command)
-    logging.info(f"Command '{command}' finished with exit code {process}.")
-    return process
+    """Запускає команду для терміналу окремо від асистента, не чекаючи її завершення"""
+    logging.info("Executing system command: '%s'", command)
+    return await process_launcher.launch(command)
 
 
 async def timer(duration, thing):
     """Запускає таймер"""
-    logging.info(f"Starting timer for {duration} seconds for: {thing}")
+    logging.info("Starting timer for %s seconds for: %s", duration, thing)
     await asyncio.sleep(duration)
-    logging.info(f"Timer finished for: {thing}")
+    logging.info("Timer finished for: %s", thing)
     return thing
 
 
 def uk_to_en(text):
     """Перетворює символи кирилиці в латинницю"""
-    logging.info(f"Converting Ukrainian text to English: '{text}'")
-    result = ""
-    for symbol in text:
-        en_symbol = const.KEYS_EN.get(symbol)
-        if en_symbol:
-            result += en_symbol
-        else:
-            result += symbol
-    logging.info(f"Converted to English: '{result}'")
-    return result
+    return textNormalizer.to_keyboard_layout(text)
 
 
 async def save_settings(settings, filename=const.SETTINGS_FILENAME):
-    logging.info(f"Saving settings to {filename}.")
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(executor, _save_settings, settings, filename)
+    logging.info("Saving settings to %s.", filename)
+    await executors.IO.run(_save_settings, settings, filename)
 
 
 def _save_settings(settings, filename):
     """Зберігає налаштування"""
-    logging.debug(f"Writing settings to {filename}: {settings}")
+    logging.debug("Writing settings to %s.", filename)
     with open(filename, "w") as file:
         json.dump(settings, file)
 
 
 async def load_settings(filename=const.SETTINGS_FILENAME):
     logging.info("Loading settings.")
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(executor, _load_settings, filename)
+    return await executors.IO.run(_load_settings, filename)
 
 
 def _load_settings(filename):
     """Завантажує налаштування"""
     defaults = {"name": const.DEFAULT_NAME, "tgo": False, "tgpath": const.DEFAULT_TG_PATH,
                 "music": const.DEFAULT_MUSIC_LINK, "pcpower": False, "city": const.DEFAULT_CITY, "num_headlines": 5,
-                "theme": const.DEFAULT_THEME, "silentmode": False}
+                "theme": const.DEFAULT_THEME, "silentmode": False, "pastetext": True, "profiling": False}
     if os.path.exists(filename):
         try:
             with open(filename, "r", encoding="utf-8") as file:
@@ -96,16 +150,18 @@ def _load_settings(filename):
                 if not isinstance(settings, dict):
                     settings = {}
         except (json.JSONDecodeError, OSError) as e:
-            logging.error(f"Failed to load or parse settings from {filename}: {e}", exc_info=True)
+            logging.error("Failed to load or parse settings from %s: %s", filename, e, exc_info=True)
             settings = {}
     else:
-        logging.info(f"Settings file {filename} not found, using defaults.")
+        logging.info("Settings file %s not found, using defaults.", filename)
         settings = {}
 
     final_settings = defaults.copy()
     final_settings.update(settings)
 
-    logging.info(f"Settings loaded: {final_settings}")
+    logging.info("Settings loaded.")
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("Settings: %s", json.dumps(final_settings, ensure_ascii=False))
     if final_settings != settings:
         _save_settings(final_settings, filename)
 
@@ -113,8 +169,7 @@ def _load_settings(filename):
 
 
 async def save_cc(command, filename=const.CUSTOM_COMMANDS_FILENAME):
-    loop = asyncio.get_running_loop()
-    await loop.run_in_executor(executor, _save_cc, command, filename)
+    await executors.IO.run(_save_cc, command, filename)
 
 
 def _save_cc(command, filename):
@@ -124,8 +179,7 @@ def _save_cc(command, filename):
 
 
 async def load_cc(filename=const.CUSTOM_COMMANDS_FILENAME):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(executor, _load_cc, filename)
+    return await executors.IO.run(_load_cc, filename)
 
 
 def _load_cc(filename):
@@ -136,6 +190,49 @@ def _load_cc(filename):
     return {}
 
 
+async def load_commands_table():
+    """Повертає таблицю команд для довідки разом із власними командами користувача"""
+    table = await executors.IO.run(_load_commands_table, const.DEFAULT_INFO_TABLE_FILENAME, const.INFO_TABLE_FILENAME)
+    custom = await load_cc()
+    return {**table, **{name: const.INFO_TABLE_CUSTOM_ACTION.format(action) for name, action in custom.items()}}
+
+
+def _load_commands_table(default_filename, cache_filename):
+    """Читає таблицю команд з кешу і розбирає вбудований файл лише тоді, коли змінився його вміст"""
+    try:
+        with open(default_filename, "rb") as f:
+            raw = f.read()
+    except OSError as e:
+        logging.error(f"Could not read default commands table: {e}")
+        return {}
+    digest = hashlib.sha256(raw).hexdigest()
+
+    try:
+        with open(cache_filename, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if isinstance(cache, dict) and cache.get("hash") == digest and isinstance(cache.get("commands"), dict):
+            metrics.CACHE_REQUESTS.inc(cache="commands_table", result="hit")
+            return cache["commands"]
+    except (OSError, json.JSONDecodeError):
+        pass
+    metrics.CACHE_REQUESTS.inc(cache="commands_table", result="miss")
+
+    logging.info("Commands table cache is missing or outdated. Rebuilding it.")
+    try:
+        commands = json.loads(raw.decode("utf-8"))
+        if not isinstance(commands, dict):
+            raise ValueError("top-level value is not an object")
+    except ValueError as e:
+        logging.error(f"Default commands table {default_filename} has invalid format: {e}")
+        return {}
+    try:
+        with open(cache_filename, "w", encoding="utf-8") as f:
+            json.dump({"hash": digest, "commands": commands}, f, ensure_ascii=False)
+    except OSError as e:
+        logging.error(f"Could not write commands table cache to {cache_filename}: {e}", exc_info=True)
+    return commands
+
+
 def _get_start_menu_dirs():
     """Отримує шляхи до користувача і стандартних каталогів з програмами"""
     if sys.platform != "win32":
@@ -170,22 +267,22 @@ async def find_installed_programs():
     """Знаходить завантаженні програми"""
     global _PROGRAMS_CACHE
     async with _PROGRAMS_CACHE_LOCK:
+        metrics.CACHE_REQUESTS.inc(cache="programs", result="miss" if _PROGRAMS_CACHE is None else "hit")
         if _PROGRAMS_CACHE is None:
             logging.info("Scanning for installed programs...")
-            loop = asyncio.get_running_loop()
-            _PROGRAMS_CACHE = await loop.run_in_executor(executor, _scan_programs)
-            logging.info(f"Found {len(_PROGRAMS_CACHE)} programs.")
+            _PROGRAMS_CACHE = await executors.IO.run(_scan_programs)
+            logging.info("Found %d programs.", len(_PROGRAMS_CACHE))
         return _PROGRAMS_CACHE
 
 
 async def get_location():
     """Отримує інформацію про місцеперебування"""
     logging.info("Attempting to get location via geocoder.")
-    location = geocoder.ip(const.GEOCODER_IP_ME)
+    location = await executors.NETWORK.run(geocoder.ip, const.GEOCODER_IP_ME)
     if not location.city:
         logging.warning("Failed to determine city from IP.")
         return const.RESPONSE_LOCATION_FAILED
-    logging.info(f"Location determined: {location.city}, {location.country}")
+    logging.info("Location determined: %s, %s", location.city, location.country)
     return location
 
 
@@ -200,20 +297,24 @@ async def get_weather_info():
                 return const.RESPONSE_WEATHER_FAILED_NO_CITY
             city = location.city
         async with python_weather.Client(unit=python_weather.METRIC, locale=python_weather.Locale.UKRAINIAN) as client:
-            logging.info(f"Fetching weather for city: {city}")
-            weather = await client.get(city)
-
-            response = const.RESPONSE_WEATHER_FORECAST.format(city, weather.temperature, weather.description)
-            logging.info(f"Successfully fetched weather: {response}")
+            logging.info("Fetching weather for city: %s", city)
+            with tracing.span("network.weather"):
+                weather = await client.get(city)
+
+            response = messages.weather(
+                const.RESPONSE_WEATHER_FORECAST.format(city, weather.temperature, weather.description), city,
+                weather.temperature, weather.description)
+            logging.info("Successfully fetched weather: %s", response)
             return response
     except Exception as e:
-        logging.error(f"Error getting weather for city '{city}': {e}", exc_info=True)
+        logging.error("Error getting weather for city '%s': %s", city, e, exc_info=True)
+        metrics.NETWORK_ERRORS.inc(service="weather", kind="error")
         return const.RESPONSE_WEATHER_ERROR
 
 
 def _get_news_headlines(url="", class_name=""):
     """Отримує заголовки новин з інтернету"""
-    logging.info(f"Fetching news headlines from URL: {url} with class: {class_name}")
+    logging.info("Fetching news headlines from URL: %s with class: %s", url, class_name)
     try:
         response = requests.get(url)
         response.raise_for_status()
@@ -222,31 +323,31 @@ def _get_news_headlines(url="", class_name=""):
         for div in soup.find_all("div", {"class": class_name}):
             for a in div.find_all("a"):
                 titles.append(a.text)
-        logging.info(f"Found {len(titles)} headlines.")
+        logging.info("Found %d headlines.", len(titles))
         return titles
     except requests.RequestException as e:
-        logging.error(f"Network error while fetching news from {url}: {e}", exc_info=True)
+        logging.error("Network error while fetching news from %s: %s", url, e, exc_info=True)
+        metrics.NETWORK_ERRORS.inc(service="news", kind="network")
         return []
     except Exception as e:
-        logging.error(f"Error parsing news from {url}: {e}", exc_info=True)
+        logging.error("Error parsing news from %s: %s", url, e, exc_info=True)
+        metrics.NETWORK_ERRORS.inc(service="news", kind="parse")
         return []
 
 
 async def get_news_headlines(url="", class_name=""):
-    loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(executor, _get_news_headlines, url, class_name)
+    return await executors.NETWORK.run(_get_news_headlines, url, class_name)
 
 
 async def _get_first_youtube_video_url(query):
     """Шукає в YouTube і повертає URL першого відео, форматує для YouTube Music."""
     try:
         search_url = f"https://www.youtube.com/results?search_query={quote_plus(query)}"
-        logging.info(f"Searching YouTube with URL: {search_url}")
+        logging.info("Searching YouTube with URL: %s", search_url)
 
-        loop = asyncio.get_running_loop()
-        response = await loop.run_in_executor(executor, lambda: requests.get(search_url,
-                                                                             headers={'User-Agent': 'Mozilla/5.0',
-                                                                                      'Accept-Language': 'uk-UA,uk;q=0.9,en-US;q=0.8,en;q=0.7'}))
+        response = await executors.NETWORK.run(requests.get, search_url,
+                                               headers={'User-Agent': 'Mozilla/5.0',
+                                                        'Accept-Language': 'uk-UA,uk;q=0.9,en-US;q=0.8,en;q=0.7'})
         response.raise_for_status()
 
         html_content = response.text
@@ -254,6 +355,7 @@ async def _get_first_youtube_video_url(query):
         match = re.search(r"var ytInitialData = ({.*?});", html_content)
         if not match:
             logging.error("Could not find ytInitialData in YouTube search page. The page structure may have changed.")
+            metrics.NETWORK_ERRORS.inc(service="youtube", kind="parse")
             return None
 
         try:
@@ -269,56 +371,101 @@ async def _get_first_youtube_video_url(query):
                     for item in section['itemSectionRenderer']['contents']:
                         if 'videoRenderer' in item and 'videoId' in item['videoRenderer']:
                             video_id = item['videoRenderer']['videoId']
-                            logging.info(f"Found videoId: {video_id}")
+                            logging.info("Found videoId: %s", video_id)
                             break
                 if video_id:
                     break
 
             if video_id:
                 video_url = f"https://music.youtube.com/watch?v={video_id}"
-                logging.info(f"Created YouTube Music URL: {video_url}")
+                logging.info("Created YouTube Music URL: %s", video_url)
                 return video_url
             else:
-                logging.warning(f"No videoRenderer with a videoId found in ytInitialData for query '{query}'.")
+                logging.warning("No videoRenderer with a videoId found in ytInitialData for query '%s'.", query)
                 return None
 
         except (KeyError, IndexError, json.JSONDecodeError) as e:
-            logging.error(f"Error parsing ytInitialData JSON for query '{query}': {e}", exc_info=True)
-            logging.debug(f"ytInitialData structure might have changed. Data snippet: {data_str[:1000]}")
+            logging.error("Error parsing ytInitialData JSON for query '%s': %s", query, e, exc_info=True)
+            logging.debug("ytInitialData structure might have changed. Data snippet: %s", data_str[:1000])
+            metrics.NETWORK_ERRORS.inc(service="youtube", kind="parse")
             return None
 
     except requests.RequestException as e:
-        logging.error(f"Network error while searching YouTube for '{query}': {e}", exc_info=True)
+        logging.error("Network error while searching YouTube for '%s': %s", query, e, exc_info=True)
+        metrics.NETWORK_ERRORS.inc(service="youtube", kind="network")
         return None
     except Exception as e:
-        logging.error(f"An unexpected error occurred in _get_first_youtube_video_url for '{query}': {e}", exc_info=True)
+        logging.error("An unexpected error occurred in _get_first_youtube_video_url for '%s': %s", query, e,
+                      exc_info=True)
+        metrics.NETWORK_ERRORS.inc(service="youtube", kind="error")
         return None
 
 
-async def listen(on_status_change=None):
-    loop = asyncio.get_running_loop()
-    if on_status_change:
-        await on_status_change(const.STATUS_LISTENING)
-    result = await loop.run_in_executor(executor, _listen)
-    if on_status_change:
-        await on_status_change(const.STATUS_NONE)
+# Set on exit; the microphone stream then reads as ended, so a running listen returns within one audio chunk
+_listen_stop = threading.Event()
+
+
+class _StoppableStream:
+    """Потік мікрофона, який повертає порожній буфер (кінець запису), щойно попросили зупинити прослуховування"""
+
+    def __init__(self, stream, stop):
+        self._stream = stream
+        self._stop = stop
+
+    def read(self, size):
+        return b"" if self._stop.is_set() else self._stream.read(size)
+
+    def close(self):
+        self._stream.close()
+
+
+def stop_listening():
+    """Перериває поточне прослуховування і не дає почати нове; викликається під час виходу"""
+    _listen_stop.set()
+
+
+async def listen(show_status=True):
+    if show_status:
+        await publish(events.StatusChanged(const.STATUS_LISTENING))
+    result = await executors.AUDIO.run(_listen)
+    if show_status:
+        await publish(events.StatusChanged(const.STATUS_NONE))
     return result
 
 
 def _listen():
     """Записує мову з мікрофона та розпізнає її"""
+    if _listen_stop.is_set():
+        return ""
     recognizer = sr.Recognizer()
     with sr.Microphone() as source:
+        source.stream = _StoppableStream(source.stream, _listen_stop)
         logging.info("Adjusting for ambient noise.")
-        recognizer.adjust_for_ambient_noise(source, duration=0.8)
+        with tracing.span("calibrate"):
+            recognizer.adjust_for_ambient_noise(source, duration=0.8)
         recognizer.pause_threshold = const.PAUSE_THRESHOLD
+        # While our own voice plays, only speech clearly louder than it may start a phrase
+        over_playback = is_speaking()
+        if over_playback:
+            recognizer.energy_threshold *= const.BARGE_IN_ENERGY_FACTOR
         try:
             logging.info("Listening for audio...")
-            audio_data = recognizer.listen(source, timeout=5, phrase_time_limit=15)
+            # Voice activity detection and endpointing happen inside recognizer.listen
+            with tracing.span("capture", pause_threshold=recognizer.pause_threshold):
+                audio_data = recognizer.listen(source, timeout=5, phrase_time_limit=15)
+            if _listen_stop.is_set():
+                logging.info("Listening stopped.")
+                return ""
+            over_playback = over_playback or is_speaking()
             logging.info("Audio captured, recognizing...")
-            text = recognizer.recognize_google(audio_data, language=const.LANGUAGE)
-            logging.info(f"Recognized text: '{text.lower()}'")
-            return text.lower()
+            with tracing.span("asr"):
+                text = recognizer.recognize_google(audio_data, language=const.LANGUAGE)
+            logging.info("Recognized text: '%s'", text)
+            if over_playback and not textNormalizer.normalize(text).has_wake_word:
+                # Most likely our own voice picked up by the microphone, so it neither runs nor stops anything
+                logging.info("Ignoring speech captured over playback without the wake word.")
+                return ""
+            return text
         except sr.WaitTimeoutError:
             logging.debug("Listening timed out.")
             return ""
@@ -330,196 +477,526 @@ def _listen():
             return ""
 
 
-async def tts(text, output=const.TTS_OUTPUT, on_status_change=None):
+def use_bus(bus):
+    """Надсилає події поточної задачі та всіх задач, запущених з неї, на вказану шину"""
+    _event_bus.set(bus)
+
+
+async def publish(event):
+    bus = _event_bus.get()
+    if bus is not None:
+        await bus.publish(event)
+
+
+async def change_settings(**changes):
+    """Зберігає змінені налаштування і повідомляє інтерфейс лише про ті ключі, що справді змінилися"""
+    settings = await load_settings()
+    changed = {key: value for key, value in changes.items() if settings.get(key) != value}
+    if changed:
+        settings.update(changed)
+        await save_settings(settings)
+        await publish(events.SettingsChanged(changed))
+    return settings
+
+
+def _reload_response_templates():
+    """Виконує свіжу копію constants.py і підставляє з неї тексти відповідей
+
+    Нова копія виконується окремо, тож помилка в файлі не зачіпає поточні значення, а заміна відбувається одним
+    оновленням словника модуля. Шляхи, префікси команд та інші константи не змінюються до повного перезапуску.
+    """
+    source = getattr(const, "__file__", None)
+    if not source or not source.endswith(".py") or not os.path.exists(source):
+        logging.info("Constants are not loaded from source, keeping the current response templates.")
+        return 0
+    spec = importlib.util.spec_from_file_location("_constants_reload", source)
+    fresh = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(fresh)
+    templates = {name: value for name, value in vars(fresh).items()
+                 if name.startswith("RESPONSE_") or name == "GENERIC_AFFIRMATIVE_RESPONSES"}
+    vars(const).update(templates)
+    return len(templates)
+
+
+async def reload():
+    """Перечитує налаштування, власні команди, таблицю команд і тексти відповідей без перезапуску процесу"""
+    logging.info("Reloading configuration in process.")
+    # Lets reminders and other background work finish with the old settings before they are swapped
+    await supervisor.drain(const.TASK_RELOAD_DRAIN_CATEGORIES)
+    templates = await executors.IO.run(_reload_response_templates)
+    settings = await load_settings()
+    # Rebuilds the commands table cache right away if the bundled asset was edited
+    await load_commands_table()
+    await publish(events.ConfigReloaded(settings))
+    logging.info("Configuration reloaded, %d response templates refreshed.", templates)
+    return settings
+
+
+def is_speaking():
+    return audio_output.is_active()
+
+
+def stop_speaking():
+    """Зупиняє озвучення, яке зараз відтворюється, і очищає чергу"""
+    if is_speaking():
+        audio_output.stop()
+        logging.info("Playback stopped.")
+
+
+def capture_speech():
+    """Перемикає поточну задачу в режим, де озвучення збирається в список замість відтворення"""
+    spoken = []
+    _speech_capture.set(spoken)
+    return spoken
+
+
+async def interrupt(task):
+    """Перериває відповідь асистента: зупиняє озвучення і скасовує команду, що виконується"""
+    stop_speaking()
+    if task is None or task.done():
+        return
+    logging.info("Barge-in: cancelling the running command.")
+    task.cancel()
+    await asyncio.wait({task}, timeout=const.BARGE_IN_CANCEL_TIMEOUT)
+
+
+async def tts(text, priority=const.AUDIO_PRIORITY_REPLY):
+    captured = _speech_capture.get()
+    if captured is not None:
+        captured.append(text)
+        return
     settings = await load_settings()
     if not settings.get("silentmode", ""):
-        loop = asyncio.get_running_loop()
         logging.info("Avrora started talking.")
-        if on_status_change:
-            await on_status_change(const.STATUS_SPEAKING)
-        await loop.run_in_executor(executor, _tts, text, output)
-        if on_status_change:
-            await on_status_change(const.STATUS_NONE)
-            logging.info("Avrora stoped talking.")
+        await publish(events.StatusChanged(const.STATUS_SPEAKING))
+        await executors.AUDIO.run(_tts, text, priority)
+        await publish(events.StatusChanged(const.STATUS_NONE))
+        logging.info("Avrora stoped talking.")
     else:
         logging.info("Silent mode is open, stopping voice")
 
 
-def _tts(text, output):
+def _tts(text, priority):
     """Озвучує текст"""
+    buffer = io.BytesIO()
+    try:
+        with tracing.span("tts_synthesis", chars=len(text)):
+            gTTS(text=text, lang=const.TTS_LANGUAGE, slow=False).write_to_fp(buffer)
+    except Exception as e:
+        logging.error(f"Error generating TTS audio: {e}")
+        raise
+    if not buffer.tell():
+        raise RuntimeError("TTS audio is empty.")
+    buffer.seek(0)
+    try:
+        with tracing.span("tts_decode"):
+            data, fs = sf.read(buffer, dtype='float32')
+        playback = tracing.begin("playback_start", priority=priority)
+        audio_output.play(data, fs, priority, on_start=playback.end if playback else None)
+        logging.debug("TTS audio queued with priority %d.", priority)
+    except Exception as e:
+        logging.error(f"Error playing TTS audio: {e}")
+        raise e
+
+
+def _paste_text(text):
+    """Вставляє текст одним натисканням через буфер обміну, відновлюючи попередній вміст"""
+    try:
+        previous = pyperclip.paste()
+    except pyperclip.PyperclipException:
+        previous = None
+    pyperclip.copy(text)
+    try:
+        pyautogui.hotkey(*const.HOTKEY_PASTE)
+        # The target application reads the clipboard asynchronously after the keystroke
+        time.sleep(const.CLIPBOARD_RESTORE_DELAY)
+    finally:
+        if previous is not None:
+            pyperclip.copy(previous)
+
 
-    def _speak():
+async def _type_text(text):
+    """Набирає текст частинами, не блокуючи цикл подій"""
+    text = uk_to_en(text)
+    for i in range(0, len(text), const.TYPE_CHUNK_SIZE):
+        await executors.DESKTOP.run(pyautogui.typewrite, text[i:i + const.TYPE_CHUNK_SIZE],
+                                    interval=const.TYPE_INTERVAL)
+
+
+async def write_text(text, paste=True):
+    """Вводить текст в активне поле, за замовчуванням через буфер обміну"""
+    if paste:
         try:
-            ans = gTTS(text=text, lang=const.TTS_LANGUAGE, slow=False)
-            if os.path.exists(output):
-                os.remove(output)
-            ans.save(output)
-        except Exception as e:
-            logging.error(f"Error generating or saving TTS audio: {e}")
-            raise
+            await executors.DESKTOP.run(_paste_text, text)
+            return
+        except pyperclip.PyperclipException as e:
+            logging.warning(f"Clipboard is unavailable, falling back to typing: {e}")
+    await _type_text(text)
+
 
+def _set_master_volume(volume_value):
+    """Встановлює загальну гучність системи"""
+    # COM has to be initialized in every worker thread that talks to the audio endpoint
+    comtypes.CoInitialize()
     try:
-        _speak()
-        if not os.path.exists(output) or os.path.getsize(output) == 0:
-            raise RuntimeError(f"TTS output file is missing or empty: {output}")
-        data, fs = sf.read(output, dtype='float32')
-        sd.play(data, fs)
-        logging.debug(f"TTS audio played successfully from {output}")
-    except Exception as e:
-        logging.error(f"Error playing TTS audio from {output}: {e}")
-        raise e
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        volume = cast(interface, POINTER(IAudioEndpointVolume))
+        volume.SetMasterVolumeLevelScalar(volume_value, None)
+    finally:
+        comtypes.CoUninitialize()
 
 
 class TodoListManager:
-    def __init__(self, filename=const.TODO_LIST_FILENAME):
+    """Список справ у пам'яті з журналом змін на диску"""
+    _OP_ADD = "add"
+    _OP_REMOVE = "remove"
+
+    def __init__(self, filename=const.TODO_LIST_FILENAME, log_filename=const.TODO_LOG_FILENAME):
         self.filename = filename
-        self._ensure_file_exists()
+        self.log_filename = log_filename
+        self._tasks = None
+        self._log_entries = 0
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._tasks is not None
+
+    def load(self):
+        """Завантажує список з журналу один раз, імпортуючи старий текстовий файл за потреби"""
+        with self._lock:
+            self._ensure_loaded()
+
+    def _ensure_loaded(self):
+        if self._tasks is not None:
+            return
+        tasks = OrderedDict()
+        if os.path.exists(self.log_filename):
+            entries = 0
+            with open(self.log_filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        op, task = json.loads(line)
+                    except ValueError:
+                        logging.warning(f"Skipping corrupted line in ToDo log '{self.log_filename}'.")
+                        continue
+                    entries += 1
+                    if op == self._OP_ADD:
+                        tasks[task] = None
+                    elif op == self._OP_REMOVE:
+                        tasks.pop(task, None)
+            self._tasks = tasks
+            self._log_entries = entries
+            logging.info(f"Loaded {len(tasks)} tasks from ToDo log.")
+            return
 
-    def _ensure_file_exists(self):
-        if not os.path.exists(self.filename):
-            logging.info(f"ToDo list file '{self.filename}' not found. Creating.")
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                pass  # Create an empty file
+        if os.path.exists(self.filename):
+            with open(self.filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        tasks[line.strip()] = None
+            logging.info(f"Imported {len(tasks)} tasks from '{self.filename}'.")
+        self._tasks = tasks
+        self._compact()
+
+    def _append(self, op, task):
+        with open(self.log_filename, "a", encoding="utf-8") as f:
+            f.write(json.dumps([op, task], ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_entries += 1
+
+    def _maybe_compact(self):
+        if self._log_entries > const.TODO_LOG_COMPACT_MIN and self._log_entries > 2 * len(self._tasks):
+            self._compact()
+
+    def _compact(self):
+        """Атомарно переписує журнал, залишаючи тільки актуальні завдання"""
+        tmp_filename = f"{self.log_filename}.tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            for task in self._tasks:
+                f.write(json.dumps([self._OP_ADD, task], ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, self.log_filename)
+        self._log_entries = len(self._tasks)
 
     def get_tasks(self):
-        self._ensure_file_exists()
-        with open(self.filename, 'r', encoding='utf-8') as f:
-            return [line.strip() for line in f.readlines() if line.strip()]
+        with self._lock:
+            self._ensure_loaded()
+            return list(self._tasks)
 
     def add_task(self, task):
-        tasks = self.get_tasks()
-        if task in tasks:
-            return False  # Task already exists
-        with open(self.filename, 'a', encoding='utf-8') as f:
-            f.write(f"{task}\n")
-        return True
+        with self._lock:
+            self._ensure_loaded()
+            if task in self._tasks:
+                return False  # Task already exists
+            # The log is written first, so a failed write leaves memory matching the disk
+            self._append(self._OP_ADD, task)
+            self._tasks[task] = None
+            self._maybe_compact()
+            return True
 
     def remove_task(self, task_to_remove):
-        tasks = self.get_tasks()
-        if task_to_remove not in tasks:
-            return False  # Task not found
-        new_tasks = [task for task in tasks if task != task_to_remove]
-        with open(self.filename, 'w', encoding='utf-8') as f:
-            f.writelines(f"{t}\n" for t in new_tasks)
-        return True
+        with self._lock:
+            self._ensure_loaded()
+            if task_to_remove not in self._tasks:
+                return False  # Task not found
+            self._append(self._OP_REMOVE, task_to_remove)
+            del self._tasks[task_to_remove]
+            self._maybe_compact()
+            return True
 
     def clear_tasks(self):
-        with open(self.filename, 'w', encoding='utf-8') as f:
-            pass
+        with self._lock:
+            self._tasks = OrderedDict()
+            self._compact()
+
 
+todo_manager = TodoListManager()
 
-async def show_reminder(duration, reminder_text, settings, on_remind=None):
+
+async def show_reminder(reminder_text, settings):
     """Показує нагадування"""
-    logging.info(f"Reminder set for '{reminder_text}' in {duration} seconds.")
-    await timer(duration, reminder_text)
     response = const.RESPONSE_REMINDER_TRIGGERED.format(settings.get('name', ''), reminder_text)
-    logging.info(f"Triggering reminder: '{response}'")
-    await tts(response)
-    if on_remind:
-        await on_remind(response, const.PROGRAM_ROLE)
+    logging.info("Triggering reminder: '%s'", response)
+    await tts(response, priority=const.AUDIO_PRIORITY_ALARM)
+    await publish(events.ChatMessage(response, const.PROGRAM_ROLE))
 
 
-async def _schedule_alarm(alarm_time_str, settings, on_remind):
-    """Встановлює будильник на вказаний час"""
-    try:
+def _parse_alarm_time(alarm_time_str):
+    """Обчислює найближчий момент спрацювання будильника для рядка ГГ:ХХ або сказаного словами часу"""
+    if ":" in alarm_time_str:
         alarm_hour, alarm_minute = map(int, alarm_time_str.split(':'))
+    else:
+        numbers = numberWords.extract_numbers(alarm_time_str)
+        if not numbers or len(numbers) > 2 or not all(isinstance(n, int) for n in numbers):
+            raise ValueError(f"Не вдалося розпізнати час '{alarm_time_str}'.")
+        alarm_hour, alarm_minute = numbers[0], numbers[1] if len(numbers) == 2 else 0
+    if not (0 <= alarm_hour <= 23 and 0 <= alarm_minute <= 59):
+        raise ValueError("Година або хвилина виходить за допустимі межі (0-23 для години, 0-59 для хвилини).")
+
+    now = datetime.now()
+    alarm_time = now.replace(hour=alarm_hour, minute=alarm_minute, second=0, microsecond=0)
+
+    # If the alarm time is in the past, set it for tomorrow
+    if alarm_time <= now:
+        alarm_time += timedelta(days=1)
+    return alarm_time
+
+
+async def _fire_alarm(alarm_time_str, settings):
+    """Відтворює повідомлення будильника"""
+    logging.info("Alarm triggered for %s. Preparing message.", alarm_time_str)
+    alarm_message = const.RESPONSE_ALARM_TRIGGERED.format(settings.get('name', ''), alarm_time_str)
+    try:
+        await tts(alarm_message, priority=const.AUDIO_PRIORITY_ALARM)
+    except Exception as tts_e:
+        logging.error(f"Error during TTS playback for alarm: {tts_e}")
+        await publish(events.ChatMessage(const.RESPONSE_ALARM_TTS_ERROR.format(tts_e), const.PROGRAM_ROLE))
+        return
 
-        now = datetime.now()
-        if not (0 <= alarm_hour <= 23 and 0 <= alarm_minute <= 59):
-            raise ValueError("Година або хвилина виходить за допустимі межі (0-23 для години, 0-59 для хвилини).")
+    await publish(events.ChatMessage(alarm_message, const.PROGRAM_ROLE))
 
-        alarm_time = now.replace(hour=alarm_hour, minute=alarm_minute, second=0,
-                                 microsecond=0)  # This line can raise ValueError if hour/minute are invalid
 
-        # If the alarm time is in the past, set it for tomorrow
-        if alarm_time <= now:
-            alarm_time += timedelta(days=1)
+async def start_scheduler(bus=None):
+    """Запускає планувальник нагадувань і будильників, які повідомлятимуть про себе через шину подій"""
 
-        time_to_wait = (alarm_time - now).total_seconds()
+    async def _on_due(job):
+        if bus is not None:
+            use_bus(bus)
+        settings = await load_settings()
+        if job["kind"] == const.JOB_KIND_ALARM:
+            await _fire_alarm(job["text"], settings)
+        else:
+            await show_reminder(job["text"], settings)
 
-        logging.info(f"Scheduling alarm for {alarm_time_str} (in {time_to_wait:.2f} seconds)")
-        if time_to_wait < 0.1:
-            time_to_wait = 0.1
-        await asyncio.sleep(time_to_wait)
-        logging.info(f"Alarm triggered for {alarm_time_str}. Preparing message.")
+    await scheduler.start(_on_due)
 
-        alarm_message = const.RESPONSE_ALARM_TRIGGERED.format(settings.get('name', ''), alarm_time.strftime('%H:%M'))
-        try:
-            logging.info(f"Calling TTS for alarm message: '{alarm_message}'")
-            await tts(alarm_message)
-            logging.info(f"TTS completed for alarm message.")
-        except Exception as tts_e:
-            logging.error(f"Error during TTS playback for alarm: {tts_e}")
-            if on_remind:
-                await on_remind(const.RESPONSE_ALARM_TTS_ERROR.format(tts_e), const.PROGRAM_ROLE)
-            return
 
-        if on_remind:
-            logging.info(f"Calling on_remind for alarm message.")
-            await on_remind(alarm_message, const.PROGRAM_ROLE)
-            logging.info(f"on_remind completed for alarm message.")
+async def stop_scheduler():
+    await scheduler.stop()
 
-    except ValueError as e:
-        error_msg = const.RESPONSE_ALARM_ERROR_FORMAT.format(settings.get('name', ''), e)
-        logging.error(f"Alarm scheduling error: {e} for time string '{alarm_time_str}'")
-        await tts(error_msg)
-        if on_remind:
-            await on_remind(error_msg, const.PROGRAM_ROLE)
-    except Exception as e:  # Catch any other unexpected errors during alarm scheduling
-        logging.error(f"Unexpected error in _schedule_alarm: {e} for time string '{alarm_time_str}'")
-        await tts(const.RESPONSE_ALARM_ERROR_UNKNOWN.format(e), on_status_change=None)
+
+async def _report_task_failure(name, error):
+    await publish(events.ChatMessage(const.RESPONSE_TASK_FAILED.format(name, error), const.PROGRAM_ROLE))
+
+
+supervisor.on_failure = _report_task_failure
+
+
+def _format_scheduled(jobs):
+    """Форматує список запланованих подій для відповіді"""
+    lines = []
+    for i, job in enumerate(jobs, start=1):
+        when = datetime.fromtimestamp(job["deadline"]).strftime('%d.%m %H:%M')
+        if job["kind"] == const.JOB_KIND_ALARM:
+            lines.append(const.RESPONSE_SCHEDULED_ITEM_ALARM.format(i, when))
+        else:
+            lines.append(const.RESPONSE_SCHEDULED_ITEM_REMINDER.format(i, when, job["text"]))
+    return "\n".join(lines)
 
 
-async def doSomething(command, ui_instance, page, on_status_change=None, on_remind=None):
+def affirmative_response(settings):
+    """Повертає випадкову коротку згоду, звернену до користувача на ім'я"""
+    return random.choice(const.GENERIC_AFFIRMATIVE_RESPONSES).format(settings.get('name', ''))
+
+
+async def doSomething(command, bus=None):
     """Основний цикл обробки тексту і команд від користувача"""
-    logging.info(f"Processing command: '{command}'")
-    if on_status_change:
-        await on_status_change(const.STATUS_THINKING)
+    if bus is not None:
+        use_bus(bus)
+    if isinstance(command, str):
+        command = textNormalizer.normalize(command)
+    logging.info("Processing command: '%s'", command)
+    await publish(events.StatusChanged(const.STATUS_THINKING))
     settings = await load_settings(const.SETTINGS_FILENAME)
-    what_to_do_parts = command.split(f"{const.WAKE_WORD} ")
 
-    if command.lower() == const.WAKE_WORD:
+    if command.has_wake_word and not command.command:
         logging.info("Responded to wake word 'аврора'.")
-        page.window.minimized = False
-        page.window.focused = True
+        await publish(events.WindowRequest(minimized=False, focused=True))
         result_message = const.RESPONSE_ASSISTANT_PRESENT.format(settings.get('name', ''))
-        await tts(result_message, on_status_change=on_status_change)
-        if on_status_change:
-            await on_status_change(const.STATUS_NONE)
+        await tts(result_message)
+        await publish(events.StatusChanged(const.STATUS_NONE))
         return 0, result_message
-    if len(what_to_do_parts) > 1:
-        what_to_do = what_to_do_parts[-1]
-        logging.debug(f"Extracted task: '{what_to_do}'")
+    if command.has_wake_word:
+        what_to_do = command
+        logging.debug("Extracted task: '%s'", what_to_do.command)
     else:
         result_message = const.RESPONSE_UNKNOWN_COMMAND_AFTER_WAKE_WORD.format(settings.get('name', ''))
-        logging.warning(f"Could not extract task from command: '{command}'")
-        await tts(result_message, on_status_change=on_status_change)
-        if on_status_change:
-            await on_status_change(const.STATUS_NONE)
+        logging.warning("Could not extract task from command: '%s'", command)
+        metrics.COMMANDS.inc(outcome="no_command")
+        await tts(result_message)
+        await publish(events.StatusChanged(const.STATUS_NONE))
         return 1, result_message
-    ans, result_message = await what_command(what_to_do, ui_instance, page, settings, on_status_change=on_status_change,
-                                             on_remind=on_remind)
-    logging.info(f"what_command returned: ans='{ans}', message='{result_message}'")
+    ans, result_message = await dispatch(what_to_do, settings)
+    logging.info("what_command returned: ans='%s', message='%s'", ans, result_message)
     if ans == 1:
-        await tts(const.RESPONSE_CLARIFY, on_status_change=on_status_change)
+        await tts(const.RESPONSE_CLARIFY)
         result_message = const.RESPONSE_CLARIFY
     elif ans == "standard":
-        ans_random = random.randint(0, 2)
-        generic_responses = [resp.format(settings.get('name', '')) for resp in const.GENERIC_AFFIRMATIVE_RESPONSES]
         logging.info("Standard response sent.")
-        result_message = generic_responses[ans_random]
-        await tts(result_message, on_status_change=on_status_change)
+        result_message = affirmative_response(settings)
+        await tts(result_message)
         ans = 0
-    if on_status_change:
-        await on_status_change(const.STATUS_NONE)
+    await publish(events.StatusChanged(const.STATUS_NONE))
+    return ans, result_message
+
+
+def _collect_command_prefixes():
+    prefixes = []
+    for name, value in vars(const).items():
+        if name.startswith("CMD_") and not name.startswith("CMD_PARAM_"):
+            prefixes.extend(value if isinstance(value, list) else [value])
+    return tuple(prefix for prefix in prefixes if isinstance(prefix, str) and prefix.strip())
+
+
+_COMMAND_PREFIXES = _collect_command_prefixes()
+
+
+async def dispatch(utterance, settings):
+    """Виконує фразу з голосу чи текстового поля: складену — як кілька команд, звичайну — одразу"""
+    intents = await _split_intents(utterance)
+    if len(intents) > 1:
+        run = _do_several(intents, settings)
+    else:
+        run = what_command(utterance, settings)
+    if settings.get("profiling"):
+        run = command_profiler.run(run, utterance.command)
+    started = time.perf_counter()
+    try:
+        with tracing.span("dispatch", intents=len(intents)):
+            ans, result_message = await run
+    except asyncio.CancelledError:
+        metrics.COMMANDS.inc(outcome="interrupted")
+        raise
+    except Exception:
+        metrics.COMMANDS.inc(outcome="error")
+        raise
+    metrics.COMMAND_DURATION.observe(time.perf_counter() - started)
+    metrics.COMMANDS.inc(outcome="unknown" if ans == 1 else "ok")
     return ans, result_message
 
 
-async def what_command(what_to_do, ui_instance, page, settings, on_status_change=None, on_remind=None):
+async def _split_intents(utterance):
+    """Ділить складену фразу на окремі команди"""
+    if not textNormalizer.has_intent_separator(utterance.command):
+        return [utterance]
+    custom_commands = await load_cc()
+    custom_prefixes = tuple(prefix for prefix in (com.lower().split("[", 1)[0] for com in custom_commands)
+                            if prefix.strip())
+    return textNormalizer.split_intents(utterance, _COMMAND_PREFIXES + custom_prefixes, const.GREEDY_INTENT_PREFIXES)
+
+
+async def _run_intent(utterance, settings):
+    """Виконує одну команду зі складеної фрази і повертає її відповідь разом з тим, що вона мала сказати"""
+    spoken = []
+    _speech_capture.set(spoken)
+    try:
+        ans, result_message = await what_command(utterance, settings)
+    except Exception as e:
+        logging.error("Intent '%s' failed: %s", utterance.command, e, exc_info=True)
+        ans = 1
+    if ans == 1:
+        result_message = const.RESPONSE_CLARIFY
+        spoken.append(result_message)
+    elif ans == "standard":
+        result_message = affirmative_response(settings)
+        spoken.append(result_message)
+    return ans, result_message, spoken
+
+
+async def _do_several(intents, settings):
+    """Виконує команди без побічних дій одночасно, а решту по черзі, і озвучує одну спільну відповідь"""
+    logging.info("Running %d intents: %s", len(intents), [intent.command for intent in intents])
+    concurrent = [i for i, intent in enumerate(intents) if intent.command.startswith(const.CONCURRENT_INTENT_PREFIXES)]
+    ordered = [i for i in range(len(intents)) if i not in concurrent]
+
+    async def run_ordered():
+        return [await _run_intent(intents[i], settings) for i in ordered]
+
+    ordered_results, *concurrent_results = await asyncio.gather(
+        run_ordered(), *(_run_intent(intents[i], settings) for i in concurrent))
+    by_index = dict(zip(ordered + concurrent, ordered_results + concurrent_results))
+
+    ans, messages, speech = 0, [], []
+    for i in range(len(intents)):
+        intent_ans, result_message, spoken = by_index[i]
+        if intent_ans in (const.EXIT_COMMAND, const.RESTART_COMMAND):
+            ans = intent_ans
+        if result_message:
+            messages.append(result_message)
+        speech.extend(spoken)
+    if speech:
+        await tts(" ".join(speech))
+    return ans, "\n".join(messages)
+
+
+def _is_chat_search_message(message):
+    """Чи є повідомлення запитом пошуку в чаті або відповіддю на нього, які не повинні потрапляти в результати"""
+    if message["user"] == const.PROGRAM_ROLE:
+        return message["text"].startswith(_CHAT_SEARCH_REPLY_PREFIX)
+    return const.CMD_SEARCH_CHAT in message["text"].lower()
+
+
+async def what_command(what_to_do, settings):
+    """Виконує команду, щойно звільняться ресурси, яких вона торкається (клавіатура, звук, налаштування, мережа)"""
+    utterance = textNormalizer.normalize(what_to_do) if isinstance(what_to_do, str) else what_to_do
+    try:
+        async with command_scheduler.claim(utterance.command):
+            return await _what_command(utterance, settings)
+    except ResourceBusy:
+        response = const.RESPONSE_COMMAND_BUSY.format(settings.get('name', ''))
+        await tts(response)
+        return 0, response
+
+
+async def _what_command(utterance, settings):
     """Визначає яку команду сказав користувач і виконує відповідні дії"""
-    logging.info(f"Executing command logic for: '{what_to_do}'")
+    what_to_do = utterance.command
+    logging.debug("Executing command logic for: '%s'", what_to_do)
     ans = 1
-    todo_manager = TodoListManager()
     does_something = False
     custom_commands = await load_cc()
     for com in custom_commands.keys():
@@ -532,7 +1009,7 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
             variable_ends = com.find("]")
 
         if what_to_do[:len(com)] == com.lower() and not contains_variable:
-            logging.info(f"Matched custom command: '{com}'")
+            logging.info("Matched custom command: '%s'", com)
             await run_command(custom_commands.get(com))
             does_something = True
             break
@@ -541,66 +1018,80 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
             varible = what_to_do[variable_start:variable_ends]
             try:
                 if com.lower()[variable_start + 1:variable_ends] == const.CUSTOM_COMMAND_VAR_NUM:
-                    varible = int(varible)
+                    varible = numberWords.words_to_numbers(varible)
+                    if numberWords.parse_number(varible) is None:
+                        raise ValueError(f"'{varible}' is not a number")
             except Exception as e:
                 logging.error(f"Error processing variable for custom command '{com}': {e}", exc_info=True)
-                await tts(const.RESPONSE_CUSTOM_COMMAND_ERROR.format(settings.get('name', '')),
-                          on_status_change=on_status_change)
+                await tts(const.RESPONSE_CUSTOM_COMMAND_ERROR.format(settings.get('name', '')))
 
                 break
 
-            act = custom_commands.get(com).replace(const.CUSTOM_COMMAND_VAR_STR, varible)
+            act = custom_commands.get(com).replace(const.CUSTOM_COMMAND_VAR_STR, varible).replace(
+                f"[{const.CUSTOM_COMMAND_VAR_NUM}]", varible)
             await run_command(act)
-            logging.info(f"Matched custom command with variable: '{com}', executing: '{act}'")
+            logging.info("Matched custom command with variable: '%s', executing: '%s'", com, act)
             does_something = True
     if does_something:
         ans = 0
-        await tts(const.RESPONSE_CUSTOM_COMMAND_EXECUTING.format(settings.get('name', '')),
-                  on_status_change=on_status_change)
+        await tts(const.RESPONSE_CUSTOM_COMMAND_EXECUTING.format(settings.get('name', '')))
         return ans, const.RESPONSE_CUSTOM_COMMAND_EXECUTING.format(settings.get('name', ''))
 
+    elif what_to_do.startswith(const.CMD_SEARCH_CHAT):
+        logging.info("Executing 'search chat' command.")
+        query = what_to_do[len(const.CMD_SEARCH_CHAT):].strip()
+        hits = chat_index.search(query, exclude=_is_chat_search_message)
+        if hits:
+            lines = [const.RESPONSE_CHAT_SEARCH_ITEM.format(i, message["text"]) for i, (_, message) in
+                     enumerate(hits, start=1)]
+            response = const.RESPONSE_CHAT_SEARCH_RESULTS.format(settings.get('name', ''), "\n".join(lines))
+        else:
+            response = const.RESPONSE_CHAT_SEARCH_EMPTY.format(settings.get('name', ''))
+        await tts(response)
+        return 0, response
+
     elif what_to_do.startswith(const.CMD_SEARCH):
         logging.info("Executing 'search' command.")
         prompt = what_to_do[len(const.CMD_SEARCH):]
         prompt = quote_plus(prompt)
-        webbrowser.open(f"{const.GOOGLE_SEARCH_URL}{prompt}")
+        await executors.DESKTOP.run(webbrowser.open, f"{const.GOOGLE_SEARCH_URL}{prompt}")
         ans = 0
-        await tts(const.RESPONSE_SEARCHING.format(settings.get('name', '')), on_status_change=on_status_change)
+        await tts(const.RESPONSE_SEARCHING.format(settings.get('name', '')))
         return ans, const.RESPONSE_SEARCHING.format(settings.get('name', ''))
 
     elif what_to_do.startswith(const.CMD_OPEN):
-        logging.info(f"Executing 'open' command for: '{what_to_do[len(const.CMD_OPEN):]}'")
+        logging.info("Executing 'open' command for: '%s'", what_to_do[len(const.CMD_OPEN):])
         program = what_to_do[len(const.CMD_OPEN):]
         if "youtube" in program:
-            webbrowser.open(const.YOUTUBE_URL)
+            await executors.DESKTOP.run(webbrowser.open, const.YOUTUBE_URL)
             does_something = True
 
         elif "telegram" in program:
             if settings.get("tgo"):
-                webbrowser.open(const.TELEGRAM_WEB_URL)
+                await executors.DESKTOP.run(webbrowser.open, const.TELEGRAM_WEB_URL)
             else:
-                os.startfile(settings.get("tgpath"))
+                await executors.DESKTOP.run(os.startfile, settings.get("tgpath"))
             does_something = True
 
         elif "gemini" in program:
-            webbrowser.open_new_tab(const.GEMINI_URL)
+            await executors.DESKTOP.run(webbrowser.open_new_tab, const.GEMINI_URL)
             does_something = True
 
         elif any(term in program for term in ["chat gpt", "chatgpt", "чат гпт", "чат gpt"]):
-            webbrowser.open_new_tab(const.CHATGPT_URL)
+            await executors.DESKTOP.run(webbrowser.open_new_tab, const.CHATGPT_URL)
             does_something = True
 
         elif "музику" in program:
-            webbrowser.open(settings.get("music"))
+            await executors.DESKTOP.run(webbrowser.open, settings.get("music"))
             does_something = True
 
         if does_something:
-            await tts(const.RESPONSE_OPENING.format(settings.get('name', '')), on_status_change=on_status_change)
+            await tts(const.RESPONSE_OPENING.format(settings.get('name', '')))
             ans = 0
             return ans, const.RESPONSE_OPENING.format(settings.get('name', ''))
         else:
             await tts(const.RESPONSE_SEARCHING_PROGRAM.format(settings.get('name', '')),
-                      on_status_change=on_status_change)
+                      priority=const.AUDIO_PRIORITY_CHATTER)
             installed_programs = await find_installed_programs()
             program_to_open_lower = program.lower()
 
@@ -624,18 +1115,17 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
                             break
             if best_match_path:
                 try:
-                    os.startfile(best_match_path)
+                    await executors.DESKTOP.run(os.startfile, best_match_path)
                     response_message = const.RESPONSE_OPENING_PROGRAM.format(best_match_name)
-                    await tts(response_message, on_status_change=on_status_change)
+                    await tts(response_message)
                     return 0, response_message
                 except Exception as e:
                     logging.error(f"Failed to start program '{best_match_path}': {e}")
-                    await tts(const.RESPONSE_FAILED_TO_START_PROGRAM.format(best_match_name),
-                              on_status_change=on_status_change)
+                    await tts(const.RESPONSE_FAILED_TO_START_PROGRAM.format(best_match_name))
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_PLAY_MUSIC_SIMPLE_VARIANTS):
-        webbrowser.open(settings.get("music"))
-        await tts(const.RESPONSE_TURNING_ON_MUSIC.format(settings.get('name', '')), on_status_change=on_status_change)
+        await executors.DESKTOP.run(webbrowser.open, settings.get("music"))
+        await tts(const.RESPONSE_TURNING_ON_MUSIC.format(settings.get('name', '')))
         ans = 0
         return ans, const.RESPONSE_TURNING_ON_MUSIC.format(settings.get('name', ''))
 
@@ -650,69 +1140,150 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
 
         if not query:
             response = "Яку пісню увімкнути?"
-            await tts(response, on_status_change=on_status_change)
+            await tts(response)
             return 0, response
 
-        await tts(const.RESPONSE_SEARCHING.format(settings.get('name', '')), on_status_change=on_status_change)
+        await tts(const.RESPONSE_SEARCHING.format(settings.get('name', '')), priority=const.AUDIO_PRIORITY_CHATTER)
 
         video_url = await _get_first_youtube_video_url(query)
 
         if video_url:
-            webbrowser.open(video_url)
+            await executors.DESKTOP.run(webbrowser.open, video_url)
             response_message = const.RESPONSE_TURNING_ON_SONG_ON_YTM.format(query, settings.get('name', ''))
-            await tts(response_message, on_status_change=on_status_change)
+            await tts(response_message)
             ans = 0
             return ans, response_message
         else:
             response_message = const.RESPONSE_SONG_NOT_FOUND.format(query)
             logging.warning(f"Failed to find song '{query}' on YouTube.")
-            await tts(response_message, on_status_change=on_status_change)
+            await tts(response_message)
             ans = 0
             return ans, response_message
     elif what_to_do.startswith(const.CMD_RESTART_APP):
-        await tts(const.RESPONSE_RESTARTING_APP.format(settings.get('name', '')), on_status_change=on_status_change)
-        logging.warning("Restart command received. Restarting application.")
+        try:
+            settings = await reload()
+            response = const.RESPONSE_RELOADED.format(settings.get('name', ''))
+        except Exception as e:
+            logging.error(f"In-process reload failed: {e}", exc_info=True)
+            response = const.RESPONSE_RELOAD_FAILED.format(settings.get('name', ''))
+        await tts(response)
+        return 0, response
+    elif what_to_do.startswith(const.CMD_FULL_RESTART_APP):
+        await tts(const.RESPONSE_RESTARTING_APP.format(settings.get('name', '')))
+        logging.warning("Full restart command received. Restarting application.")
         ans = const.RESTART_COMMAND
         return ans, const.RESPONSE_RESTARTING_APP.format(settings.get('name', ''))
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_GREETING_VARIANTS):
         logging.info("Executing 'greeting' command.")
         response = const.RESPONSE_GREETING.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif what_to_do.startswith(const.CMD_WHO_ARE_YOU):
         logging.info("Executing 'who are you' command.")
         response = const.RESPONSE_WHO_ARE_YOU.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif what_to_do.startswith(const.CMD_GOODBYE):
         logging.info("Executing 'goodbye' command.")
         response = const.RESPONSE_GOODBYE.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = const.EXIT_COMMAND
         return ans, response
 
     elif what_to_do.startswith(const.CMD_CPU_LOAD):
         logging.info("Executing 'cpu load' command.")
-        await tts(const.RESPONSE_MEASURING_CPU.format(settings.get('name', '')), on_status_change=on_status_change)
-        cpu_load = const.RESPONSE_CPU_LOAD.format(psutil.cpu_percent(interval=1), settings.get('name', ''))
-        await tts(cpu_load, on_status_change=on_status_change)
+        sample = system_monitor.latest()
+        if sample:
+            cpu_percent = sample["cpu"]
+        else:
+            await tts(const.RESPONSE_MEASURING_CPU.format(settings.get('name', '')), priority=const.AUDIO_PRIORITY_CHATTER)
+            cpu_percent = await executors.IO.run(psutil.cpu_percent, interval=1)
+        cpu_load = const.RESPONSE_CPU_LOAD.format(round(cpu_percent, 1), settings.get('name', ''))
+        await tts(cpu_load)
         ans = 0
-        logging.info(f"CPU load reported: {cpu_load}")
+        logging.info("CPU load reported: %s", cpu_load)
         return ans, cpu_load
 
     elif what_to_do.startswith(const.CMD_RAM_LOAD):
         logging.info("Executing 'ram load' command.")
-        mem = psutil.virtual_memory()
-        response = const.RESPONSE_RAM_LOAD.format(mem.percent, mem.total / (1024 ** 3), mem.available / (1024 ** 3))
-        await tts(response, on_status_change=on_status_change)
+        sample = system_monitor.latest()
+        if sample:
+            percent, total, available = sample["mem_percent"], system_monitor.mem_total, sample["mem_available"]
+        else:
+            mem = await executors.IO.run(psutil.virtual_memory)
+            percent, total, available = mem.percent, mem.total, mem.available
+        response = const.RESPONSE_RAM_LOAD.format(percent, total / (1024 ** 3), available / (1024 ** 3))
+        await tts(response)
         ans = 0
         return ans, response
 
+    elif what_to_do.startswith(const.CMD_SYSTEM_STATUS):
+        logging.info("Executing 'system status' command.")
+        stats = system_monitor.stats(const.MONITOR_WINDOW)
+        if stats is None:
+            response = const.RESPONSE_SYSTEM_STATUS_NOT_READY.format(settings.get('name', ''))
+        else:
+            mb = 1024 ** 2
+            response = const.RESPONSE_SYSTEM_STATUS.format(settings.get('name', ''), stats["cpu_avg"],
+                                                           stats["cpu_peak"], stats["mem_percent_avg"],
+                                                           stats["mem_percent_peak"], stats["disk_read_avg"] / mb,
+                                                           stats["disk_write_avg"] / mb, stats["net_recv_avg"] / mb,
+                                                           stats["net_sent_avg"] / mb)
+        await tts(response)
+        ans = 0
+        return ans, response
+
+    elif what_to_do.startswith(const.CMD_TOP_CPU_PROCESSES) or what_to_do.startswith(const.CMD_TOP_MEMORY_PROCESSES):
+        by_cpu = what_to_do.startswith(const.CMD_TOP_CPU_PROCESSES)
+        logging.info("Executing 'top processes' command, by %s.", 'cpu' if by_cpu else 'memory')
+        processes = system_monitor.top_processes("cpu" if by_cpu else "rss")
+        if not processes:
+            response = const.RESPONSE_SYSTEM_STATUS_NOT_READY.format(settings.get('name', ''))
+        elif by_cpu:
+            lines = [const.RESPONSE_TOP_CPU_PROCESS_ITEM.format(i, name, cpu)
+                     for i, (name, cpu) in enumerate(processes, 1)]
+            response = const.RESPONSE_TOP_CPU_PROCESSES.format(settings.get('name', ''), "\n".join(lines))
+        else:
+            lines = [const.RESPONSE_TOP_MEMORY_PROCESS_ITEM.format(i, name, rss / (1024 ** 2))
+                     for i, (name, rss) in enumerate(processes, 1)]
+            response = const.RESPONSE_TOP_MEMORY_PROCESSES.format(settings.get('name', ''), "\n".join(lines))
+        await tts(response)
+        ans = 0
+        return ans, response
+
+    elif what_to_do.startswith(const.CMD_PROFILING_ON) or what_to_do.startswith(const.CMD_PROFILING_OFF):
+        enabled = what_to_do.startswith(const.CMD_PROFILING_ON)
+        logging.info("Executing 'profiling' command, enabled=%s.", enabled)
+        await change_settings(profiling=enabled)
+        response = (const.RESPONSE_PROFILING_ON if enabled else const.RESPONSE_PROFILING_OFF).format(
+            settings.get('name', ''))
+        await tts(response)
+        return 0, response
+
+    elif what_to_do.startswith(const.CMD_SHOW_PROFILE):
+        logging.info("Executing 'show profile' command.")
+        slowest = await executors.IO.run(command_profiler.slowest)
+        if not slowest:
+            response = const.RESPONSE_PROFILE_EMPTY.format(settings.get('name', ''))
+        else:
+            commands = []
+            for i, entry in enumerate(slowest, 1):
+                lanes = ", ".join(const.RESPONSE_PROFILE_LANE_ITEM.format(name, busy)
+                                  for name, busy in sorted(entry["lanes"].items(), key=lambda lane: -lane[1]))
+                commands.append(const.RESPONSE_PROFILE_COMMAND_ITEM.format(i, entry["command"], entry["elapsed"],
+                                                                           f" ({lanes})" if lanes else ""))
+            functions = [const.RESPONSE_PROFILE_FUNCTION_ITEM.format(i, name, own_time, calls)
+                         for i, (name, calls, own_time) in enumerate(command_profiler.hottest(), 1)]
+            response = const.RESPONSE_PROFILE.format(settings.get('name', ''), "\n".join(commands),
+                                                     "\n".join(functions))
+        await tts(response)
+        return 0, response
+
     elif what_to_do.startswith(const.CMD_WHAT_TIME):
         logging.info("Executing 'what time' command.")
         current_datetime = datetime.now()
@@ -721,13 +1292,13 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
         second = current_datetime.second
         response = const.RESPONSE_CURRENT_TIME.format(settings.get('name', ''), f"{hour:02d}", f"{minute:02d}",
                                                       f"{second:02d}")
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_GET_NEWS_VARIANTS):
         logging.info("Executing 'get news' command.")
-        await tts(const.RESPONSE_SEARCHING_NEWS.format(settings.get('name', '')), on_status_change=on_status_change)
+        await tts(const.RESPONSE_SEARCHING_NEWS.format(settings.get('name', '')), priority=const.AUDIO_PRIORITY_CHATTER)
         try:
             headlines = await get_news_headlines(const.NEWS_URL, const.NEWS_ARTICLE_HEADER_CLASS)
             if headlines:
@@ -735,51 +1306,51 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
                 text_to_say = const.RESPONSE_LATEST_NEWS.format(num_headlines)
                 for i in range(num_headlines):
                     text_to_say += f"{i + 1}. {headlines[i]}. \n"
-                chat_text = text_to_say
+                chat_text = messages.news(text_to_say + const.RESPONSE_NEWS_SOURCE_CHAT.format(const.NEWS_URL),
+                                          headlines[:num_headlines], const.NEWS_URL)
                 text_to_say += const.RESPONSE_NEWS_SOURCE_TTS
-                chat_text += const.RESPONSE_NEWS_SOURCE_CHAT.format(const.NEWS_URL)
-                await tts(text_to_say, on_status_change=on_status_change)
+                await tts(text_to_say)
                 ans = 0
                 return ans, chat_text
             else:
                 text_to_say = const.RESPONSE_FAILED_TO_GET_NEWS.format(settings.get('name', ''))
-                await tts(text_to_say, on_status_change=on_status_change)
+                await tts(text_to_say)
                 ans = 0
                 return ans, text_to_say
         except Exception as e:
             logging.error(f"Помилка під час отримання або обробки новин: {e}")
             text_to_say = const.RESPONSE_ERROR_GETTING_NEWS.format(settings.get('name', ''))
-            await tts(text_to_say, on_status_change=on_status_change)
+            await tts(text_to_say)
             ans = 0
             return ans, text_to_say
 
     elif what_to_do.startswith(const.CMD_THANK_YOU_PREFIX):
         logging.info("Executing 'thank you' command.")
         response = const.RESPONSE_THANK_YOU.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif what_to_do.startswith(const.CMD_MOVE_CURSOR):
         direction = what_to_do[len(const.CMD_MOVE_CURSOR):]
-        logging.info(f"Executing 'move cursor' command: {direction}")
+        logging.info("Executing 'move cursor' command: %s", direction)
         logging.info("trying to move cursor")
-        cursor_pos = pyautogui.position()
+        cursor_pos = await executors.DESKTOP.run(pyautogui.position)
         does_something = False
         if direction == const.CMD_PARAM_UP:
-            pyautogui.moveTo(cursor_pos.x, cursor_pos.y + 100, 0.01)
+            await executors.DESKTOP.run(pyautogui.moveTo, cursor_pos.x, cursor_pos.y + 100, 0.01)
             does_something = True
             logging.info("moved cursor up")
         elif direction == const.CMD_PARAM_DOWN:
-            pyautogui.moveTo(cursor_pos.x, cursor_pos.y - 100, 0.01)
+            await executors.DESKTOP.run(pyautogui.moveTo, cursor_pos.x, cursor_pos.y - 100, 0.01)
             does_something = True
             logging.info("moved cursor down")
         elif direction == const.CMD_PARAM_LEFT:
-            pyautogui.moveTo(cursor_pos.x - 100, cursor_pos.y, 0.01)
+            await executors.DESKTOP.run(pyautogui.moveTo, cursor_pos.x - 100, cursor_pos.y, 0.01)
             does_something = True
             logging.info("moved cursor left")
         elif direction == const.CMD_PARAM_RIGHT:
-            pyautogui.moveTo(cursor_pos.x + 100, cursor_pos.y, 0.01)
+            await executors.DESKTOP.run(pyautogui.moveTo, cursor_pos.x + 100, cursor_pos.y, 0.01)
             does_something = True
             logging.info("moved cursor right")
         else:
@@ -790,62 +1361,64 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
 
         if does_something:
             response = const.RESPONSE_MOVING_CURSOR.format(settings.get('name', ''))
-            await tts(response, on_status_change=on_status_change)
+            await tts(response)
             ans = 0
             return ans, response
 
     elif what_to_do.startswith(const.CMD_CLICK):
         logging.info("Executing 'click' command.")
-        pyautogui.click()
+        await executors.DESKTOP.run(pyautogui.click)
         response = const.RESPONSE_CLICKING.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif what_to_do.startswith(const.CMD_DOUBLE_CLICK):
         logging.info("Executing 'double click' command.")
-        pyautogui.doubleClick()
+        await executors.DESKTOP.run(pyautogui.doubleClick)
         response = const.RESPONSE_CLICKING.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif what_to_do.startswith(const.CMD_SCROLL):
         direction = what_to_do[len(const.CMD_SCROLL):]
-        logging.info(f"Executing 'scroll' command: {direction}")
+        logging.info("Executing 'scroll' command: %s", direction)
         if direction == const.CMD_PARAM_UP:
-            pyautogui.scroll(-500)
+            await executors.DESKTOP.run(pyautogui.scroll, -500)
             response = const.RESPONSE_SCROLLING.format(settings.get('name', ''))
-            await tts(response, on_status_change=on_status_change)
+            await tts(response)
             ans = 0
             return ans, response
         elif direction == const.CMD_PARAM_DOWN:
-            pyautogui.scroll(500)
+            await executors.DESKTOP.run(pyautogui.scroll, 500)
             response = const.RESPONSE_SCROLLING.format(settings.get('name', ''))
-            await tts(response, on_status_change=on_status_change)
+            await tts(response)
             ans = 0
             return ans, response
 
 
     elif what_to_do.startswith(const.CMD_REMIND):
         logging.info("Executing 'reminder' command.")
-        parts = what_to_do.split(" ")
+        parts = utterance.tokens
 
         try:
             index_of_che = parts.index(const.CMD_PARAM_REMINDER_SEPARATOR)
         except ValueError:
-            await tts(const.RESPONSE_CLARIFY.format(settings.get('name', '')), on_status_change=on_status_change)
+            await tts(const.RESPONSE_CLARIFY.format(settings.get('name', '')))
             return [0, ""]
 
         reminder_text = " ".join(parts[2:index_of_che])
 
-        duration_str = parts[index_of_che + 1]
-        unit = parts[index_of_che + 2]
-
-        try:
-            duration = int(duration_str)
-        except ValueError:
-            await tts(const.RESPONSE_CLARIFY.format(settings.get('name', '')), on_status_change=on_status_change)
+        duration_parts = numberWords.words_to_numbers(" ".join(parts[index_of_che + 1:])).split(" ")
+        duration = numberWords.parse_number(duration_parts[0])
+        if duration is None:
+            # "через хвилину" has no number at all
+            duration, duration_str, unit = 1, "1", duration_parts[0]
+        elif len(duration_parts) > 1:
+            duration_str, unit = duration_parts[0], duration_parts[1]
+        else:
+            await tts(const.RESPONSE_CLARIFY.format(settings.get('name', '')))
             return [0, const.RESPONSE_CLARIFY.format(settings.get('name', ''))]
 
         if any(u in unit for u in const.CMD_PARAM_TIME_UNITS_SEC):
@@ -855,29 +1428,63 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
         elif any(u in unit for u in const.CMD_PARAM_TIME_UNITS_HOUR):
             duration = duration * 60 * 60
         else:
-            await tts(const.RESPONSE_CLARIFY.format(settings.get('name', '')), on_status_change=on_status_change)
+            await tts(const.RESPONSE_CLARIFY.format(settings.get('name', '')))
             return [0, const.RESPONSE_CLARIFY.format(settings.get('name', ''))]
 
         display_duration = duration_str
+        scheduler.add(const.JOB_KIND_REMINDER, reminder_text, time.time() + duration)
         response = const.RESPONSE_REMINDER_SET.format(reminder_text, display_duration, unit, settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
-        asyncio.create_task(show_reminder(duration, reminder_text, settings, on_remind=on_remind))
+        await tts(response)
         ans = 0
         return ans, response
 
     elif what_to_do.startswith(const.CMD_SET_ALARM):
         time_str = what_to_do[len(const.CMD_SET_ALARM):].strip()
-        logging.info(f"Executing 'set alarm' command for: {time_str}")
+        logging.info("Executing 'set alarm' command for: %s", time_str)
+        try:
+            alarm_time = _parse_alarm_time(time_str)
+        except ValueError as e:
+            response = const.RESPONSE_ALARM_ERROR_FORMAT.format(settings.get('name', ''), e)
+            logging.error(f"Alarm scheduling error: {e} for time string '{time_str}'")
+            await tts(response)
+            return 0, response
+        scheduler.add(const.JOB_KIND_ALARM, alarm_time.strftime('%H:%M'), alarm_time.timestamp())
         response = const.RESPONSE_ALARM_SET.format(time_str, settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
-        asyncio.create_task(_schedule_alarm(time_str, settings, on_remind))
+        await tts(response)
         ans = 0
         return ans, response
 
+    elif any(what_to_do.startswith(cmd) for cmd in const.CMD_LIST_SCHEDULED_VARIANTS):
+        logging.info("Executing 'list scheduled' command.")
+        jobs = scheduler.pending()
+        if not jobs:
+            response = const.RESPONSE_SCHEDULED_EMPTY.format(settings.get('name', ''))
+        else:
+            response = const.RESPONSE_SCHEDULED_LIST.format(settings.get('name', ''), _format_scheduled(jobs))
+        await tts(response)
+        return 0, response
+
+    elif any(what_to_do.startswith(cmd) for cmd in const.CMD_CANCEL_SCHEDULED_VARIANTS):
+        logging.info("Executing 'cancel scheduled' command.")
+        prefix_used = next(cmd for cmd in const.CMD_CANCEL_SCHEDULED_VARIANTS if what_to_do.startswith(cmd))
+        target = what_to_do[len(prefix_used):].strip()
+        jobs = scheduler.pending()
+        job = next((j for j in jobs if j["text"].lower() == target), None)
+        # Only a target that is nothing but a number is a list position; "випити дві пігулки" is a reminder text
+        index = numberWords.words_to_numbers(target).strip()
+        if job is None and index.isdigit() and 1 <= int(index) <= len(jobs):
+            job = jobs[int(index) - 1]
+        if job and scheduler.cancel(job["id"]):
+            response = const.RESPONSE_SCHEDULED_CANCELLED.format(settings.get('name', ''))
+        else:
+            response = const.RESPONSE_SCHEDULED_NOT_FOUND.format(settings.get('name', ''))
+        await tts(response)
+        return 0, response
+
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_GET_WEATHER_VARIANTS):
         logging.info("Executing 'get weather' command.")
         weather_info = await get_weather_info()
-        await tts(weather_info, on_status_change=on_status_change)
+        await tts(weather_info)
         ans = 0
         return ans, weather_info
 
@@ -889,140 +1496,127 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
         else:
             location = const.RESPONSE_LOCATION_FAILED
 
-        await tts(location, on_status_change=on_status_change)
+        await tts(location)
         ans = 0
         return ans, location
 
     elif what_to_do.startswith(const.CMD_CALCULATE):
         expression_str = what_to_do[len(const.CMD_CALCULATE):].strip()
-        logging.info(f"Executing 'calculate' command for expression: {expression_str}")
-        for word in const.CMD_PARAM_CALC_PLUS:
-            expression_str = expression_str.replace(word, "+")
-        for word in const.CMD_PARAM_CALC_MINUS:
-            expression_str = expression_str.replace(word, "-")
-        for word in const.CMD_PARAM_CALC_MUL:
-            expression_str = expression_str.replace(word, "*")
-        for word in const.CMD_PARAM_CALC_DIV:
-            expression_str = expression_str.replace(word, "/")
-        expression_str = expression_str.replace(const.CMD_PARAM_CALC_REPLACE_NA, "")
-
-        if not all(c in const.CMD_PARAM_CALC_ALLOWED_CHARS for c in expression_str):
-            logging.warning(f"Calculator expression contains invalid characters: '{expression_str}'")
-            response = const.RESPONSE_CALC_INVALID_EXPRESSION.format(settings.get('name', ''))
-            await tts(response, on_status_change=on_status_change)
-            return 0, response
-
+        logging.info("Executing 'calculate' command for expression: %s", expression_str)
         try:
-            result = eval(expression_str)
+            result = calculator.calculate(expression_str)
             response = const.RESPONSE_CALC_RESULT.format(result)
-            logging.info(f"Calculation result for '{expression_str}' is '{result}'")
-            await tts(response, on_status_change=on_status_change)
+            logging.info("Calculation result for '%s' is '%s'", expression_str, result)
+            await tts(response)
             ans = 0
             return ans, response
-        except (SyntaxError, NameError, TypeError, ZeroDivisionError) as e:
+        except calculator.CalculatorError as e:
+            error_msg = const.RESPONSE_CALC_ERROR.format(e)
+            logging.warning("Calculator error: %s for expression: '%s'", e, expression_str)
+            await tts(error_msg)
+            return 0, error_msg
+        except ZeroDivisionError as e:
             error_msg = const.RESPONSE_CALC_ERROR.format(e)
             logging.error(f"Calculator error: {e} for expression: '{expression_str}'")
-            await tts(error_msg, on_status_change=on_status_change)
+            await tts(error_msg)
             return 0, error_msg
         except Exception as e:
             error_msg = const.RESPONSE_CALC_UNKNOWN_ERROR.format(e)
             logging.error(f"Unknown calculator error: {e} for expression: '{expression_str}'")
-            await tts(error_msg, on_status_change=on_status_change)
+            await tts(error_msg)
             return 0, error_msg
 
-
     elif what_to_do.startswith(const.CMD_SHUTDOWN_PC):
         if settings.get("pcpower"):
             logging.warning("Executing 'shutdown PC' command.")
             response = const.RESPONSE_SHUTTING_DOWN_PC.format(settings.get('name', ''))
-            await tts(response, on_status_change=on_status_change)
-            os.system(const.SYS_CMD_SHUTDOWN)
+            await tts(response)
+            await process_launcher.run(const.SYS_CMD_SHUTDOWN)
             ans = 0
             return ans, response
         else:
             response = const.RESPONSE_PC_POWER_NO_PERMS.format(const.RESPONSE_PC_POWER_ACTION_SHUTDOWN,
                                                                settings.get('name', ''))
-            await tts(response, on_status_change=on_status_change)
+            await tts(response)
             return 0, response
 
     elif what_to_do.startswith(const.CMD_RESTART_PC):
         if settings.get("pcpower"):
             logging.warning("Executing 'restart PC' command.")
             response = const.RESPONSE_RESTARTING_PC.format(settings.get('name', ''))
-            await tts(response, on_status_change=on_status_change)
-            os.system(const.SYS_CMD_RESTART)
+            await tts(response)
+            await process_launcher.run(const.SYS_CMD_RESTART)
             ans = 0
             return ans, response
         else:
             response = const.RESPONSE_PC_POWER_NO_PERMS.format(const.RESPONSE_PC_POWER_ACTION_RESTART,
                                                                settings.get('name', ''))
-            await tts(response, on_status_change=on_status_change)
+            await tts(response)
             return 0, response
 
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_HIDE_WINDOW_VARIANTS):
         logging.info("Executing 'minimize window' command.")
-        pyautogui.hotkey(*const.HOTKEY_WIN_DOWN)
-        pyautogui.hotkey(*const.HOTKEY_WIN_DOWN)
+        await executors.DESKTOP.run(pyautogui.hotkey, *const.HOTKEY_WIN_DOWN)
+        await executors.DESKTOP.run(pyautogui.hotkey, *const.HOTKEY_WIN_DOWN)
         response = const.RESPONSE_HIDING_WINDOW.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_SHOW_WINDOW_VARIANTS):
         logging.info("Executing 'maximize window' command.")
-        pyautogui.hotkey(*const.HOTKEY_WIN_UP)
+        await executors.DESKTOP.run(pyautogui.hotkey, *const.HOTKEY_WIN_UP)
         response = const.RESPONSE_SHOWING_WINDOW.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_HIDE_ALL_WINDOWS_VARIANTS):
         logging.info("Executing 'show desktop' command.")
-        pyautogui.hotkey(*const.HOTKEY_WIN_M)
+        await executors.DESKTOP.run(pyautogui.hotkey, *const.HOTKEY_WIN_M)
         response = const.RESPONSE_HIDING_ALL_WINDOWS.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_SHOW_ALL_WINDOWS_VARIANTS):
         logging.info("Executing 'show all windows' command.")
-        pyautogui.hotkey(*const.HOTKEY_WIN_SHIFT_M)
+        await executors.DESKTOP.run(pyautogui.hotkey, *const.HOTKEY_WIN_SHIFT_M)
         response = const.RESPONSE_SHOWING_ALL_WINDOWS.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_CLOSE_PROGRAM_VARIANTS):
         logging.info("Executing 'close program' command.")
-        pyautogui.hotkey(*const.HOTKEY_ALT_F4)
+        await executors.DESKTOP.run(pyautogui.hotkey, *const.HOTKEY_ALT_F4)
         response = const.RESPONSE_CLOSING_PROGRAM.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_SWITCH_WINDOW_VARIANTS):
         logging.info("Executing 'switch window' command.")
-        pyautogui.hotkey(*const.HOTKEY_ALT_TAB)
+        await executors.DESKTOP.run(pyautogui.hotkey, *const.HOTKEY_ALT_TAB)
         response = const.RESPONSE_SWITCHING_WINDOW.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif what_to_do.startswith(const.CMD_SWITCH_TAB):
         logging.info("Executing 'switch tab' command.")
-        pyautogui.hotkey(*const.HOTKEY_CTRL_TAB)
+        await executors.DESKTOP.run(pyautogui.hotkey, *const.HOTKEY_CTRL_TAB)
         response = const.RESPONSE_SWITCHING_TAB.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
     elif what_to_do.startswith(const.CMD_HIDE_SELF):
         logging.info("Executing 'hide self' command.")
-        page.window.minimized = True
-        page.window.focused = False
+        await publish(events.WindowRequest(minimized=True, focused=False))
         response = const.RESPONSE_HIDING_SELF.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
 
@@ -1032,11 +1626,11 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
         day_of_week = const.DAYS_OF_WEEK_UK[current_datetime.weekday()]
         response = const.RESPONSE_CURRENT_DATE.format(settings.get('name', ''), day_of_week, current_datetime.day,
                                                       current_datetime.month, current_datetime.year)
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         ans = 0
         return ans, response
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_SET_VOLUME_VARIANTS):
-        logging.info(f"Executing 'set volume' command.")
+        logging.info("Executing 'set volume' command.")
 
         prefix_used = next((cmd for cmd in const.CMD_SET_VOLUME_VARIANTS if what_to_do.startswith(cmd)), None)
         if not prefix_used:
@@ -1044,108 +1638,107 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
 
         volume_str = what_to_do[len(prefix_used):].strip()
         try:
-            volume_value = int(volume_str) / 100
+            volume_value = numberWords.parse_number(volume_str) / 100
             if not (0.0 <= volume_value <= 1.0):
                 raise ValueError("Гучність має бути в межах від 0 до 100")
         except (ValueError, TypeError):
-            await tts(const.RESPONSE_CLARIFY.format(settings.get('name', '')), on_status_change=on_status_change)
-            logging.warning(f"Could not parse volume value: '{volume_str}'")
+            await tts(const.RESPONSE_CLARIFY.format(settings.get('name', '')))
+            logging.warning("Could not parse volume value: '%s'", volume_str)
             return 0, const.RESPONSE_CLARIFY.format(settings.get('name', ''))
 
-        devices = AudioUtilities.GetSpeakers()
-        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-        volume = cast(interface, POINTER(IAudioEndpointVolume))
-        volume.SetMasterVolumeLevelScalar(volume_value, None)
+        await executors.DESKTOP.run(_set_master_volume, volume_value)
 
-        logging.info(f"Volume set to {volume_value * 100}%")
+        logging.info("Volume set to %s%%", volume_value * 100)
         response = const.RESPONSE_SETTING_VOLUME.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return 0, response
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_SHOW_TODO_VARIANTS):
         logging.info("Executing 'show todo' command.")
+        if not todo_manager.loaded:
+            await executors.IO.run(todo_manager.load)
         tasks = todo_manager.get_tasks()
         if not tasks:
             response = const.RESPONSE_SHOW_TODO_EMPTY.format(settings.get('name', ''))
         else:
             todo_list_content = "\n".join(tasks)
-            response = const.RESPONSE_SHOW_TODO.format(settings.get('name', ''), todo_list_content)
-        await tts(response, on_status_change=on_status_change)
+            response = messages.todo(const.RESPONSE_SHOW_TODO.format(settings.get('name', ''), todo_list_content),
+                                     tasks)
+        await tts(response)
         return 0, response
 
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_CLEAR_TODO_VARIANTS):
         logging.info("Executing 'clear todo' command.")
-        todo_manager.clear_tasks()
+        await executors.IO.run(todo_manager.clear_tasks)
         response = const.RESPONSE_CLEAR_TODO.format(settings.get('name', ''))
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return 0, response
 
     elif what_to_do.startswith(const.CMD_ADD_TODO):
         logging.info("Executing 'add todo' command.")
         task = what_to_do[len(const.CMD_ADD_TODO):].strip()
         if task:
-            if todo_manager.add_task(task):
+            if await executors.IO.run(todo_manager.add_task, task):
                 response = const.RESPONSE_ADD_TODO.format(task, settings.get('name', ''))
             else:
                 response = const.RESPONSE_ADD_TODO_EXISTS.format(task)
-            await tts(response, on_status_change=on_status_change)
+            await tts(response)
             return 0, response
 
     elif what_to_do.startswith(const.CMD_REMOVE_TODO):
         logging.info("Executing 'remove todo' command.")
         task_to_remove = what_to_do[len(const.CMD_REMOVE_TODO):].strip()
         if task_to_remove:
-            if todo_manager.remove_task(task_to_remove):
+            if await executors.IO.run(todo_manager.remove_task, task_to_remove):
                 response = const.RESPONSE_REMOVE_TODO.format(settings.get('name', ''))
             else:
                 response = const.RESPONSE_REMOVE_TODO_NOT_FOUND.format(task_to_remove)
-            await tts(response, on_status_change=on_status_change)
+            await tts(response)
             return 0, response
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_PAUSE_SONG_VARIANTS):
         logging.info("Executing 'pause song' command.")
-        pyautogui.press('space')
+        await executors.DESKTOP.run(pyautogui.press, 'space')
         response = const.RESPONSE_PAUSE_SONG.format(settings.get('name', ''))
         ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return ans, response
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_RESUME_SONG_VARIANTS):
         logging.info("Executing 'resume song' command.")
-        pyautogui.press('space')
+        await executors.DESKTOP.run(pyautogui.press, 'space')
         response = const.RESPONSE_RESUME_SONG.format(settings.get('name', ''))
         ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return ans, response
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_NEXT_SONG_VARIANTS):
         logging.info("Executing 'next song' command.")
-        pyautogui.press(const.HOTKEY_NEXT_SONG)
+        await executors.DESKTOP.run(pyautogui.press, const.HOTKEY_NEXT_SONG)
         response = const.RESPONSE_NEXT_SONG.format(settings.get('name', ''))
         ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return ans, response
     elif any(what_to_do.startswith(cmd) for cmd in const.CMD_PREVIOUS_SONG_VARIANTS):
         logging.info("Executing 'previous song' command.")
-        pyautogui.press(const.HOTKEY_PREVIOUS_SONG)
+        await executors.DESKTOP.run(pyautogui.press, const.HOTKEY_PREVIOUS_SONG)
         response = const.RESPONSE_PREVIOUS_SONG.format(settings.get('name', ''))
         ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
     elif what_to_do.startswith(const.CMD_WRITE_TEXT):
         logging.info("Executing 'write text' command.")
-        text = what_to_do[len(const.CMD_WRITE_TEXT):].strip()
+        text = utterance.cased_command[len(const.CMD_WRITE_TEXT):].strip()
         if text:
-            pyautogui.typewrite(uk_to_en(text), interval=0.03)
-            pyautogui.press('enter')
+            await write_text(text, paste=settings.get("pastetext", True))
+            await executors.DESKTOP.run(pyautogui.press, 'enter')
             response = const.RESPONSE_WRITE_TEXT.format(settings.get('name', ''))
             ans = 0
         else:
             response = const.RESPONSE_CLARIFY.format(settings.get('name', ''))
             ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return ans, response
     elif what_to_do.startswith(const.CMD_CLEAR_CHAT):
         logging.info("Executing 'clear chat' command.")
-        ui_instance.clearChat(None)
-        await tts(const.GENERIC_AFFIRMATIVE_RESPONSES[3].format(settings.get('name', '')),
-                  on_status_change=on_status_change)
+        await publish(events.ChatCleared())
+        await tts(affirmative_response(settings))
         ans = 0
         return ans, ""
     elif what_to_do.startswith(const.CMD_NAME_ME):
@@ -1155,12 +1748,10 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
             response = const.RESPONSE_CLARIFY.format(settings.get('name', ''))
             ans = 0
         else:
-            ui_instance.YourNameI.value = name
-            await ui_instance.update_settings(None)
-            page.update()
+            await change_settings(name=name)
             response = const.RESPONSE_NEW_NAME.format(settings.get('name', ''))
             ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return ans, response
     elif what_to_do.startswith(const.CMD_I_AM_IN_CITY):
         logging.info("Executing 'i am in city' command.")
@@ -1169,29 +1760,23 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
             response = const.RESPONSE_CLARIFY.format(settings.get('name', ''))
             ans = 0
         else:
-            ui_instance.CityI.value = city
-            await ui_instance.update_settings(None)
-            page.update()
+            await change_settings(city=city)
             response = const.RESPONSE_REMEMBERED.format(settings.get('name', ''))
             ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return ans, response
     elif what_to_do.startswith(const.CMD_SILENT_MODE_ON):
         logging.info("Executing 'silent mode on' command.")
-        ui_instance.silentModeCB.value = True
-        await ui_instance.update_settings(None)
-        page.update()
+        await change_settings(silentmode=True)
         response = const.RESPONSE_CHANGE_SETTINGS.format(settings.get('name', ''))
         ans = 0
         return ans, response
     elif what_to_do.startswith(const.CMD_SILENT_MODE_OFF):
         logging.info("Executing 'silent mode off' command.")
-        ui_instance.silentModeCB.value = False
-        await ui_instance.update_settings(None)
-        page.update()
+        await change_settings(silentmode=False)
         response = const.RESPONSE_CHANGE_SETTINGS.format(settings.get('name', ''))
         ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return ans, response
     elif what_to_do.startswith(const.CMD_SET_NUM_OF_HEADLINES):
         logging.info("Executing 'set num of headlines' command.")
@@ -1201,44 +1786,36 @@ async def what_command(what_to_do, ui_instance, page, settings, on_status_change
             ans = 0
         else:
             try:
-                if ui_instance.NewsHeadersCountS.min <= int(num) <= ui_instance.NewsHeadersCountS.max + 1:
-                    ui_instance.NewsHeadersCountS.value = int(num)
-                else:
-                    raise ValueError("Кількість новин має бути між 1 і 10.")
+                num = int(numberWords.parse_number(num))
+                if not const.NUM_HEADLINES_MIN <= num <= const.NUM_HEADLINES_MAX:
+                    raise ValueError(
+                        f"Кількість новин має бути між {const.NUM_HEADLINES_MIN} і {const.NUM_HEADLINES_MAX}.")
             except:
                 await tts(const.RESPONSE_CLARIFY)
                 ans = 0
                 return ans, const.RESPONSE_CLARIFY
-            await ui_instance.update_settings(None)
-            page.update()
+            await change_settings(num_headlines=num)
             response = const.RESPONSE_CHANGE_SETTINGS.format(settings.get('name', ''))
             ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return ans, response
     elif what_to_do.startswith(const.CMD_CHANGE_THEME):
         logging.info("Executing 'change theme' command.")
-        ui_instance.themeS.value = not ui_instance.themeS.value
-        await ui_instance.update_settings(None)
-        await ui_instance.switch_theme(None)
-        page.update()
+        theme = const.THEME_LIGHT if settings.get("theme") == const.THEME_DARK else const.THEME_DARK
+        await change_settings(theme=theme)
         response = const.RESPONSE_CHANGE_SETTINGS.format(settings.get('name', ''))
         ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return ans, response
-    elif what_to_do.startswith(CMD_CHANGE_ACCENT_COLOR):
+    elif what_to_do.startswith(const.CMD_CHANGE_ACCENT_COLOR):
         logging.info("Executing 'change accent color' command.")
-        next_color = const.ACCENT_COLORS_LIST[const.ACCENT_COLORS_LIST.index(
-            ui_instance.accent_color_dropdown.value) + 1] if const.ACCENT_COLORS_LIST.index(
-            ui_instance.accent_color_dropdown.value) + 1 != len(const.ACCENT_COLORS_LIST) else const.ACCENT_COLORS_LIST[
-            0]
-        ui_instance.accent_color_dropdown.value = next_color
-        await ui_instance.update_settings(None)
-        await ui_instance.switch_accent_color(None)
-        page.update()
+        current_color = settings.get("accent_color_name", const.DEFAULT_ACCENT_COLOR)
+        index = const.ACCENT_COLORS_LIST.index(current_color) if current_color in const.ACCENT_COLORS_LIST else -1
+        await change_settings(accent_color_name=const.ACCENT_COLORS_LIST[(index + 1) % len(const.ACCENT_COLORS_LIST)])
         response = const.RESPONSE_CHANGE_SETTINGS.format(settings.get('name', ''))
         ans = 0
-        await tts(response, on_status_change=on_status_change)
+        await tts(response)
         return ans, response
 
-    logging.warning(f"Command not recognized: '{what_to_do}'")
+    logging.warning("Command not recognized: '%s'", what_to_do)
     return ans, const.RESPONSE_UNKNOWN_COMMAND.format(what_to_do, settings.get('name', ''))
@@ -0,0 +1,98 @@
+import ast
+import math
+import operator
+import re
+from functools import lru_cache
+
+import constants as const
+import numberWords
+
+
+class CalculatorError(ValueError):
+    """Вираз неможливо безпечно обчислити"""
+
+
+_WORDS_RE = re.compile(
+    r"(?<!\w)(?:" + "|".join(re.escape(word) for word in sorted(const.CALC_WORDS, key=len, reverse=True)) + r")(?!\w)")
+_PERCENT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_DECIMAL_RE = re.compile(r"(?<=\d)\s*[.,]\s*(?=\d)")
+
+_BIN_OPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Div: operator.truediv,
+            ast.Pow: operator.pow}
+_UNARY_OPS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+
+def normalize(expression):
+    """Замінює числівники і слова-оператори на цифри та символи"""
+    expression = numberWords.words_to_numbers(expression.lower())
+    expression = _WORDS_RE.sub(lambda m: const.CALC_WORDS[m.group(0)], expression)
+    expression = _DECIMAL_RE.sub(".", expression).replace("^", "**")
+    return _PERCENT_RE.sub(r"(\1/100)", expression)
+
+
+def _check(value):
+    if isinstance(value, complex):
+        raise CalculatorError("комплексний результат")
+    if isinstance(value, float) and not math.isfinite(value) or abs(value) > const.CALC_MAX_OPERAND:
+        raise CalculatorError("занадто велике число")
+    return value
+
+
+def _power(base, exponent):
+    if abs(exponent) > const.CALC_MAX_EXPONENT:
+        raise CalculatorError("занадто великий степінь")
+    if abs(base) > 1 and exponent > 0 and exponent * math.log2(abs(base)) > math.log2(const.CALC_MAX_OPERAND):
+        raise CalculatorError("занадто велике число")
+    return base ** exponent
+
+
+def _compile(node, budget):
+    """Перетворює дерево виразу на функцію, рахуючи кількість кроків обчислення"""
+    budget[0] -= 1
+    if budget[0] < 0:
+        raise CalculatorError("вираз занадто складний")
+
+    if isinstance(node, ast.Expression):
+        return _compile(node.body, budget)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        value = _check(node.value)
+        return lambda: value
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        op, operand = _UNARY_OPS[type(node.op)], _compile(node.operand, budget)
+        return lambda: op(operand())
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        op = _power if isinstance(node.op, ast.Pow) else _BIN_OPS[type(node.op)]
+        left, right = _compile(node.left, budget), _compile(node.right, budget)
+        return lambda: _check(op(left(), right()))
+    raise CalculatorError("непідтримувана операція")
+
+
+@lru_cache(maxsize=const.CALC_CACHE_SIZE)
+def compile_expression(expression):
+    """Розбирає нормалізований вираз і кешує скомпільовану функцію"""
+    if len(expression) > const.CALC_MAX_LENGTH:
+        raise CalculatorError("вираз занадто довгий")
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError:
+        raise CalculatorError("неправильний вираз") from None
+    return _compile(tree, [const.CALC_MAX_STEPS])
+
+
+def format_result(result):
+    if isinstance(result, float):
+        if result.is_integer():
+            return str(int(result))
+        return f"{result:.10g}"
+    return str(result)
+
+
+def calculate(expression):
+    """Обчислює вираз з розмовними словами-операторами і повертає відформатований результат"""
+    normalized = normalize(expression)
+    if not all(c in const.CMD_PARAM_CALC_ALLOWED_CHARS for c in normalized):
+        raise CalculatorError("недопустимі символи")
+    try:
+        return format_result(compile_expression(normalized)())
+    except OverflowError:
+        raise CalculatorError("занадто велике число") from None
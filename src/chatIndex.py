@@ -0,0 +1,139 @@
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import unicodedata
+from collections import defaultdict
+
+import constants as const
+from textNormalizer import APOSTROPHES_TABLE
+
+_TOKEN_RE = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+
+def _stem(token):
+    """Відкидає найпоширеніші українські закінчення, щоб різні відмінки давали однаковий ключ"""
+    if token.endswith("ся") and len(token) - 2 >= const.CHAT_INDEX_MIN_STEM:
+        token = token[:-2]
+    for suffix in const.CHAT_INDEX_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= const.CHAT_INDEX_MIN_STEM:
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text):
+    """Розбиває текст на нормалізовані токени з урахуванням апострофів"""
+    text = unicodedata.normalize("NFC", text).translate(APOSTROPHES_TABLE).casefold()
+    return [_stem(token) for token in _TOKEN_RE.findall(text)]
+
+
+class ChatIndex:
+    """Інвертований індекс по тексту повідомлень чату з журналом на диску"""
+
+    def __init__(self, filename=const.CHAT_INDEX_FILENAME):
+        self.filename = filename
+        self._postings = defaultdict(dict)
+        self._doc_lengths = {}
+        self._messages = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._messages)
+
+    def _index(self, message, tokens):
+        doc_id = message["id"]
+        if doc_id in self._messages:
+            return
+        self._messages[doc_id] = message
+        self._doc_lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+        for token in tokens:
+            postings = self._postings[token]
+            postings[doc_id] = postings.get(doc_id, 0) + 1
+
+    def _reset(self):
+        self._postings.clear()
+        self._doc_lengths.clear()
+        self._messages.clear()
+        self._total_length = 0
+
+    def load(self, history):
+        """Завантажує індекс з журналу і перебудовує його, якщо він не відповідає історії"""
+        self._reset()
+        by_id = {message["id"]: message for message in history}
+        logged_ids = []
+        if os.path.exists(self.filename):
+            try:
+                with open(self.filename, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            doc_id, tokens = json.loads(line)
+                        except ValueError:
+                            continue
+                        if doc_id in by_id:
+                            self._index(by_id[doc_id], tokens)
+                        logged_ids.append(doc_id)
+            except OSError as e:
+                logging.error(f"Failed to read chat index {self.filename}: {e}", exc_info=True)
+        if logged_ids != list(by_id):
+            logging.info("Chat index is out of date, rebuilding it from history.")
+            self.rebuild(history)
+        else:
+            logging.info(f"Chat index loaded with {len(self)} messages.")
+
+    def rebuild(self, history):
+        """Перебудовує індекс з нуля та переписує журнал"""
+        self._reset()
+        tmp_filename = f"{self.filename}.tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            for message in history:
+                tokens = tokenize(message["text"])
+                self._index(message, tokens)
+                f.write(json.dumps([message["id"], tokens], ensure_ascii=False) + "\n")
+        os.replace(tmp_filename, self.filename)
+
+    def add(self, message):
+        """Додає нове повідомлення в індекс у пам'яті і повертає рядок для журналу"""
+        tokens = tokenize(message["text"])
+        self._index(message, tokens)
+        return json.dumps([message["id"], tokens], ensure_ascii=False) + "\n"
+
+    def append_to_log(self, line):
+        """Дописує рядок у журнал на диску; виконується в пулі IO, щоб не блокувати цикл подій"""
+        try:
+            with open(self.filename, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            logging.error(f"Failed to append to chat index {self.filename}: {e}", exc_info=True)
+
+    def clear(self):
+        self._reset()
+
+    def clear_log(self):
+        with open(self.filename, "w", encoding="utf-8"):
+            pass
+
+    def search(self, query, limit=const.CHAT_SEARCH_LIMIT, exclude=None):
+        """Повертає повідомлення, що найкраще відповідають запиту, за BM25"""
+        terms = set(tokenize(query))
+        if not terms or not self._messages:
+            return []
+        doc_count = len(self._messages)
+        avg_length = self._total_length / doc_count or 1
+        k1, b = const.CHAT_SEARCH_BM25_K1, const.CHAT_SEARCH_BM25_B
+        base, scale = k1 * (1 - b), k1 * b / avg_length
+        lengths = self._doc_lengths
+        scores = defaultdict(float)
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5)) * (k1 + 1)
+            for doc_id, tf in postings.items():
+                scores[doc_id] += idf * tf / (tf + base + scale * lengths[doc_id])
+        if exclude:
+            scores = {doc_id: score for doc_id, score in scores.items() if not exclude(self._messages[doc_id])}
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [(score, self._messages[doc_id]) for doc_id, score in best]
@@ -0,0 +1,103 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+
+import constants as const
+import metrics
+
+
+class ResourceBusy(TimeoutError):
+    """Ресурс, потрібний команді, не звільнився вчасно"""
+
+    def __init__(self, resource):
+        super().__init__(f"Resource '{resource}' is busy.")
+        self.resource = resource
+
+
+class _Resource:
+    """Ресурс з обмеженою кількістю одночасних власників і чергою FIFO"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.busy = 0
+        self._waiters = deque()
+
+    @property
+    def waiting(self):
+        return len(self._waiters)
+
+    async def acquire(self, timeout):
+        if self.busy < self.capacity and not self._waiters:
+            self.busy += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # The slot was handed over at the same moment the wait gave up
+                self.release()
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            raise
+
+    def release(self):
+        # A freed slot goes straight to the next waiter, so busy only drops when nobody is queued
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.busy -= 1
+
+
+class CommandScheduler:
+    """Виконує по черзі команди, що торкаються одного ресурсу, а незалежні команди — одночасно
+
+    Ресурс команди визначається за її початком. Кілька ресурсів захоплюються завжди в одному порядку, тож команди
+    не можуть чекати одна на одну по колу. Команди без ресурсів (час, калькулятор, пошук у чаті) ніколи не чекають.
+    """
+
+    def __init__(self, resources=const.COMMAND_RESOURCES, capacities=const.RESOURCE_CAPACITY,
+                 timeout=const.COMMAND_QUEUE_TIMEOUT):
+        self.prefixes = {name: tuple(prefixes) for name, prefixes in resources.items()}
+        self.timeout = timeout
+        self._resources = {name: _Resource(capacities.get(name, 1)) for name in resources}
+
+    def resources_for(self, command):
+        """Повертає відсортовані назви ресурсів, яких торкається команда"""
+        return tuple(sorted(name for name, prefixes in self.prefixes.items() if command.startswith(prefixes)))
+
+    @contextlib.asynccontextmanager
+    async def claim(self, command):
+        """Чекає, поки звільняться ресурси команди, і тримає їх до кінця блоку; ResourceBusy, якщо черга задовга"""
+        names = self.resources_for(command)
+        acquired = []
+        deadline = time.perf_counter() + self.timeout
+        try:
+            for name in names:
+                started = time.perf_counter()
+                try:
+                    await self._resources[name].acquire(max(0.0, deadline - started))
+                except asyncio.TimeoutError:
+                    metrics.COMMAND_QUEUE_TIMEOUTS.inc(resource=name)
+                    logging.warning("Command '%s' gave up waiting for resource '%s' after %.1fs.", command, name,
+                                    self.timeout)
+                    raise ResourceBusy(name) from None
+                waited = time.perf_counter() - started
+                metrics.COMMAND_QUEUE_WAIT.observe(waited, resource=name)
+                if waited > const.COMMAND_QUEUE_LOG_THRESHOLD:
+                    logging.info("Command '%s' waited %.2fs for resource '%s'.", command, waited, name)
+                acquired.append(name)
+            yield names
+        finally:
+            for name in reversed(acquired):
+                self._resources[name].release()
+
+    def stats(self):
+        """Повертає кількість зайнятих місць і команд у черзі для кожного ресурсу"""
+        return {name: {"busy": resource.busy, "waiting": resource.waiting, "capacity": resource.capacity}
+                for name, resource in self._resources.items()}
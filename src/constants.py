@@ -1,52 +1,11 @@
 import os
 import sys
-import tempfile
 
-import flet as ft
-
-# Base Colors (used for themes)
-DEEP_PURPLE_400 = ft.Colors.DEEP_PURPLE_400
-PURPLE_400 = ft.Colors.PURPLE_400
-DEEP_PURPLE_500 = ft.Colors.DEEP_PURPLE_500
-INITIATION_COLOR = ft.Colors.SURFACE_CONTAINER_HIGHEST
-
-# Theme Colors
+# Theme
 THEME_DARK = "dark"
 THEME_LIGHT = "light"
-
-COLORS_DARK = {"BGCOLOR": "#2f0c3d", "MAINBGCOLOR": "#151218", "MAINCOLOR": ft.Colors.PURPLE_300,
-               "ICON_COLOR": ft.Colors.PURPLE_300, }
-
-COLORS_LIGHT = {"BGCOLOR": "#f3e5f5", "MAINBGCOLOR": "#fafafa", "MAINCOLOR": ft.Colors.DEEP_PURPLE_400,
-                "ICON_COLOR": ft.Colors.PURPLE_600, }
-
-ACCENT_COLORS = {"Deep Purple": ft.Colors.DEEP_PURPLE_400, "Indigo": ft.Colors.INDIGO_400, "Blue": ft.Colors.BLUE_400,
-                 "Teal": ft.Colors.TEAL_400, "Green": ft.Colors.GREEN_400, "Orange": ft.Colors.ORANGE_400,
-                 "Pink": ft.Colors.PINK_400, }
-
-ACCENT_COLORS_LIST = list(ACCENT_COLORS.keys())
-
-CHAT_FALLBACK_COLORS = {"user_bubble": ft.Colors.PRIMARY_CONTAINER, "user_text": ft.Colors.ON_PRIMARY_CONTAINER,
-                        "bot_bubble": ft.Colors.SECONDARY_CONTAINER, "bot_text": ft.Colors.ON_SECONDARY_CONTAINER,
-                        "system_bubble": ft.Colors.TERTIARY_CONTAINER, "system_text": ft.Colors.ON_TERTIARY_CONTAINER}
-
-# Logging
-LOG_FILENAME = "avrora.log"
-
-# UI Icons
-INFO_ICON = ft.Icons.INFO
-SETTINGS_ICON = ft.Icons.SETTINGS
-MIC_ICON = ft.Icons.MIC_NONE
-LOADING_ICON = ft.Icons.AUTORENEW_ROUNDED
-SPEAKING_ICON = ft.Icons.VOLUME_UP_OUTLINED
-SUNNY_ICON = ft.Icons.SUNNY
-CLOUDY_ICON = ft.Icons.WB_CLOUDY
-WATER_DROP_ICON = ft.Icons.WATER_DROP
-THUNDER_STORM_ICON = ft.Icons.THUNDERSTORM
-CLOUDY_SNOWING_ICON = ft.Icons.CLOUDY_SNOWING
-FOGGY_ICON = ft.Icons.FOGGY
-THERMOSTAT_ICON = ft.Icons.DEVICE_THERMOSTAT
-SEND_ICON = ft.Icons.SEND
+ACCENT_COLORS_LIST = ["Deep Purple", "Indigo", "Blue", "Teal", "Green", "Orange", "Pink"]
+DEFAULT_ACCENT_COLOR = ACCENT_COLORS_LIST[0]
 
 # Core constants
 WAKE_WORD = "аврора"
@@ -56,6 +15,12 @@ RESTART_COMMAND = "restart"
 # Roles
 USER_ROLE = "user"
 PROGRAM_ROLE = "program"
+
+# Kinds of structured chat messages
+MESSAGE_KIND_TEXT = "text"
+MESSAGE_KIND_WEATHER = "weather"
+MESSAGE_KIND_NEWS = "news"
+MESSAGE_KIND_TODO = "todo"
 SYSTEM_ROLE = "center"
 
 # Statuses
@@ -66,18 +31,11 @@ STATUS_NONE = "none"
 
 # Audio Settings
 PAUSE_THRESHOLD = 0.8  # секунди тиші, після яких фраза вважається завершеною
+BARGE_IN_ENERGY_FACTOR = 1.5  # наскільки голос має бути гучнішим за власне озвучення, щоб його перервати
+BARGE_IN_CANCEL_TIMEOUT = 0.5  # скільки чекати на скасування перерваної команди, секунди
 LANGUAGE = "uk-UA"
 TTS_LANGUAGE = "uk"
 
-# Icons of weather
-WEATHER_ICONS = {"ясно": SUNNY_ICON, "сонячно": SUNNY_ICON, "мінлива хмарність": CLOUDY_ICON, "хмарно": CLOUDY_ICON,
-                 "похмуро": CLOUDY_ICON, "туман": FOGGY_ICON, "мгла": FOGGY_ICON, "дощ": WATER_DROP_ICON,
-                 "легкий дощ": WATER_DROP_ICON, "злива": THUNDER_STORM_ICON, "гроза": THUNDER_STORM_ICON,
-                 "сніг": CLOUDY_SNOWING_ICON, "легкий сніг": CLOUDY_SNOWING_ICON, "мокрий сніг": CLOUDY_SNOWING_ICON,
-                 "хуртовина": CLOUDY_SNOWING_ICON, "град": CLOUDY_SNOWING_ICON,
-                 "невеликий дощ з грозою": THUNDER_STORM_ICON, "дощ зі снігом": CLOUDY_SNOWING_ICON,
-                 "змінна хмарність": CLOUDY_ICON}
-
 # Keys translation
 KEYS_EN = {"й": "q", "ц": "w", "у": "e", "к": "r", "е": "t", "н": "y", "г": "u", "ш": "i", "щ": "o", "з": "p", "х": "[",
            "ї": "]", "ф": "a", "і": "s", "в": "d", "а": "f", "п": "g", "р": "h", "о": "j", "л": "k", "д": "l", "ж": ";",
@@ -112,12 +70,36 @@ def get_user_data_path(filename):
 SETTINGS_FILENAME = get_user_data_path("settings.json")
 CUSTOM_COMMANDS_FILENAME = get_user_data_path("customCommands.json")
 CHAT_HISTORY_FILENAME = get_user_data_path("chat_history.json")
+CHAT_LOG_FILENAME = get_user_data_path("chat_history.log")
+CHAT_INDEX_FILENAME = get_user_data_path("chat_index.log")
 INFO_TABLE_FILENAME = get_user_data_path("commandsTable.json")
 DEFAULT_INFO_TABLE_FILENAME = get_resource_path("assets/commandsTable.json")
 TODO_LIST_FILENAME = get_user_data_path("todoList.txt")
+TODO_LOG_FILENAME = get_user_data_path("todoList.log")
+SCHEDULE_FILENAME = get_user_data_path("schedule.json")
 
-# TTS output should go to a temporary directory
-TTS_OUTPUT = os.path.join(tempfile.gettempdir(), "avrora_output.mp3")
+# Logging
+LOG_FILENAME = get_user_data_path("avrora.log")
+LOG_LEVEL = "INFO"
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s"
+LOG_FORMAT_ENV = "AVRORA_LOG_FORMAT"  # значення "json" вмикає структурований журнал
+LOG_MAX_BYTES = 2 * 1024 * 1024
+LOG_BACKUP_COUNT = 5  # старі файли журналу стискаються в .gz
+
+# Tracing
+TRACE_LOGGER = "avrora.trace"
+TRACE_FILENAME = get_user_data_path("traces.jsonl")  # один span у форматі OTLP/JSON на рядок
+TRACE_MAX_BYTES = 2 * 1024 * 1024
+TRACE_BACKUP_COUNT = 3
+TRACE_SUMMARY_WINDOW = 1000  # скільки останніх вимірів кожного етапу враховує зведення
+
+# Audio output
+AUDIO_PRIORITY_ALARM = 0  # менше число - вищий пріоритет
+AUDIO_PRIORITY_REPLY = 1
+AUDIO_PRIORITY_CHATTER = 2  # проміжні фрази на кшталт "шукаю"
+AUDIO_BLOCKSIZE = 1024  # кадрів на блок; за один блок перерваний кліп плавно затихає
+AUDIO_RESUME_REWIND = 0.5  # на скільки секунд назад продовжувати перерваний кліп
+AUDIO_CHATTER_TTL = 5.0  # проміжна фраза, що чекала довше, пропускається
 
 # Web Addresses
 YOUTUBE_URL = "https://www.youtube.com"
@@ -127,12 +109,96 @@ YOUTUBE_SEARCH_URL = "https://music.youtube.com/search?q="
 GEMINI_URL = "https://gemini.google.com/?hl=uk"
 CHATGPT_URL = "https://chatgpt.com"
 
+# Executor lanes
+AUDIO_WORKERS = 2  # запис з мікрофона і озвучення можуть іти одночасно
+IO_WORKERS = 2
+NETWORK_WORKERS = 4
+DESKTOP_WORKERS = 1  # події клавіатури і миші мають виконуватися по черзі
+EXECUTOR_WAIT_WARNING = 1.0  # секунди очікування в черзі, після яких пишемо попередження
+
+# Scheduler
+JOB_KIND_REMINDER = "reminder"
+JOB_KIND_ALARM = "alarm"
+SCHEDULER_MAX_SLEEP = 60  # найдовший сон таймера між перевірками годинника, секунди
+SCHEDULER_FIRE_TOLERANCE = 0.05
+SCHEDULER_CLOCK_JUMP = 5  # розбіжність системного і монотонного годинника, яка вважається стрибком
+SCHEDULER_MISSED_GRACE = 60 * 60  # пропущені під час простою події старші за це не відтворюються
+SCHEDULER_COMPACT_MIN = 64
+
+# ToDo list
+TODO_LOG_COMPACT_MIN = 64  # кількість записів журналу, після якої він може бути ущільнений
+
+# System monitor
+MONITOR_INTERVAL = 1.0  # період збору метрик, секунди
+MONITOR_CAPACITY = 3600  # кількість зразків у кільцевому буфері (година при інтервалі в секунду)
+MONITOR_WINDOW = 60  # вікно для середніх і пікових значень, секунди
+MONITOR_PROCESS_EVERY = 5  # список процесів оновлюється кожні N зразків
+MONITOR_TOP_N = 5
+
+# Command profiling
+PROFILE_DIR = get_user_data_path("profiles")
+PROFILE_INDEX_NAME = "index.json"
+PROFILE_KEEP = 20  # скільки найповільніших профілів команд зберігати на диску
+PROFILE_TOP_N = 5
+
+# Metrics
+METRICS_HOST = "127.0.0.1"  # метрики доступні лише з цього комп'ютера
+METRICS_PORT = 9465
+METRICS_SNAPSHOT_FILENAME = get_user_data_path("metrics.json")
+METRICS_SNAPSHOT_INTERVAL = 60  # секунди між знімками метрик у файл
+METRICS_DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # межі кошиків гістограм тривалості, секунди
+METRICS_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+METRICS_QUEUE_BUCKETS = (0.001, 0.01, 0.1, 0.5, 1, 2.5, 5, 10, 30)
+
+# Background tasks
+TASK_CATEGORY_SCHEDULED = "scheduled"  # нагадування і будильники, що спрацювали
+TASK_CATEGORY_API = "api"  # команди, надіслані через WebSocket у режимі без інтерфейсу
+TASK_CATEGORY_PROCESS = "process"  # очікування завершення запущених програм
+TASK_CATEGORY_BACKGROUND = "background"
+TASK_LIMITS = {TASK_CATEGORY_SCHEDULED: 4, TASK_CATEGORY_API: 8, TASK_CATEGORY_PROCESS: 64}  # скільки задач категорії виконуються одночасно
+TASK_DEFAULT_LIMIT = 4
+# Перезавантаження чекає лише короткі задачі: спостерігачі за програмами живуть, поки програма відкрита
+TASK_RELOAD_DRAIN_CATEGORIES = (TASK_CATEGORY_SCHEDULED, TASK_CATEGORY_API)
+TASK_DRAIN_TIMEOUT = 5.0  # скільки чекати завершення фонових задач під час виходу чи перезавантаження, секунди
+
+# Launched processes
+PROCESS_RUN_TIMEOUT = 10.0  # найдовше очікування короткої команди терміналу, секунди
+PROCESS_KILL_GRACE = 1.0  # скільки чекати завершення процесу, якого вбили через тайм-аут, секунди
+PROCESS_HISTORY_KEEP = 50  # скільки завершених процесів пам'ятати
+
+# Event loop watchdog
+WATCHDOG_INTERVAL = 0.1  # як часто цикл подій відмічається, що живий, секунди
+WATCHDOG_THRESHOLD = 0.25  # запізнення, з якого цикл подій вважається заблокованим, секунди
+WATCHDOG_KEEP = 20  # скільки останніх блокувань пам'ятати
+
+# Headless mode
+HEADLESS_FLAG = "--headless"
+HEADLESS_HOST = "127.0.0.1"  # API доступний лише з цього комп'ютера
+HEADLESS_PORT = 8765
+HEADLESS_MAX_TEXT = 1000
+HEADLESS_LATENCY_WINDOW = 1000  # кількість останніх команд для обчислення затримок
+HEADLESS_TOKEN_FILENAME = get_user_data_path("headless.token")  # ключ API, новий при кожному запуску
+HEADLESS_TOKEN_HEADER = "X-Avrora-Token"
+HEADLESS_TOKEN_QUERY = "token"  # браузерний WebSocket не може передати заголовок, тому ключ можна дати в адресі
+HEADLESS_PUBLIC_PATHS = ("/health",)
+HEADLESS_LOCAL_ORIGIN_HOSTS = ("localhost", "127.0.0.1", "[::1]", "::1")
+
+# Chat search
+CHAT_SEARCH_LIMIT = 5
+CHAT_SEARCH_BM25_K1 = 1.2
+CHAT_SEARCH_BM25_B = 0.75
+CHAT_INDEX_MIN_STEM = 3  # мінімальна довжина основи слова після відкидання закінчення
+CHAT_INDEX_SUFFIXES = ["ами", "ями", "ого", "ому", "ими", "іми", "ові", "еві", "ах", "ях", "ам", "ям", "ів",
+                       "ою", "ею", "ий", "ій", "их", "іх", "ом", "ем", "ла", "ли", "ло", "а", "я", "о",
+                       "е", "у", "ю", "і", "и", "ь", "й"]
+
 # Other
-MAX_WORKERS = 4
 DEFAULT_NAME = ""
 DEFAULT_TG_PATH = ""
 DEFAULT_MUSIC_LINK = "https://music.youtube.com/"
 DEFAULT_CITY = ""
+NUM_HEADLINES_MIN = 1  # Найменша кількість заголовків новин
+NUM_HEADLINES_MAX = 10  # Найбільша кількість заголовків новин
 DEFAULT_THEME = "dark"
 
 # News Settings
@@ -191,6 +257,7 @@ SAVE_CHAT_CHECKBOX_LABEL = "Зберігати чат"
 INFO_HEADER_LABEL = "Для того щоб A.V.R.O.R.A. почала вас чути скажіть аврора [команда]"
 INFO_TABLE_HEADER_COMMAND = "Команда"
 INFO_TABLE_HEADER_ACTION = "Дія"
+INFO_TABLE_CUSTOM_ACTION = "Власна команда: {}"
 STATUS_TOOLTIP = "Статус"
 DROPDOWN_CHOOSE_COMMAND_LABEL = "Оберіть команду"
 FIRST_LAUNCH_EMPTY_NAME_ERROR = "Ім'я не може бути порожнім"
@@ -201,9 +268,13 @@ ACCENT_COLOR_LABEL = "Акцентний колір"
 DEVELOPED_BY_LABEL = "#### Розроблено CHRONOiS"
 CONTACT_US_LABEL = "#### Якщо виникнуть якісь питання звяжіться з нами за допомогою телеграму: @Chronos4"
 WEATHER_HEADER_LABEL = "Прогноз погоди в місті {}"
+NEWS_HEADER_LABEL = "Останні новини"
+NEWS_SOURCE_LABEL = "Джерело: "
+TODO_HEADER_LABEL = "Список справ"
 SEND_MSG_FIELD_LABEL = "Введіть команду..."
 SEND_BUTTON_LABEL = "Відправити"
 SILENT_MODE_CHECKBOX_LABEL = "Тихий режим"
+PASTE_TEXT_CHECKBOX_LABEL = "Вставляти текст через буфер обміну"
 
 CUSTOM_COMMANDS_HELP_LABEL = """
 ### Як додати власні команди:
@@ -253,12 +324,20 @@ CMD_GREETING_VARIANTS = ["вітаю", "startup."]
 CMD_WHO_ARE_YOU = "хто ти"
 CMD_GOODBYE = "до побачення"
 CMD_RESTART_APP = "перезавантаження"
+CMD_FULL_RESTART_APP = "повний перезапуск"
+CMD_SEARCH_CHAT = "знайди в чаті "
 CMD_SEARCH = "знайди "
 CMD_OPEN = "відкрий "
 CMD_PLAY_MUSIC_SIMPLE_VARIANTS = ["включи музику", "ввімкни музику", "увімкни музику"]
 CMD_PLAY_SONG_VARIANTS = ["включи пісню ", "ввімкни пісню ", "увімкни пісню "]
 CMD_CPU_LOAD = "навантаження на процесор"
 CMD_RAM_LOAD = "навантаження на оперативну пам'ять"
+CMD_SYSTEM_STATUS = "стан системи"
+CMD_TOP_CPU_PROCESSES = "які процеси навантажують процесор"
+CMD_TOP_MEMORY_PROCESSES = "які процеси займають пам'ять"
+CMD_PROFILING_ON = "увімкни профілювання"
+CMD_PROFILING_OFF = "вимкни профілювання"
+CMD_SHOW_PROFILE = "покажи профіль"
 CMD_WHAT_TIME = "котра година"
 CMD_GET_NEWS_VARIANTS = ["які новини", "покажи новини"]
 CMD_THANK_YOU_PREFIX = "дякую"
@@ -268,6 +347,8 @@ CMD_DOUBLE_CLICK = "натисни 2 рази"
 CMD_SCROLL = "прокрути "
 CMD_REMIND = "нагадай про"
 CMD_SET_ALARM = "будильник на "
+CMD_LIST_SCHEDULED_VARIANTS = ["які нагадування", "список нагадувань", "які будильники", "список будильників"]
+CMD_CANCEL_SCHEDULED_VARIANTS = ["скасуй нагадування ", "скасуй будильник "]
 CMD_GET_WEATHER_VARIANTS = ["яка погода", "погода", "прогноз погоди"]
 CMD_GET_LOCATION_VARIANTS = ["де я", "місто"]
 CMD_CALCULATE = "порахуй "
@@ -305,6 +386,42 @@ CMD_SET_NUM_OF_HEADLINES = "встанови число заголовків н
 CMD_CHANGE_THEME = "зміни тему"
 CMD_CHANGE_ACCENT_COLOR = "зміни колір"
 
+# Multi-intent commands
+INTENT_SEPARATORS = ["а також", "а потім", "і потім", "потім", "і", "й", "та"]
+# Команди без побічних дій, які можна виконувати одночасно
+CONCURRENT_INTENT_PREFIXES = (CMD_WHAT_TIME, CMD_GET_DATE, CMD_CPU_LOAD, CMD_RAM_LOAD, CMD_SYSTEM_STATUS,
+                              CMD_TOP_CPU_PROCESSES, CMD_TOP_MEMORY_PROCESSES, *CMD_GET_NEWS_VARIANTS,
+                              *CMD_GET_WEATHER_VARIANTS, *CMD_GET_LOCATION_VARIANTS, *CMD_LIST_SCHEDULED_VARIANTS,
+                              *CMD_SHOW_TODO_VARIANTS)
+# Команди, які забирають увесь текст до кінця фрази
+GREEDY_INTENT_PREFIXES = (CMD_WRITE_TEXT,)
+
+# Ресурси, яких торкаються команди: команди з одним ресурсом виконуються по черзі, решта — одночасно
+RESOURCE_INPUT = "input"  # клавіатура, миша і вікна
+RESOURCE_AUDIO = "audio"  # гучність і відтворення музики
+RESOURCE_SETTINGS = "settings"
+RESOURCE_TODO = "todo"
+RESOURCE_NETWORK = "network"
+COMMAND_RESOURCES = {
+    RESOURCE_INPUT: (CMD_MOVE_CURSOR, CMD_CLICK, CMD_SCROLL, CMD_WRITE_TEXT, CMD_SWITCH_TAB,
+                     *CMD_HIDE_WINDOW_VARIANTS, *CMD_SHOW_WINDOW_VARIANTS, *CMD_HIDE_ALL_WINDOWS_VARIANTS,
+                     *CMD_SHOW_ALL_WINDOWS_VARIANTS, *CMD_CLOSE_PROGRAM_VARIANTS, *CMD_SWITCH_WINDOW_VARIANTS,
+                     *CMD_PAUSE_SONG_VARIANTS, *CMD_RESUME_SONG_VARIANTS, *CMD_NEXT_SONG_VARIANTS,
+                     *CMD_PREVIOUS_SONG_VARIANTS),
+    RESOURCE_AUDIO: (*CMD_SET_VOLUME_VARIANTS, *CMD_PLAY_MUSIC_SIMPLE_VARIANTS, *CMD_PLAY_SONG_VARIANTS,
+                     *CMD_PAUSE_SONG_VARIANTS, *CMD_RESUME_SONG_VARIANTS, *CMD_NEXT_SONG_VARIANTS,
+                     *CMD_PREVIOUS_SONG_VARIANTS),
+    RESOURCE_SETTINGS: (CMD_NAME_ME, CMD_I_AM_IN_CITY, CMD_SILENT_MODE_ON, CMD_SILENT_MODE_OFF,
+                        CMD_SET_NUM_OF_HEADLINES, CMD_CHANGE_THEME, CMD_CHANGE_ACCENT_COLOR, CMD_PROFILING_ON,
+                        CMD_PROFILING_OFF, CMD_RESTART_APP),
+    RESOURCE_TODO: (CMD_ADD_TODO, CMD_REMOVE_TODO, *CMD_CLEAR_TODO_VARIANTS),
+    RESOURCE_NETWORK: (*CMD_GET_NEWS_VARIANTS, *CMD_GET_WEATHER_VARIANTS, *CMD_GET_LOCATION_VARIANTS,
+                       *CMD_PLAY_SONG_VARIANTS),
+}
+RESOURCE_CAPACITY = {RESOURCE_NETWORK: 4}  # скільки команд можуть одночасно користуватися ресурсом, типово одна
+COMMAND_QUEUE_TIMEOUT = 30.0  # найдовше очікування ресурсу командою, секунди
+COMMAND_QUEUE_LOG_THRESHOLD = 0.5  # очікування, довші за це, записуються в журнал, секунди
+
 # Command parameters
 CMD_PARAM_UP = "вверх"
 CMD_PARAM_DOWN = "вниз"
@@ -319,7 +436,22 @@ CMD_PARAM_CALC_MINUS = ["мінус", "відняти"]
 CMD_PARAM_CALC_MUL = ["помножити на", "помножити"]
 CMD_PARAM_CALC_DIV = ["ділення на", "ділення", "поділити на", "поділити"]
 CMD_PARAM_CALC_REPLACE_NA = "на"
-CMD_PARAM_CALC_ALLOWED_CHARS = "0123456789+-*/. "
+CMD_PARAM_CALC_POW = ["в степені", "у степені", "до степеня"]
+CMD_PARAM_CALC_PERCENT = ["відсотків", "відсотки", "відсоток", "процентів"]
+CMD_PARAM_CALC_OF = "від"
+CMD_PARAM_CALC_DECIMAL = "кома"
+CMD_PARAM_CALC_ALLOWED_CHARS = "0123456789+-*/.() "
+
+# Calculator
+CALC_WORDS = {**{word: " + " for word in CMD_PARAM_CALC_PLUS}, **{word: " - " for word in CMD_PARAM_CALC_MINUS},
+              **{word: " * " for word in CMD_PARAM_CALC_MUL}, **{word: " / " for word in CMD_PARAM_CALC_DIV},
+              **{word: " ** " for word in CMD_PARAM_CALC_POW}, **{word: "%" for word in CMD_PARAM_CALC_PERCENT},
+              CMD_PARAM_CALC_OF: " * ", CMD_PARAM_CALC_DECIMAL: ".", CMD_PARAM_CALC_REPLACE_NA: " "}
+CALC_MAX_LENGTH = 256
+CALC_MAX_STEPS = 200  # максимальна кількість вузлів виразу
+CALC_MAX_EXPONENT = 1000
+CALC_MAX_OPERAND = 10 ** 18  # найбільше за модулем число в проміжних результатах
+CALC_CACHE_SIZE = 256
 
 # System commands
 SYS_CMD_SHUTDOWN = "shutdown -s -t 0"
@@ -335,6 +467,12 @@ HOTKEY_ALT_TAB = ('alt', 'tab')
 HOTKEY_CTRL_TAB = ('ctrl', 'tab')
 HOTKEY_NEXT_SONG = ('shift', 'n')
 HOTKEY_PREVIOUS_SONG = ('shift', 'p')
+HOTKEY_PASTE = ('ctrl', 'v')
+
+# Text input
+CLIPBOARD_RESTORE_DELAY = 0.2  # секунди, протягом яких програма встигає прочитати буфер обміну
+TYPE_CHUNK_SIZE = 64
+TYPE_INTERVAL = 0.03
 
 # Other strings
 GEOCODER_IP_ME = "me"
@@ -350,6 +488,10 @@ RESPONSE_CLARIFY = "Не розумію, можете уточнити?"
 GENERIC_AFFIRMATIVE_RESPONSES = ["Секунду, {}", "Зараз, {}", "Звісно, {}"]
 RESPONSE_WHO_ARE_YOU = "{}, я голосовий помічник AVRORA що розшифровується як " + APP_FULL_NAME + ", чим я можу вам допомогти?"
 RESPONSE_RESTARTING_APP = "Перезавантажуюся, {}"
+RESPONSE_RELOADED = "Оновила налаштування і команди, {}"
+RESPONSE_RELOAD_FAILED = "Не вдалося оновити налаштування, {}. Скажіть «повний перезапуск», щоб перезапустити програму"
+RESPONSE_COMMAND_BUSY = "{}, попередня команда ще виконується, спробуйте трохи згодом"
+RESPONSE_TASK_FAILED = "Фонова задача «{0}» завершилася з помилкою: {1}"
 RESPONSE_GREETING = "Вітаю, {}, все готово до роботи"
 RESPONSE_GOODBYE = "До побачення, {}"
 RESPONSE_SEARCHING = "Шукаю, {}"
@@ -364,6 +506,22 @@ RESPONSE_SONG_NOT_FOUND = "На жаль, не вдалося знайти пі
 RESPONSE_MEASURING_CPU = "заміряю {}"
 RESPONSE_CPU_LOAD = "{}% {}"
 RESPONSE_RAM_LOAD = "Використано {}%. всього пам'яті {:.2f} гігабайти. доступно пам'яті {:.2f} гігабайти"
+RESPONSE_SYSTEM_STATUS = ("За останню хвилину, {}: процесор в середньому {:.0f}%, пік {:.0f}%. "
+                          "Пам'ять в середньому {:.0f}%, пік {:.0f}%. "
+                          "Диск: читання {:.1f} мегабайт за секунду, запис {:.1f}. "
+                          "Мережа: отримано {:.1f} мегабайт за секунду, відправлено {:.1f}")
+RESPONSE_SYSTEM_STATUS_NOT_READY = "Ще збираю дані про систему, {}. Спробуйте за кілька секунд"
+RESPONSE_TOP_CPU_PROCESSES = "Найбільше навантажують процесор, {}:\n{}"
+RESPONSE_TOP_MEMORY_PROCESSES = "Найбільше пам'яті займають, {}:\n{}"
+RESPONSE_TOP_CPU_PROCESS_ITEM = "{}. {} — {:.1f}%"
+RESPONSE_TOP_MEMORY_PROCESS_ITEM = "{}. {} — {:.0f} мегабайт"
+RESPONSE_PROFILING_ON = "Профілювання команд увімкнено, {}"
+RESPONSE_PROFILING_OFF = "Профілювання команд вимкнено, {}"
+RESPONSE_PROFILE_EMPTY = "Ще немає профілів команд, {}. Увімкніть профілювання і виконайте кілька команд"
+RESPONSE_PROFILE = "Найповільніші команди, {}:\n{}\nНайгарячіші функції за сесію:\n{}"
+RESPONSE_PROFILE_COMMAND_ITEM = "{}. «{}» — {:.2f} с{}"
+RESPONSE_PROFILE_LANE_ITEM = "{} {:.2f} с"
+RESPONSE_PROFILE_FUNCTION_ITEM = "{}. {} — {:.3f} с, викликів: {}"
 RESPONSE_CURRENT_TIME = "{}, зараз {}:{}:{}"
 RESPONSE_SEARCHING_NEWS = "Шукаю новини, {}"
 RESPONSE_LATEST_NEWS = "Ось останні {} новин: \n"
@@ -383,6 +541,12 @@ RESPONSE_ALARM_TRIGGERED = "Будильник! {}, зараз {}."
 RESPONSE_ALARM_ERROR_FORMAT = "Неправильний формат часу. Будь ласка, вкажіть час у форматі ГГ:ХХ, {}. Помилка: {}"
 RESPONSE_ALARM_ERROR_UNKNOWN = "Виникла невідома помилка при встановленні будильника: {}"
 RESPONSE_ALARM_TTS_ERROR = "Будильник спрацював, але виникла помилка відтворення звуку: {}"
+RESPONSE_SCHEDULED_LIST = "Ось ваші нагадування та будильники, {}:\n{}"
+RESPONSE_SCHEDULED_EMPTY = "У вас немає запланованих нагадувань, {}"
+RESPONSE_SCHEDULED_ITEM_REMINDER = "{}. {} — нагадування: {}"
+RESPONSE_SCHEDULED_ITEM_ALARM = "{}. {} — будильник"
+RESPONSE_SCHEDULED_CANCELLED = "Скасувала, {}"
+RESPONSE_SCHEDULED_NOT_FOUND = "Не знайшла такого нагадування, {}"
 RESPONSE_LOCATION = "Ви знаходитесь у місті {}, {}."
 RESPONSE_LOCATION_FAILED = "Не вдалося визначити ваше місцезнаходження."
 RESPONSE_WEATHER_FAILED_NO_CITY = "Не вдалося визначити ваше місто. Спробуйте вказати його в налаштуваннях."
@@ -424,6 +588,9 @@ RESPONSE_WRITE_TEXT = "Написала, {}"
 RESPONSE_CUSTOM_COMMAND_EXECUTING = "Виконую, {}"
 RESPONSE_CUSTOM_COMMAND_ERROR = "Помилка з користувацькою командою, {}"
 RESPONSE_UNKNOWN_COMMAND = "Не розумію команду '{}', {}"
+RESPONSE_CHAT_SEARCH_RESULTS = "Ось що я знайшла в чаті, {}:\n{}"
+RESPONSE_CHAT_SEARCH_ITEM = "{}. {}"
+RESPONSE_CHAT_SEARCH_EMPTY = "Нічого не знайшла в чаті, {}"
 RESPONSE_NEW_NAME = "Тепер буду називати вас {}"
 RESPONSE_REMEMBERED = "Запам'ятала, {}"
 RESPONSE_CHANGE_SETTINGS = "Налаштовую, {}"
@@ -443,4 +610,6 @@ TABLE_VARIANTS = {"включи музику*": "ввімкни музику\nу
                   "пауза*": "пауза трека\nпауза пісні\nпризупини трек\nпризупини пісню\nпризупини\nпостав на паузу",
                   "віднови пісню*": "віднови трек\nпродовжити трек\nпродовжи пісню\nзніми з паузи",
                   "наступна пісня*": "наступний трек\nпереключи трек\nпереключи пісню",
-                  "попередня пісня*": "попередня пісня\nпопередній трек"}
+                  "попередня пісня*": "попередня пісня\nпопередній трек",
+                  "які нагадування*": "список нагадувань\nякі будильники\nсписок будильників",
+                  "скасуй нагадування [номер]*": "скасуй будильник [номер]"}
@@ -0,0 +1,82 @@
+import inspect
+import logging
+from collections import defaultdict
+
+
+class Event:
+    """Базова подія, яку ядро публікує для інтерфейсу"""
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class SettingsChanged(Event):
+    """Налаштування змінилися; changes містить лише ключі, значення яких стали іншими"""
+    __slots__ = ("changes",)
+
+    def __init__(self, changes):
+        self.changes = changes
+
+
+class ChatMessage(Event):
+    __slots__ = ("text", "role")
+
+    def __init__(self, text, role):
+        self.text = text
+        self.role = role
+
+
+class ChatCleared(Event):
+    __slots__ = ()
+
+
+class StatusChanged(Event):
+    __slots__ = ("status",)
+
+    def __init__(self, status):
+        self.status = status
+
+
+class WindowRequest(Event):
+    """Прохання показати або сховати вікно програми"""
+    __slots__ = ("minimized", "focused")
+
+    def __init__(self, minimized, focused):
+        self.minimized = minimized
+        self.focused = focused
+
+
+class ConfigReloaded(Event):
+    """Налаштування, власні команди і таблицю команд перечитано з диска"""
+    __slots__ = ("settings",)
+
+    def __init__(self, settings):
+        self.settings = settings
+
+
+class EventBus:
+    """Доставляє події підписникам за типом події, у порядку підписки"""
+
+    def __init__(self):
+        self._handlers = defaultdict(list)
+
+    def subscribe(self, event_type, handler):
+        self._handlers[event_type].append(handler)
+        return handler
+
+    def unsubscribe(self, event_type, handler):
+        handlers = self._handlers.get(event_type)
+        if handlers and handler in handlers:
+            handlers.remove(handler)
+
+    async def publish(self, event):
+        for handler in list(self._handlers.get(type(event), ())):
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logging.error("Event handler %s failed for %r: %s", getattr(handler, "__name__", handler), event, e,
+                              exc_info=True)
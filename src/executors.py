@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import constants as const
+import tracing
+
+
+# Lane time spent on behalf of the current command; workers run in a copy of the caller's context, so they see it
+_usage = contextvars.ContextVar("lane_usage", default=None)
+_usage_lock = threading.Lock()
+
+
+class ExecutorLane:
+    """Окремий пул потоків для одного типу блокуючих операцій з метриками черги"""
+
+    def __init__(self, name, max_workers):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"avrora-{name}")
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.queued = 0
+        self.active = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.busy_time = 0.0
+
+    def _run(self, func, args, kwargs, enqueued_at):
+        wait = time.perf_counter() - enqueued_at
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        if wait > const.EXECUTOR_WAIT_WARNING:
+            logging.warning("Lane '%s' task %s waited %.2fs in queue.", self.name, getattr(func, '__name__', func),
+                            wait)
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.active -= 1
+                self.completed += 1
+                self.busy_time += elapsed
+            usage = _usage.get()
+            if usage is not None:
+                with _usage_lock:
+                    usage[self.name] = usage.get(self.name, 0.0) + elapsed
+
+    def _on_done(self, future):
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+                self.cancelled += 1
+
+    async def run(self, func, *args, **kwargs):
+        """Виконує блокуючу функцію в пулі цієї смуги"""
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+        with tracing.span(f"{self.name}.{getattr(func, '__name__', 'call')}"):
+            # The worker runs in a copy of the caller's context, so spans opened there nest under this one
+            context = contextvars.copy_context()
+            future = self._executor.submit(context.run, self._run, func, args, kwargs, time.perf_counter())
+            future.add_done_callback(self._on_done)
+            return await asyncio.wrap_future(future)
+
+    def snapshot(self):
+        """Повертає поточні метрики смуги"""
+        with self._lock:
+            started = self.completed + self.active
+            return {"workers": self.max_workers, "queued": self.queued, "active": self.active,
+                    "submitted": self.submitted, "completed": self.completed, "failed": self.failed,
+                    "cancelled": self.cancelled, "avg_wait": self.total_wait / started if started else 0.0,
+                    "max_wait": self.max_wait, "busy_time": self.busy_time}
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+AUDIO = ExecutorLane("audio", const.AUDIO_WORKERS)
+IO = ExecutorLane("io", const.IO_WORKERS)
+NETWORK = ExecutorLane("network", const.NETWORK_WORKERS)
+DESKTOP = ExecutorLane("desktop", const.DESKTOP_WORKERS)
+
+LANES = {lane.name: lane for lane in (AUDIO, IO, NETWORK, DESKTOP)}
+
+
+def snapshot():
+    """Повертає метрики всіх смуг"""
+    return {name: lane.snapshot() for name, lane in LANES.items()}
+
+
+@contextlib.contextmanager
+def measure_usage():
+    """Рахує час смуг, витрачений на задачі, запущені з цього блоку чи з задач, створених у ньому"""
+    usage = {}
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+def shutdown(wait=False):
+    """Зупиняє всі пули потоків"""
+    for lane in LANES.values():
+        lane.shutdown(wait=wait)
@@ -0,0 +1,275 @@
+import asyncio
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from aiohttp import web, WSMsgType
+
+import avroraCore
+import constants as const
+import events
+import executors
+import messages
+import textNormalizer
+import tracing
+
+
+def _to_json(event):
+    """Перетворює подію ядра на повідомлення для клієнта API"""
+    if isinstance(event, events.ChatMessage):
+        return {"type": "message", "role": event.role, "text": event.text}
+    if isinstance(event, events.StatusChanged):
+        return {"type": "status", "status": event.status}
+    if isinstance(event, events.SettingsChanged):
+        return {"type": "settings", "changes": event.changes}
+    if isinstance(event, events.ChatCleared):
+        return {"type": "chat_cleared"}
+    if isinstance(event, events.ConfigReloaded):
+        return {"type": "reloaded", "settings": event.settings}
+    return {"type": "window", "minimized": event.minimized, "focused": event.focused}
+
+
+def _session_bus(send):
+    """Створює шину, яка пересилає всі події ядра одному клієнту"""
+    bus = events.EventBus()
+    for event_type in (events.ChatMessage, events.StatusChanged, events.SettingsChanged, events.ChatCleared,
+                       events.ConfigReloaded, events.WindowRequest):
+        bus.subscribe(event_type, lambda event: send(_to_json(event)))
+    return bus
+
+
+class _Metrics:
+    """Лічильники запитів API і затримки останніх команд"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.sessions = 0
+        self.latencies = deque(maxlen=const.HEADLESS_LATENCY_WINDOW)
+
+    def snapshot(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else 0.0
+
+        uptime = time.monotonic() - self.started
+        return {"uptime": uptime, "requests": self.requests, "errors": self.errors, "in_flight": self.in_flight,
+                "sessions": self.sessions, "throughput": self.requests / uptime if uptime else 0.0,
+                "latency": {"avg": sum(latencies) / len(latencies) if latencies else 0.0, "p50": percentile(0.5),
+                            "p95": percentile(0.95), "p99": percentile(0.99),
+                            "max": latencies[-1] if latencies else 0.0},
+                "executors": executors.snapshot(), "stages": tracing.summary(),
+                "stalls": [{key: value for key, value in stall.items() if key != "stack"}
+                           for stall in avroraCore.loop_watchdog.recent()],
+                "tasks": avroraCore.supervisor.stats(), "resources": avroraCore.command_scheduler.stats(),
+                "processes": {"running": [record.to_dict() for record in avroraCore.process_launcher.running()],
+                              "finished": [record.to_dict() for record in avroraCore.process_launcher.recent()]}}
+
+
+def _is_local_origin(origin):
+    try:
+        return urlsplit(origin).hostname in const.HEADLESS_LOCAL_ORIGIN_HOSTS
+    except ValueError:
+        return False
+
+
+class CommandServer:
+    """Локальний HTTP/WebSocket API для надсилання текстових команд без графічного інтерфейсу"""
+
+    def __init__(self, host=const.HEADLESS_HOST, port=const.HEADLESS_PORT):
+        self.host = host
+        self.port = port
+        self.metrics = _Metrics()
+        self._sockets = set()
+        self._runner = None
+        # Binding to localhost is not enough: any page in the user's browser can reach it, so every route needs a key
+        self.token = secrets.token_urlsafe(32)
+        self.app = web.Application(middlewares=[self._authorize])
+        self.app.add_routes([web.post("/command", self.handle_command), web.get("/ws", self.handle_websocket),
+                             web.get("/metrics", self.handle_metrics), web.get("/health", self.handle_health)])
+
+    @web.middleware
+    async def _authorize(self, request, handler):
+        if request.path in const.HEADLESS_PUBLIC_PATHS:
+            return await handler(request)
+        token = request.headers.get(const.HEADLESS_TOKEN_HEADER) or request.query.get(const.HEADLESS_TOKEN_QUERY, "")
+        if not hmac.compare_digest(token.encode(), self.token.encode()):
+            logging.warning("Rejected headless request to %s from %s: bad or missing token.", request.path,
+                            request.remote)
+            return web.json_response({"error": "Missing or invalid token."}, status=401)
+        return await handler(request)
+
+    def _write_token(self):
+        temp = f"{const.HEADLESS_TOKEN_FILENAME}.tmp"
+        with open(os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w", encoding="utf-8") as f:
+            f.write(self.token)
+        os.replace(temp, const.HEADLESS_TOKEN_FILENAME)
+
+    def _remove_token(self):
+        try:
+            os.remove(const.HEADLESS_TOKEN_FILENAME)
+        except OSError:
+            pass
+
+    async def execute(self, text, bus):
+        """Виконує команду так само, як голосову, але збирає озвучення в текст замість відтворення"""
+        spoken = avroraCore.capture_speech()
+        utterance = textNormalizer.normalize(text)
+        if not utterance.has_wake_word:
+            utterance = textNormalizer.normalize(f"{const.WAKE_WORD} {text}")
+        self.metrics.requests += 1
+        self.metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            with tracing.trace("api_command"):
+                ans, result_message = await avroraCore.doSomething(utterance, bus=bus)
+        except Exception:
+            self.metrics.errors += 1
+            raise
+        finally:
+            self.metrics.in_flight -= 1
+            elapsed = time.perf_counter() - started
+            self.metrics.latencies.append(elapsed)
+        return {"type": "reply", "ans": ans, "text": result_message, "payload": messages.payload_of(result_message),
+                "speech": spoken, "elapsed": elapsed}
+
+    @staticmethod
+    def _read_text(payload):
+        text = payload.get("text") if isinstance(payload, dict) else None
+        if not isinstance(text, str) or not text.strip() or len(text) > const.HEADLESS_MAX_TEXT:
+            raise ValueError("Field 'text' must be a non-empty string.")
+        return text
+
+    async def handle_command(self, request):
+        # A page can send text/plain without a CORS preflight, so only real JSON requests are accepted
+        if request.content_type != "application/json":
+            return web.json_response({"error": "Content-Type must be application/json."}, status=415)
+        try:
+            text = self._read_text(await request.json())
+        except ValueError as e:
+            return web.json_response({"error": str(e)}, status=400)
+        collected = []
+        try:
+            reply = await self.execute(text, _session_bus(collected.append))
+        except Exception as e:
+            logging.error("Headless command '%s' failed: %s", text, e, exc_info=True)
+            return web.json_response({"error": str(e)}, status=500)
+        reply["events"] = collected
+        return web.json_response(reply)
+
+    async def handle_websocket(self, request):
+        origin = request.headers.get("Origin")
+        if origin is not None and not _is_local_origin(origin):
+            logging.warning("Rejected headless WebSocket from origin %s.", origin)
+            return web.json_response({"error": "Origin is not allowed."}, status=403)
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self._sockets.add(ws)
+        self.metrics.sessions += 1
+        send_lock = asyncio.Lock()
+        tasks = set()
+
+        async def send(event):
+            if ws.closed:
+                return
+            async with send_lock:
+                await ws.send_json(event)
+
+        bus = _session_bus(send)
+
+        async def run(request_id, text):
+            try:
+                reply = await self.execute(text, bus)
+            except Exception as e:
+                logging.error("Headless command '%s' failed: %s", text, e, exc_info=True)
+                reply = {"type": "error", "text": str(e)}
+            reply["id"] = request_id
+            await send(reply)
+
+        logging.info("Headless session opened from %s.", request.remote)
+        try:
+            async for msg in ws:
+                if msg.type != WSMsgType.TEXT:
+                    continue
+                try:
+                    payload = json.loads(msg.data)
+                except ValueError:
+                    payload = {"text": msg.data}
+                try:
+                    text = self._read_text(payload)
+                except ValueError as e:
+                    await send({"type": "error", "text": str(e)})
+                    continue
+                # Commands from one session run concurrently, replies carry the request id
+                task = avroraCore.supervisor.spawn(run(payload.get("id"), text), f"api: {text}",
+                                                   const.TASK_CATEGORY_API)
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._sockets.discard(ws)
+            self.metrics.sessions -= 1
+            logging.info("Headless session from %s closed.", request.remote)
+        return ws
+
+    async def handle_metrics(self, request):
+        return web.json_response(self.metrics.snapshot())
+
+    async def handle_health(self, request):
+        return web.json_response({"status": "ok"})
+
+    async def broadcast(self, event):
+        """Надсилає нагадування та будильники всім відкритим сесіям"""
+        message = _to_json(event)
+        for ws in list(self._sockets):
+            if not ws.closed:
+                await ws.send_json(message)
+
+    async def start(self):
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        await executors.IO.run(self._write_token)
+        logging.info("Headless API listening on http://%s:%d, token saved to %s", self.host, self.port,
+                     const.HEADLESS_TOKEN_FILENAME)
+
+    async def stop(self):
+        for ws in list(self._sockets):
+            await ws.close()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        await executors.IO.run(self._remove_token)
+
+
+async def serve(host=const.HEADLESS_HOST, port=const.HEADLESS_PORT):
+    """Запускає ядро без графічного інтерфейсу і обслуговує API до зупинки"""
+    server = CommandServer(host, port)
+    avroraCore.system_monitor.start()
+    avroraCore.loop_watchdog.start()
+    await avroraCore.metrics_exporter.start()
+    await server.start()
+    # Reminders and alarms are not tied to the session that set them, so they go to every client
+    scheduler_bus = events.EventBus()
+    scheduler_bus.subscribe(events.ChatMessage, server.broadcast)
+    await avroraCore.start_scheduler(bus=scheduler_bus)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await avroraCore.stop_scheduler()
+        await avroraCore.supervisor.shutdown()
+        await server.stop()
+        await avroraCore.metrics_exporter.stop()
+        avroraCore.loop_watchdog.stop()
+        avroraCore.system_monitor.stop()
+        avroraCore.audio_output.close()
+        executors.shutdown(wait=False)
@@ -0,0 +1,99 @@
+import atexit
+import copy
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+from datetime import datetime, timezone
+
+import constants as const
+
+_listeners = []
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматує записи журналу як один JSON-об'єкт на рядок"""
+
+    def format(self, record):
+        entry = {"time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+                 "level": record.levelname, "module": record.module, "function": record.funcName,
+                 "thread": record.threadName, "message": record.getMessage()}
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Готує запис до передачі в інший потік, не зливаючи трасування з текстом повідомлення"""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+        record.exc_info = record.stack_info = None
+        return record
+
+
+def _gzip_namer(name):
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source, dest):
+    """Стискає заповнений файл журналу під час ротації"""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def _queued_file(logger, filename, max_bytes, backup_count, formatter):
+    """Направляє записи логера в чергу, з якої окремий потік пише їх у файл з ротацією"""
+    file_handler = logging.handlers.RotatingFileHandler(filename, maxBytes=max_bytes, backupCount=backup_count,
+                                                        encoding="utf-8", delay=True)
+    file_handler.namer = _gzip_namer
+    file_handler.rotator = _gzip_rotator
+    file_handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    logger.handlers.clear()
+    logger.addHandler(_QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+
+
+def setup_logging(filename=const.LOG_FILENAME, level=const.LOG_LEVEL, json_mode=None):
+    """Налаштовує журнал: записи йдуть у чергу, а у файл їх пише окремий потік"""
+    if _listeners:
+        return
+    if json_mode is None:
+        json_mode = os.environ.get(const.LOG_FORMAT_ENV, "").lower() == "json"
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    _queued_file(root, filename, const.LOG_MAX_BYTES, const.LOG_BACKUP_COUNT,
+                 JsonFormatter() if json_mode else logging.Formatter(const.LOG_FORMAT))
+
+    # Traces are already JSON lines and go to their own file, not to the main log
+    trace_logger = logging.getLogger(const.TRACE_LOGGER)
+    trace_logger.propagate = False
+    trace_logger.setLevel(logging.INFO)
+    _queued_file(trace_logger, const.TRACE_FILENAME, const.TRACE_MAX_BYTES, const.TRACE_BACKUP_COUNT,
+                 logging.Formatter("%(message)s"))
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Дописує всі записи з черг у файли і зупиняє потоки журналу"""
+    while _listeners:
+        listener = _listeners.pop()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
@@ -1,3 +1,4 @@
+import argparse
 import asyncio
 import logging
 import os
@@ -7,47 +8,102 @@ import flet as ft
 
 import avroraCore
 import constants as const
+import events
+import executors
+import headless
+import logSetup
+import textNormalizer
+import tracing
 from ui import UI
 
-logging.basicConfig(filename=const.LOG_FILENAME, level=logging.INFO,
-                    format='%(asctime)s - %(levelname)s - %(module)s - %(funcName)s - %(message)s')
+logSetup.setup_logging()
+
+
+async def handle_utterance(utterance, ui_instance, trace):
+    """Виконує одну команду користувача і повертає код для основного циклу"""
+    try:
+        ans, result_message = await avroraCore.doSomething(utterance)
+        if result_message:
+            await ui_instance.addToChat(result_message, const.PROGRAM_ROLE)
+        return ans
+    except asyncio.CancelledError:
+        logging.info("Command was interrupted by the user.")
+        trace.root.attributes["cancelled"] = True
+        await ui_instance.animateStatus(const.STATUS_NONE)
+        raise
+    except Exception as e:
+        error_message = f"An error occurred in doSomething: {e}"
+        logging.error(error_message, exc_info=True)
+        await ui_instance.showFatalError(f"Сталася помилка: {e}")
+        await ui_instance.addToChat(f"Сталася помилка: {e}", const.SYSTEM_ROLE)
+        return 0
+    finally:
+        trace.finish()
+
+
+def _start_listening(show_status=True):
+    """Починає прослуховування наступної фрази в новій трасі"""
+    trace = tracing.start("utterance")
+    context = trace.context()
+    return asyncio.create_task(avroraCore.listen(show_status=show_status), context=context), trace, context
+
+
+def _normalize(text):
+    with tracing.span("normalize"):
+        return textNormalizer.normalize(text)
 
 
 async def listen(page, ui_instance):
     """Починає основний цикл прослуховування"""
     logging.info("Starting main listening loop.")
     action_after_loop = const.EXIT_COMMAND
+    command_task = None
+    listen_task, listen_trace, listen_context = _start_listening()
     while True:
-        text = await avroraCore.listen(on_status_change=ui_instance.animateStatus)
-        if text:
-            logging.info(f"Recognized text: '{text}'")
-            if text.startswith(const.WAKE_WORD):
+        # Keep listening while a command runs, so the user can interrupt it
+        waiting = {listen_task, command_task} if command_task else {listen_task}
+        done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+
+        if command_task in done:
+            ans = None if command_task.cancelled() else command_task.result()
+            command_task = None
+            if ans == const.EXIT_COMMAND:
+                logging.info("Exit command received. Shutting down.")
+                break
+            if ans == const.RESTART_COMMAND:
+                logging.info("Restart command received. Preparing to restart.")
+                action_after_loop = const.RESTART_COMMAND
+                break
+
+        if listen_task in done:
+            text = listen_task.result()
+            trace, context = listen_trace, listen_context
+            listen_task, listen_trace, listen_context = _start_listening(show_status=command_task is None)
+            utterance = context.run(_normalize, text) if text else None
+            if utterance is not None and utterance.has_wake_word:
+                await avroraCore.interrupt(command_task)
                 await ui_instance.addToChat(text, const.USER_ROLE)
-                try:
-                    ans, result_message = await avroraCore.doSomething(text, ui_instance, page,
-                                                                       on_status_change=ui_instance.animateStatus,
-                                                                       on_remind=ui_instance.addToChat)
-                    if result_message:
-                        await ui_instance.addToChat(result_message, const.PROGRAM_ROLE)
-                    if ans == const.EXIT_COMMAND:
-                        logging.info("Exit command received. Shutting down.")
-                        break
-                    if ans == const.RESTART_COMMAND:
-                        logging.info("Restart command received. Preparing to restart.")
-                        action_after_loop = const.RESTART_COMMAND
-                        break
-                except Exception as e:
-                    error_message = f"An error occurred in doSomething: {e}"
-                    logging.error(error_message, exc_info=True)
-                    await ui_instance.showFatalError(f"Сталася помилка: {e}")
-                    await ui_instance.addToChat(f"Сталася помилка: {e}", const.SYSTEM_ROLE)
-        await asyncio.sleep(0)
-
+                # The command continues the trace its capture and recognition started
+                command_task = asyncio.create_task(handle_utterance(utterance, ui_instance, trace), context=context)
+            else:
+                trace.discard()
+
+    avroraCore.stop_listening()
+    listen_task.cancel()
+    listen_trace.discard()
+    await avroraCore.stop_scheduler()
+    await avroraCore.supervisor.shutdown()
+    await avroraCore.metrics_exporter.stop()
+    avroraCore.loop_watchdog.stop()
+    avroraCore.system_monitor.stop()
+    avroraCore.audio_output.close()
+    executors.shutdown(wait=False)
     page.window.destroy()
     await asyncio.sleep(0.5)
 
     if action_after_loop == const.RESTART_COMMAND:
         logging.info("Executing restart.")
+        logSetup.shutdown_logging()
         os.execv(sys.executable, [sys.executable] + sys.argv)
     else:
         logging.info("Exiting application.")
@@ -55,10 +111,16 @@ async def listen(page, ui_instance):
 
 async def start_app_flow(page, ui_instance):
     """Запускає основний потік програми"""
+    bus = events.EventBus()
+    ui_instance.subscribe(bus)
+    avroraCore.use_bus(bus)
+    avroraCore.system_monitor.start()
+    avroraCore.loop_watchdog.start()
+    await avroraCore.metrics_exporter.start()
     logging.info("Sending initial greeting.")
-    _, result_message = await avroraCore.doSomething(f"{const.WAKE_WORD} {const.CMD_GREETING_VARIANTS[0]}", ui_instance,
-                                                     page, on_status_change=ui_instance.animateStatus)
+    _, result_message = await avroraCore.doSomething(f"{const.WAKE_WORD} {const.CMD_GREETING_VARIANTS[0]}")
     await ui_instance.addToChat(result_message, const.PROGRAM_ROLE)
+    await avroraCore.start_scheduler(bus=bus)
     await listen(page, ui_instance)
 
 
@@ -91,4 +153,16 @@ async def main(page: ft.Page):
         await _start_app()
 
 
-ft.app(target=main, name=const.APP_NAME)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog=const.APP_NAME)
+    parser.add_argument(const.HEADLESS_FLAG, action="store_true", help="run without the window, serving a local API")
+    parser.add_argument("--port", type=int, default=const.HEADLESS_PORT, help="port for the headless API")
+    args, _ = parser.parse_known_args()
+    if args.headless:
+        logging.info("Starting in headless mode.")
+        try:
+            asyncio.run(headless.serve(port=args.port))
+        except KeyboardInterrupt:
+            logging.info("Headless mode stopped.")
+    else:
+        ft.app(target=main, name=const.APP_NAME)
@@ -0,0 +1,36 @@
+import constants as const
+
+
+class Reply(str):
+    """Текст відповіді, до якого прикріплено структуровані дані для картки в чаті
+
+    Поводиться як звичайний рядок, тож озвучення, журнал і API, яким потрібен лише текст, нічого не помічають.
+    Будь-яка зміна рядка (форматування, склеювання) повертає звичайний str без даних.
+    """
+
+    def __new__(cls, text, kind=const.MESSAGE_KIND_TEXT, data=None):
+        reply = super().__new__(cls, text)
+        reply.kind = kind
+        reply.data = data or {}
+        return reply
+
+    @property
+    def payload(self):
+        return {"kind": self.kind, **self.data}
+
+
+def weather(text, city, temperature, condition):
+    return Reply(text, const.MESSAGE_KIND_WEATHER, {"city": city, "temperature": temperature, "condition": condition})
+
+
+def news(text, headlines, source):
+    return Reply(text, const.MESSAGE_KIND_NEWS, {"headlines": list(headlines), "source": source})
+
+
+def todo(text, tasks):
+    return Reply(text, const.MESSAGE_KIND_TODO, {"tasks": list(tasks)})
+
+
+def payload_of(text):
+    """Повертає структуровані дані відповіді або None для звичайного тексту"""
+    return text.payload if isinstance(text, Reply) and text.kind != const.MESSAGE_KIND_TEXT else None
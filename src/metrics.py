@@ -0,0 +1,228 @@
+import asyncio
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+
+from aiohttp import web
+
+import constants as const
+import executors
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """Спільна частина лічильників, датчиків і гістограм: значення зберігаються окремо для кожного набору міток"""
+    type = "untyped"
+
+    def __init__(self, name, help, labels=(), fn=None):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.fn = fn
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(labels.get(name, "") for name in self.labels)
+
+    def samples(self):
+        """Повертає пари (значення міток, значення); функція fn, якщо задана, читається лише під час збору"""
+        if self.fn is not None:
+            result = self.fn()
+            if isinstance(result, dict):
+                return [(key if isinstance(key, tuple) else (key,), value) for key, value in result.items()]
+            return [((), result)]
+        with self._lock:
+            return list(self._values.items())
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for values, value in self.samples():
+            lines.append(f"{self.name}{_format_labels(self.labels, values)} {float(value)}")
+        return lines
+
+    def snapshot(self):
+        return {",".join(values) or "value": value for values, value in self.samples()}
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Гістограма з фіксованими межами кошиків"""
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=const.METRICS_DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def samples(self):
+        with self._lock:
+            return [(key, ([*counts], total, count)) for key, (counts, total, count) in self._values.items()]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for values, (counts, total, count) in self.samples():
+            cumulative = 0
+            for bound, bucket in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, values, [('le', bound)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, values)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, values)} {count}")
+        return lines
+
+    def snapshot(self):
+        return {",".join(values) or "value": {"count": count, "sum": total,
+                                              "buckets": dict(zip(map(str, (*self.buckets, "+Inf")), counts))}
+                for values, (counts, total, count) in self.samples()}
+
+
+class Registry:
+    """Набір метрик процесу"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help, labels=(), fn=None):
+        return self._register(Counter(name, help, labels, fn))
+
+    def gauge(self, name, help, labels=(), fn=None):
+        return self._register(Gauge(name, help, labels, fn))
+
+    def histogram(self, name, help, labels=(), buckets=const.METRICS_DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def _collect(self, method):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        result = []
+        for metric in metrics:
+            try:
+                result.append((metric, getattr(metric, method)()))
+            except Exception as e:
+                logging.error("Collecting metric %s failed: %s", metric.name, e)
+        return result
+
+    def render(self):
+        """Повертає всі метрики в текстовому форматі Prometheus"""
+        return "\n".join(line for _, lines in self._collect("render") for line in lines) + "\n"
+
+    def snapshot(self):
+        return {metric.name: values for metric, values in self._collect("snapshot")}
+
+
+REGISTRY = Registry()
+
+COMMANDS = REGISTRY.counter("avrora_commands_total", "Commands handled, by outcome.", ("outcome",))
+COMMAND_DURATION = REGISTRY.histogram("avrora_command_duration_seconds", "Time from dispatch to reply.")
+NETWORK_ERRORS = REGISTRY.counter("avrora_network_errors_total", "Failed calls to external services.",
+                                  ("service", "kind"))
+CACHE_REQUESTS = REGISTRY.counter("avrora_cache_requests_total", "Cache lookups, by cache and result.",
+                                  ("cache", "result"))
+COMMAND_QUEUE_WAIT = REGISTRY.histogram("avrora_command_queue_wait_seconds",
+                                        "Time a command waited for a resource, by resource.", ("resource",),
+                                        buckets=const.METRICS_QUEUE_BUCKETS)
+COMMAND_QUEUE_TIMEOUTS = REGISTRY.counter("avrora_command_queue_timeouts_total",
+                                          "Commands that gave up waiting for a resource.", ("resource",))
+LOOP_LAG = REGISTRY.histogram("avrora_event_loop_lag_seconds", "How late the event loop woke up a sleeping task.",
+                              buckets=const.METRICS_LAG_BUCKETS)
+LOOP_STALLS = REGISTRY.counter("avrora_event_loop_stalls_total", "Times the event loop was blocked, by call site.",
+                               ("site",))
+LOOP_STALL_DURATION = REGISTRY.histogram("avrora_event_loop_stall_seconds", "How long the event loop stayed blocked.")
+
+
+class MetricsExporter:
+    """Віддає метрики на localhost у форматі Prometheus і періодично зберігає їхній знімок у файл"""
+
+    def __init__(self, registry=REGISTRY, host=const.METRICS_HOST, port=const.METRICS_PORT,
+                 snapshot_file=const.METRICS_SNAPSHOT_FILENAME, interval=const.METRICS_SNAPSHOT_INTERVAL):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.snapshot_file = snapshot_file
+        self.interval = interval
+        self._runner = None
+        self._tasks = []
+
+    async def handle_metrics(self, request):
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8")
+
+    def _write_snapshot(self, snapshot):
+        temp = f"{self.snapshot_file}.tmp"
+        with open(temp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        os.replace(temp, self.snapshot_file)
+
+    async def _snapshot_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            snapshot = {"time": time.time(), "metrics": self.registry.snapshot()}
+            try:
+                await executors.IO.run(self._write_snapshot, snapshot)
+            except OSError as e:
+                logging.error("Could not write metrics snapshot to %s: %s", self.snapshot_file, e)
+
+    async def start(self):
+        app = web.Application()
+        app.add_routes([web.get("/metrics", self.handle_metrics)])
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, self.host, self.port).start()
+            logging.info("Metrics exporter listening on http://%s:%d/metrics", self.host, self.port)
+        except OSError as e:
+            # Another instance may already hold the port; the snapshot file still works
+            logging.warning("Metrics endpoint is unavailable on port %d: %s", self.port, e)
+        self._tasks = [asyncio.create_task(self._snapshot_loop())]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,167 @@
+import re
+
+from textNormalizer import APOSTROPHES_TABLE
+
+_TOKEN_RE = re.compile(r"\S+")
+_PUNCTUATION = ".,!?;:"
+
+_UNIT = "unit"
+_SCALE = "scale"
+_FRACTION = "fraction"
+_ORDINAL = "ordinal"
+
+_ADJECTIVE_ENDINGS = ["ий", "а", "е", "ого", "ому", "им", "ій", "у", "ою", "ої", "і", "их", "ими"]
+_SOFT_ADJECTIVE_ENDINGS = ["ій", "я", "є", "ього", "ьому", "ім", "ю", "ьою", "ьої", "і", "іх", "іми"]
+
+
+def _numeral_forms(base):
+    """Відмінкові форми числівників на -ть та -десят (п'ять, п'яти, п'ятьох, п'ятьма...)"""
+    if base.endswith("ь"):
+        return [base, base[:-1] + "и", base + "ох", base + "ом", base + "ма", base + "ома"]
+    return [base, base + "и", base + "ьох", base + "ьом", base + "ьма", base + "ьома"]
+
+
+def _build_table():
+    """Будує таблицю переходів: словоформа -> (значення, тип)"""
+    cardinals = {
+        0: ["нуль", "нуля", "нулю", "нулем", "нулі"],
+        1: ["один", "одна", "одне", "одного", "одної", "одній", "одному", "одним", "одною", "одну"],
+        2: ["два", "дві", "двох", "двом", "двома"],
+        3: ["три", "трьох", "трьом", "трьома"],
+        4: ["чотири", "чотирьох", "чотирьом", "чотирма", "чотирьома"],
+        6: ["шість", "шести", "шістьох", "шістьом", "шістьма", "шістьома"],
+        7: ["сім", "семи", "сімох", "сімом", "сьома", "сімома"],
+        8: ["вісім", "восьми", "вісьмох", "вісьмом", "вісьма", "вісьмома"],
+        40: ["сорок", "сорока"],
+        90: ["дев'яносто", "дев'яноста"],
+        100: ["сто", "ста"],
+        200: ["двісті", "двохсот", "двомстам", "двомастами"],
+        300: ["триста", "трьохсот", "трьомстам", "трьомастами"],
+        400: ["чотириста", "чотирьохсот", "чотирьомстам", "чотирмастами"],
+        500: ["п'ятсот", "п'ятисот", "п'ятистам", "п'ятьмастами"],
+        600: ["шістсот", "шестисот", "шестистам", "шістьмастами"],
+        700: ["сімсот", "семисот", "семистам", "сьомастами"],
+        800: ["вісімсот", "восьмисот", "восьмистам", "вісьмастами"],
+        900: ["дев'ятсот", "дев'ятисот", "дев'ятистам", "дев'ятьмастами"],
+    }
+    for value, base in [(5, "п'ять"), (9, "дев'ять"), (10, "десять"), (11, "одинадцять"), (12, "дванадцять"),
+                        (13, "тринадцять"), (14, "чотирнадцять"), (15, "п'ятнадцять"), (16, "шістнадцять"),
+                        (17, "сімнадцять"), (18, "вісімнадцять"), (19, "дев'ятнадцять"), (20, "двадцять"),
+                        (30, "тридцять"), (50, "п'ятдесят"), (60, "шістдесят"), (70, "сімдесят"),
+                        (80, "вісімдесят")]:
+        cardinals[value] = _numeral_forms(base)
+
+    scales = {1000: ["тисяча", "тисячі", "тисяч", "тисячу", "тисячею", "тисячам", "тисячами"],
+              1000000: ["мільйон", "мільйона", "мільйону", "мільйони", "мільйонів", "мільйонами"]}
+    fractions = {0.5: ["пів", "половина", "половину"], 1.5: ["півтори", "півтора"]}
+
+    ordinal_stems = {1: "перш", 2: "друг", 4: "четверт", 5: "п'ят", 6: "шост", 7: "сьом", 8: "восьм", 9: "дев'ят",
+                     10: "десят", 11: "одинадцят", 12: "дванадцят", 13: "тринадцят", 14: "чотирнадцят",
+                     15: "п'ятнадцят", 16: "шістнадцят", 17: "сімнадцят", 18: "вісімнадцят", 19: "дев'ятнадцят",
+                     20: "двадцят", 30: "тридцят", 40: "сороков", 50: "п'ятдесят", 60: "шістдесят",
+                     70: "сімдесят", 80: "вісімдесят", 90: "дев'яност", 100: "сот"}
+
+    table = {}
+    for value, stem in ordinal_stems.items():
+        for ending in _ADJECTIVE_ENDINGS:
+            table[stem + ending] = (value, _ORDINAL)
+    for ending in _SOFT_ADJECTIVE_ENDINGS:
+        table["трет" + ending] = (3, _ORDINAL)
+    # Cardinals win over ordinals for shared forms such as "сьома"
+    for value, forms in cardinals.items():
+        for form in forms:
+            table[form] = (value, _UNIT)
+    for value, forms in scales.items():
+        for form in forms:
+            table[form] = (value, _SCALE)
+    for value, forms in fractions.items():
+        for form in forms:
+            table[form] = (value, _FRACTION)
+    return table
+
+
+_TABLE = _build_table()
+
+
+def _format(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _scan(text):
+    """Проходить текст один раз і повертає список токенів, де числівники замінені числами"""
+    result = []
+    total = current = 0
+    in_number = False
+    closed = False  # a digit or ordinal can only be extended by a scale word
+
+    def flush():
+        nonlocal total, current, in_number, closed
+        if in_number:
+            result.append(total + current)
+        total = current = 0
+        in_number = closed = False
+
+    for match in _TOKEN_RE.finditer(text.translate(APOSTROPHES_TABLE)):
+        token = match.group(0)
+        word = token.rstrip(_PUNCTUATION)
+        trailing = token[len(word):]
+        key = word.lower()
+        entry = _TABLE.get(key)
+
+        if entry is None and key.isdigit():
+            flush()
+            current, in_number, closed = int(key), True, True
+        elif entry is None:
+            flush()
+            result.append(token)
+            continue
+        else:
+            value, kind = entry
+            if kind == _SCALE:
+                if in_number and total and total < value:
+                    total, current = (total + current) * value, 0
+                else:
+                    total, current = total + (current or 1) * value, 0
+                in_number, closed = True, False
+            elif kind == _FRACTION:
+                flush()
+                current, in_number, closed = value, True, True
+            else:
+                if in_number and (closed or current % 10 ** len(str(value)) != 0):
+                    flush()
+                current += value
+                in_number = True
+                closed = kind == _ORDINAL
+
+        if trailing:
+            flush()
+            result[-1] = f"{_format(result[-1])}{trailing}"
+    flush()
+    return result
+
+
+def words_to_numbers(text):
+    """Замінює українські числівники в тексті на цифри"""
+    return " ".join(_format(token) if not isinstance(token, str) else token for token in _scan(text))
+
+
+def extract_numbers(text):
+    """Повертає всі числа з тексту, записані цифрами або словами"""
+    numbers = []
+    for token in _scan(text):
+        if isinstance(token, str):
+            token = token.rstrip(_PUNCTUATION)
+            try:
+                token = float(token) if "." in token else int(token)
+            except ValueError:
+                continue
+        numbers.append(token)
+    return numbers
+
+
+def parse_number(text):
+    """Повертає перше число з тексту або None"""
+    numbers = extract_numbers(text)
+    return numbers[0] if numbers else None
@@ -0,0 +1,122 @@
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import subprocess
+import time
+from collections import deque
+
+import constants as const
+
+
+class LaunchedProcess:
+    """Запис про запущений процес: команда, час запуску, код завершення і, якщо просили, його вивід"""
+    __slots__ = ("command", "pid", "started", "ended", "returncode", "output", "detached")
+
+    def __init__(self, command, pid, detached):
+        self.command = command
+        self.pid = pid
+        self.started = time.time()
+        self.ended = None
+        self.returncode = None
+        self.output = None
+        self.detached = detached
+
+    @property
+    def running(self):
+        return self.ended is None
+
+    def to_dict(self):
+        return {"command": self.command, "pid": self.pid, "started": self.started, "ended": self.ended,
+                "returncode": self.returncode, "detached": self.detached}
+
+
+def _detach_options():
+    """Параметри, з якими програма живе окремо від асистента і не тримає його консоль"""
+    if os.name == "nt":
+        return {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def _kill(process):
+    """Завершує процес разом із програмами, які запустила його оболонка"""
+    with contextlib.suppress(ProcessLookupError):
+        if os.name == "nt":
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+
+
+class ProcessLauncher:
+    """Запускає команди терміналу асинхронно, не займаючи потоків, і пам'ятає запущені процеси
+
+    Програми з вікном відокремлюються і не чекаються: запуск повертається одразу, а код завершення записується,
+    коли процес закінчиться. Короткі команди можна виконати з обмеженням часу і отримати їхній вивід.
+    """
+
+    def __init__(self, supervisor, keep=const.PROCESS_HISTORY_KEEP):
+        self.supervisor = supervisor
+        self._running = {}
+        self._finished = deque(maxlen=keep)
+
+    async def launch(self, command):
+        """Запускає програму окремо від асистента і повертає запис, не чекаючи її завершення"""
+        process = await asyncio.create_subprocess_shell(command, stdin=subprocess.DEVNULL,
+                                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                                        **_detach_options())
+        record = LaunchedProcess(command, process.pid, detached=True)
+        self._running[process.pid] = record
+        logging.info("Launched '%s' as process %d.", command, process.pid)
+        self.supervisor.spawn(self._watch(process, record), f"process {process.pid}: {command}",
+                              const.TASK_CATEGORY_PROCESS)
+        return record
+
+    async def run(self, command, timeout=const.PROCESS_RUN_TIMEOUT):
+        """Виконує коротку команду, чекає її не довше timeout секунд і повертає запис з виводом"""
+        # Its own process group lets a timeout kill whatever the shell started, not just the shell
+        process = await asyncio.create_subprocess_shell(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                                        stderr=subprocess.STDOUT, **_detach_options())
+        record = LaunchedProcess(command, process.pid, detached=False)
+        self._running[process.pid] = record
+        try:
+            output, _ = await asyncio.wait_for(process.communicate(), timeout)
+            record.output = output.decode(errors="replace").strip()
+        except asyncio.TimeoutError:
+            logging.warning("Command '%s' did not finish in %.1fs, killing it.", command, timeout)
+            _kill(process)
+            # A grandchild may still hold the output pipe, so waiting for the exit is bounded as well
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(process.wait(), const.PROCESS_KILL_GRACE)
+        except asyncio.CancelledError:
+            _kill(process)
+            raise
+        finally:
+            self._finish(record, process.returncode)
+        return record
+
+    async def _watch(self, process, record):
+        try:
+            returncode = await process.wait()
+        except asyncio.CancelledError:
+            # The assistant is exiting; the detached program keeps running on its own
+            self._running.pop(record.pid, None)
+            raise
+        self._finish(record, returncode)
+
+    def _finish(self, record, returncode):
+        record.ended = time.time()
+        record.returncode = returncode
+        self._running.pop(record.pid, None)
+        self._finished.append(record)
+        level = logging.INFO if returncode == 0 else logging.WARNING
+        logging.log(level, "Process %d ('%s') exited with code %s after %.1fs.", record.pid, record.command,
+                    returncode, record.ended - record.started)
+
+    def running(self):
+        """Повертає процеси, які ще не завершилися, від найстаршого"""
+        return sorted(self._running.values(), key=lambda record: record.started)
+
+    def recent(self):
+        """Повертає нещодавно завершені процеси, від найновішого"""
+        return list(reversed(self._finished))
@@ -0,0 +1,97 @@
+import cProfile
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from datetime import datetime
+
+import constants as const
+import executors
+
+
+class CommandProfiler:
+    """Знімає профіль cProfile для кожної команди і зберігає найповільніші з них
+
+    Профілюється потік циклу подій: час, проведений у пулах потоків (мережа, озвучення, диск), показується окремо
+    для кожної смуги. Одночасно профілюється лише одна команда, решта виконуються як звичайно.
+    """
+
+    def __init__(self, directory=const.PROFILE_DIR, keep=const.PROFILE_KEEP):
+        self.directory = directory
+        self.keep = keep
+        self._index_path = os.path.join(directory, const.PROFILE_INDEX_NAME)
+        self._active = False
+        self._lock = threading.Lock()
+        self._index = None
+        self._session = None
+
+    async def run(self, coro, label):
+        """Виконує корутину команди під профілювальником"""
+        if self._active:
+            return await coro
+        self._active = True
+        started = time.time()
+        start = time.perf_counter()
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            with executors.measure_usage() as usage:
+                return await coro
+        finally:
+            profile.disable()
+            self._active = False
+            elapsed = time.perf_counter() - start
+            lanes = dict(usage)
+            logging.info("Profiled command '%s': %.3fs.", label, elapsed)
+            await executors.IO.run(self._record, profile, label, started, elapsed, lanes)
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._index = []
+        return self._index
+
+    def _record(self, profile, label, started, elapsed, lanes):
+        with self._lock:
+            if self._session is None:
+                self._session = pstats.Stats(profile)
+            else:
+                self._session.add(profile)
+
+            index = self._load_index()
+            if len(index) >= self.keep and elapsed <= index[-1]["elapsed"]:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            filename = f"{datetime.fromtimestamp(started):%Y%m%d-%H%M%S-%f}-{int(elapsed * 1000)}ms.prof"
+            profile.dump_stats(os.path.join(self.directory, filename))
+            index.append({"file": filename, "command": label,
+                          "started": datetime.fromtimestamp(started).isoformat(timespec="seconds"),
+                          "elapsed": elapsed, "lanes": lanes})
+            index.sort(key=lambda entry: entry["elapsed"], reverse=True)
+            for entry in index[self.keep:]:
+                try:
+                    os.remove(os.path.join(self.directory, entry["file"]))
+                except OSError:
+                    pass
+            del index[self.keep:]
+            with open(self._index_path, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, indent=4)
+
+    def slowest(self, n=const.PROFILE_TOP_N):
+        """Повертає найповільніші збережені команди"""
+        with self._lock:
+            return list(self._load_index()[:n])
+
+    def hottest(self, n=const.PROFILE_TOP_N):
+        """Повертає функції, які за цю сесію забрали найбільше власного часу"""
+        with self._lock:
+            if self._session is None:
+                return []
+            entries = sorted(self._session.stats.items(), key=lambda item: item[1][2], reverse=True)[:n]
+        return [(f"{func} ({os.path.basename(filename)}:{line})", calls, own_time)
+                for (filename, line, func), (_, calls, own_time, _, _) in entries]
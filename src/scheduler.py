@@ -0,0 +1,160 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import time
+import uuid
+
+import constants as const
+import executors
+
+
+class Scheduler:
+    """Планувальник нагадувань і будильників на основі купи дедлайнів з одним таймером"""
+
+    def __init__(self, supervisor, filename=const.SCHEDULE_FILENAME):
+        self.supervisor = supervisor
+        self.filename = filename
+        self._heap = []
+        self._jobs = {}
+        self._seq = itertools.count()
+        self._handler = None
+        self._wakeup = None
+        self._loop_task = None
+        self._save_task = None
+        self._save_pending = False
+
+    def _push(self, job):
+        self._jobs[job["id"]] = job
+        heapq.heappush(self._heap, (job["deadline"], next(self._seq), job["id"]))
+
+    def _load(self):
+        if not os.path.exists(self.filename):
+            return []
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                jobs = json.load(f)
+            return jobs if isinstance(jobs, list) else []
+        except (json.JSONDecodeError, OSError) as e:
+            logging.error("Failed to load schedule from %s: %s", self.filename, e, exc_info=True)
+            return []
+
+    def _save(self, jobs):
+        tmp_filename = f"{self.filename}.tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            json.dump(jobs, f, ensure_ascii=False)
+        os.replace(tmp_filename, self.filename)
+
+    async def _save_loop(self):
+        while self._save_pending:
+            self._save_pending = False
+            try:
+                await executors.IO.run(self._save, list(self._jobs.values()))
+            except OSError as e:
+                logging.error("Failed to save schedule to %s: %s", self.filename, e, exc_info=True)
+
+    def _schedule_save(self):
+        """Зберігає розклад, об'єднуючи зміни, що надійшли під час запису"""
+        self._save_pending = True
+        if self._save_task is None or self._save_task.done():
+            self._save_task = asyncio.create_task(self._save_loop())
+
+    async def start(self, handler):
+        """Завантажує розклад з диска і запускає таймер"""
+        self._handler = handler
+        self._wakeup = asyncio.Event()
+        now = time.time()
+        jobs = await executors.IO.run(self._load)
+        dropped = 0
+        for job in jobs:
+            if now - job.get("deadline", 0) > const.SCHEDULER_MISSED_GRACE:
+                dropped += 1
+                continue
+            self._push(job)
+        if dropped:
+            logging.warning("Dropped %d scheduled items that were missed while the app was closed.", dropped)
+            self._schedule_save()
+        logging.info("Scheduler started with %d pending items.", len(self._jobs))
+        self._loop_task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Зупиняє таймер і дочекається запису розкладу"""
+        if self._loop_task:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+        if self._save_task:
+            await self._save_task
+
+    def add(self, kind, text, deadline):
+        """Додає нагадування або будильник з дедлайном у секундах епохи"""
+        job = {"id": uuid.uuid4().hex, "kind": kind, "text": text, "deadline": deadline, "created": time.time()}
+        self._push(job)
+        self._schedule_save()
+        if self._wakeup:
+            self._wakeup.set()
+        logging.info("Scheduled %s '%s' at %.0f.", kind, text, deadline)
+        return job
+
+    def cancel(self, job_id):
+        """Скасовує заплановану подію, повертає False якщо її немає"""
+        job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        # Heap entries are removed lazily; compact once tombstones dominate
+        if len(self._heap) > 2 * len(self._jobs) + const.SCHEDULER_COMPACT_MIN:
+            self._heap = [entry for entry in self._heap if entry[2] in self._jobs]
+            heapq.heapify(self._heap)
+        self._schedule_save()
+        if self._wakeup:
+            self._wakeup.set()
+        logging.info("Cancelled scheduled %s '%s'.", job['kind'], job['text'])
+        return True
+
+    def pending(self, kind=None):
+        """Повертає заплановані події, відсортовані за часом"""
+        jobs = [job for job in self._jobs.values() if kind is None or job["kind"] == kind]
+        return sorted(jobs, key=lambda job: job["deadline"])
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now + const.SCHEDULER_FIRE_TOLERANCE:
+            _, _, job_id = heapq.heappop(self._heap)
+            job = self._jobs.pop(job_id, None)
+            if job is not None:
+                due.append(job)
+        return due
+
+    def _fire(self, job):
+        self.supervisor.spawn(self._handler(job), f"{job['kind']}: {job['text']}", const.TASK_CATEGORY_SCHEDULED)
+
+    async def _run(self):
+        while True:
+            due = self._pop_due(time.time())
+            if due:
+                self._schedule_save()
+                for job in due:
+                    lateness = time.time() - job["deadline"]
+                    logging.info("Firing scheduled %s '%s' (%.2fs late).", job['kind'], job['text'], lateness)
+                    self._fire(job)
+
+            while self._heap and self._heap[0][2] not in self._jobs:
+                heapq.heappop(self._heap)
+            # Sleep in bounded steps and recheck the wall clock so suspend/resume and clock changes are noticed
+            timeout = None
+            if self._heap:
+                timeout = min(max(self._heap[0][0] - time.time(), 0), const.SCHEDULER_MAX_SLEEP)
+            self._wakeup.clear()
+            mono_before, wall_before = time.monotonic(), time.time()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            jump = (time.time() - wall_before) - (time.monotonic() - mono_before)
+            if abs(jump) > const.SCHEDULER_CLOCK_JUMP:
+                logging.warning("Wall clock jumped by %.1fs, rechecking schedule.", jump)
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+
+import constants as const
+
+
+class _Entry:
+    __slots__ = ("name", "category", "created", "started")
+
+    def __init__(self, name, category):
+        self.name = name
+        self.category = category
+        self.created = time.monotonic()
+        self.started = None
+
+
+class TaskSupervisor:
+    """Тримає посилання на фонові задачі, обмежує їхню кількість за категоріями і прибирає їх під час виходу
+
+    Задача без посилання на неї може бути знищена збирачем сміття, а її виняток ніхто не побачить, тому всі
+    фонові задачі запускаються тут. Понад ліміт категорії задачі чекають своєї черги, а не відкидаються.
+    """
+
+    def __init__(self, limits=const.TASK_LIMITS, on_failure=None):
+        self.limits = limits
+        self.on_failure = on_failure
+        self._tasks = {}
+        self._semaphores = {}
+
+    def _semaphore(self, category):
+        semaphore = self._semaphores.get(category)
+        if semaphore is None:
+            semaphore = self._semaphores[category] = asyncio.Semaphore(
+                self.limits.get(category, const.TASK_DEFAULT_LIMIT))
+        return semaphore
+
+    async def _guard(self, coro, entry):
+        try:
+            async with self._semaphore(entry.category):
+                entry.started = time.monotonic()
+                return await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error("Background task '%s' (%s) failed: %s", entry.name, entry.category, e, exc_info=True)
+            if self.on_failure:
+                try:
+                    await self.on_failure(entry.name, e)
+                except Exception as report_e:
+                    logging.error("Reporting the failure of '%s' failed: %s", entry.name, report_e)
+        finally:
+            coro.close()
+
+    def spawn(self, coro, name, category=const.TASK_CATEGORY_BACKGROUND):
+        """Запускає корутину як фонову задачу під наглядом і повертає задачу"""
+        entry = _Entry(name, category)
+        task = asyncio.create_task(self._guard(coro, entry), name=name)
+        self._tasks[task] = entry
+        task.add_done_callback(self._tasks.pop)
+        return task
+
+    def _select(self, categories=None):
+        current = asyncio.current_task()
+        return [task for task, entry in self._tasks.items()
+                if task is not current and (categories is None or entry.category in categories)]
+
+    async def drain(self, categories=None, timeout=const.TASK_DRAIN_TIMEOUT):
+        """Чекає, поки задачі завершаться самі; повертає ті, що не встигли"""
+        tasks = self._select(categories)
+        if not tasks:
+            return set()
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            logging.warning("%d background tasks are still running after %.1fs: %s", len(pending), timeout,
+                            ", ".join(self._tasks[task].name for task in pending if task in self._tasks))
+        return pending
+
+    async def shutdown(self, categories=None, timeout=const.TASK_DRAIN_TIMEOUT):
+        """Скасовує задачі і чекає, поки вони завершаться"""
+        tasks = self._select(categories)
+        if not tasks:
+            return
+        logging.info("Cancelling %d background tasks.", len(tasks))
+        for task in tasks:
+            task.cancel()
+        _, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            logging.warning("%d background tasks ignored cancellation.", len(pending))
+
+    def stats(self):
+        """Повертає кількість живих задач, тих, що чекають на ліміт, і вік найстаршої, за категоріями"""
+        now = time.monotonic()
+        result = {}
+        for entry in list(self._tasks.values()):
+            stats = result.setdefault(entry.category, {"live": 0, "waiting": 0, "oldest": 0.0})
+            stats["live"] += 1
+            stats["waiting"] += entry.started is None
+            stats["oldest"] = max(stats["oldest"], now - entry.created)
+        return result
+
+    def tasks(self):
+        """Повертає назву, категорію і вік кожної живої задачі, від найстаршої"""
+        now = time.monotonic()
+        entries = sorted(self._tasks.values(), key=lambda entry: entry.created)
+        return [{"name": entry.name, "category": entry.category, "age": now - entry.created,
+                 "waiting": entry.started is None} for entry in entries]
+
+    def __len__(self):
+        return len(self._tasks)
@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+
+import numpy as np
+import psutil
+
+import constants as const
+
+_FIELDS = ("time", "cpu", "mem_percent", "mem_available", "disk_read", "disk_write", "net_recv", "net_sent")
+_INDEX = {name: i for i, name in enumerate(_FIELDS)}
+
+
+class SystemMonitor:
+    """Фоновий збирач метрик системи з кільцевим буфером на NumPy"""
+
+    def __init__(self, capacity=const.MONITOR_CAPACITY, interval=const.MONITOR_INTERVAL):
+        self.interval = interval
+        self._buffer = np.zeros((capacity, len(_FIELDS)), dtype=np.float64)
+        self._next = 0
+        self._count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._top_cpu = []
+        self._top_rss = []
+        self.mem_total = 0
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="avrora-monitor", daemon=True)
+        self._thread.start()
+        logging.info("System monitor started.")
+
+    def stop(self):
+        # The thread is a daemon and wakes up on the event, so the loop is never blocked on join
+        self._stop.set()
+        self._thread = None
+        logging.info("System monitor stopped.")
+
+    def _run(self):
+        psutil.cpu_percent(interval=None)
+        disk, net = psutil.disk_io_counters(), psutil.net_io_counters()
+        last_time = time.monotonic()
+        tick = 0
+        while not self._stop.wait(self.interval):
+            try:
+                now = time.monotonic()
+                elapsed = max(now - last_time, 1e-6)
+                mem = psutil.virtual_memory()
+                new_disk, new_net = psutil.disk_io_counters(), psutil.net_io_counters()
+                row = (time.time(), psutil.cpu_percent(interval=None), mem.percent, mem.available,
+                       (new_disk.read_bytes - disk.read_bytes) / elapsed if disk and new_disk else 0.0,
+                       (new_disk.write_bytes - disk.write_bytes) / elapsed if disk and new_disk else 0.0,
+                       (new_net.bytes_recv - net.bytes_recv) / elapsed if net and new_net else 0.0,
+                       (new_net.bytes_sent - net.bytes_sent) / elapsed if net and new_net else 0.0)
+                disk, net, last_time = new_disk, new_net, now
+                with self._lock:
+                    self.mem_total = mem.total
+                    self._buffer[self._next] = row
+                    self._next = (self._next + 1) % len(self._buffer)
+                    self._count = min(self._count + 1, len(self._buffer))
+                if tick % const.MONITOR_PROCESS_EVERY == 0:
+                    self._sample_processes()
+                tick += 1
+            except Exception as e:
+                logging.error("System monitor sampling failed: %s", e, exc_info=True)
+
+    def _sample_processes(self):
+        processes = []
+        for proc in psutil.process_iter(["name", "cpu_percent", "memory_info"]):
+            info = proc.info
+            if info["memory_info"] is None:
+                continue
+            processes.append((info["name"] or str(proc.pid), info["cpu_percent"] or 0.0, info["memory_info"].rss))
+        cpu_count = psutil.cpu_count() or 1
+        top_cpu = sorted(processes, key=lambda p: p[1], reverse=True)[:const.MONITOR_TOP_N]
+        top_rss = sorted(processes, key=lambda p: p[2], reverse=True)[:const.MONITOR_TOP_N]
+        with self._lock:
+            self._top_cpu = [(name, cpu / cpu_count) for name, cpu, _ in top_cpu]
+            self._top_rss = [(name, rss) for name, _, rss in top_rss]
+
+    def _window(self, seconds):
+        if not self._count:
+            return None
+        if self._count < len(self._buffer):
+            rows = self._buffer[:self._count]
+        else:
+            rows = np.roll(self._buffer, -self._next, axis=0)
+        return rows[rows[:, _INDEX["time"]] >= rows[-1, _INDEX["time"]] - seconds]
+
+    def latest(self):
+        """Повертає останній зібраний зразок або None"""
+        with self._lock:
+            if not self._count:
+                return None
+            row = self._buffer[self._next - 1]
+            return {name: float(row[i]) for i, name in enumerate(_FIELDS)}
+
+    def stats(self, seconds=const.MONITOR_WINDOW):
+        """Повертає середні та пікові значення за останні секунди"""
+        with self._lock:
+            rows = self._window(seconds)
+            if rows is None:
+                return None
+            means, peaks = rows.mean(axis=0), rows.max(axis=0)
+        return {"samples": len(rows),
+                **{f"{name}_avg": float(means[i]) for i, name in enumerate(_FIELDS) if name != "time"},
+                **{f"{name}_peak": float(peaks[i]) for i, name in enumerate(_FIELDS) if name != "time"}}
+
+    def top_processes(self, by="cpu"):
+        """Повертає процеси, що найбільше навантажують процесор або займають пам'ять"""
+        with self._lock:
+            return list(self._top_cpu if by == "cpu" else self._top_rss)
@@ -0,0 +1,74 @@
+import re
+import unicodedata
+
+import constants as const
+
+APOSTROPHES_TABLE = str.maketrans({"’": "'", "ʼ": "'", "`": "'", "‘": "'", "´": "'"})
+LAYOUT_TABLE = str.maketrans(const.KEYS_EN)
+
+_WAKE_WORD_RE = re.compile(rf"^(?:{re.escape(const.WAKE_WORD)}(?:[\s,.!?]+|$))+")
+_INTENT_SEPARATOR_RE = re.compile(
+    r"\s*,\s*|\s*,?\s+(?:" + "|".join(re.escape(word) for word in const.INTENT_SEPARATORS) + r")\s+")
+
+
+class Utterance:
+    """Нормалізована фраза користувача, яку обробники команд використовують без повторної обробки"""
+    __slots__ = ("raw", "text", "command", "cased_command", "tokens", "has_wake_word")
+
+    def __init__(self, raw, text, command, has_wake_word, cased_command=None):
+        self.raw = raw
+        self.text = text
+        self.command = command
+        self.cased_command = cased_command if cased_command is not None else command
+        self.tokens = tuple(command.split(" ")) if command else ()
+        self.has_wake_word = has_wake_word
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"Utterance({self.text!r})"
+
+
+def normalize(raw):
+    """Один раз нормалізує фразу: Unicode, апострофи, регістр, пробіли і кодове слово"""
+    cased = " ".join(unicodedata.normalize("NFC", raw).translate(APOSTROPHES_TABLE).split())
+    text = cased.lower()
+    # Lowercasing keeps offsets for Ukrainian and Latin text, which lets dictation keep the original case
+    if len(text) != len(cased):
+        cased = text
+    match = _WAKE_WORD_RE.match(text)
+    start = match.end() if match else 0
+    return Utterance(raw, text, text[start:], bool(match), cased[start:])
+
+
+def to_keyboard_layout(text):
+    """Переводить кирилицю в символи тих самих клавіш англійської розкладки"""
+    return text.translate(LAYOUT_TABLE)
+
+
+def has_intent_separator(command):
+    return _INTENT_SEPARATOR_RE.search(command) is not None
+
+
+def split_intents(utterance, prefixes, greedy_prefixes=()):
+    """Ділить фразу на окремі команди за сполучниками, якщо кожна частина починається з відомої команди"""
+    command = utterance.command
+    parts = []
+    start = 0
+    bounds = [(m.start(), m.end()) for m in _INTENT_SEPARATOR_RE.finditer(command)]
+    bounds.append((len(command), len(command)))
+    for end, next_start in bounds:
+        fragment = command[start:end]
+        match = _WAKE_WORD_RE.match(fragment)
+        begin = start + (match.end() if match else 0)
+        fragment = command[begin:end]
+        if parts and (parts[-1][2] or not fragment.startswith(prefixes)):
+            parts[-1][1] = end
+        else:
+            parts.append([begin, end, fragment.startswith(greedy_prefixes)])
+        start = next_start
+    if len(parts) == 1:
+        return [utterance]
+    return [Utterance(utterance.raw, command[begin:end], command[begin:end], utterance.has_wake_word,
+                      utterance.cased_command[begin:end]) for begin, end, _ in parts]
@@ -0,0 +1,186 @@
+import contextlib
+import contextvars
+import gzip
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+
+import constants as const
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+_trace_log = logging.getLogger(const.TRACE_LOGGER)
+_durations = defaultdict(lambda: deque(maxlen=const.TRACE_SUMMARY_WINDOW))
+_durations_lock = threading.Lock()
+
+_OPEN, _FINISHED, _DISCARDED = range(3)
+
+
+class Span:
+    """Один етап обробки фрази з часом початку і кінця"""
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, trace, name, parent_id, attributes):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes
+
+    def end(self):
+        # May be called from the audio callback thread, so it only takes a timestamp and hands the span over
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.trace._on_end(self)
+
+    def to_dict(self):
+        """Подає етап у форматі span з OTLP/JSON"""
+        return {"traceId": self.trace.trace_id, "spanId": self.span_id, "parentSpanId": self.parent_id or "",
+                "name": self.name, "startTimeUnixNano": str(self.start_ns), "endTimeUnixNano": str(self.end_ns),
+                "attributes": [{"key": key, "value": {"stringValue": str(value)}}
+                               for key, value in self.attributes.items()]}
+
+
+class Trace:
+    """Усі етапи обробки однієї фрази
+
+    Поки трасу не завершено, етапи накопичуються в пам'яті: так фрази без слова активації можна просто відкинути.
+    Етапи, що закінчуються вже після завершення траси (наприклад, початок відтворення), записуються одразу.
+    """
+
+    def __init__(self, name, **attributes):
+        self.trace_id = os.urandom(16).hex()
+        self._state = _OPEN
+        self._pending = []
+        self._lock = threading.Lock()
+        self.root = Span(self, name, None, attributes)
+
+    def context(self):
+        """Повертає контекст, у якому нові етапи вкладаються в цю трасу"""
+        context = contextvars.copy_context()
+        context.run(_current_span.set, self.root)
+        return context
+
+    def _on_end(self, span):
+        with self._lock:
+            if self._state == _OPEN:
+                self._pending.append(span)
+                return
+            if self._state == _DISCARDED:
+                return
+        _write(span)
+
+    def finish(self):
+        self.root.end()
+        with self._lock:
+            if self._state != _OPEN:
+                return
+            self._state = _FINISHED
+            spans, self._pending = self._pending, []
+        for span in spans:
+            _write(span)
+
+    def discard(self):
+        with self._lock:
+            self._state = _DISCARDED
+            self._pending = []
+
+
+def _write(span):
+    with _durations_lock:
+        _durations[span.name].append((span.end_ns - span.start_ns) / 1e9)
+    if _trace_log.isEnabledFor(logging.INFO):
+        _trace_log.info(json.dumps(span.to_dict(), ensure_ascii=False))
+
+
+def start(name, **attributes):
+    """Починає нову трасу для однієї фрази"""
+    return Trace(name, **attributes)
+
+
+@contextlib.contextmanager
+def trace(name, **attributes):
+    """Виконує блок як окрему трасу в поточному контексті"""
+    new_trace = Trace(name, **attributes)
+    token = _current_span.set(new_trace.root)
+    try:
+        yield new_trace
+    finally:
+        _current_span.reset(token)
+        new_trace.finish()
+
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """Вимірює етап усередині поточної траси; поза трасою нічого не робить"""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    current = Span(parent.trace, name, parent.span_id, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+
+
+def begin(name, **attributes):
+    """Починає етап, який закінчиться деінде (наприклад, в іншому потоці); поза трасою повертає None"""
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def _percentiles(values):
+    values = sorted(values)
+
+    def percentile(p):
+        return values[min(len(values) - 1, int(p * len(values)))]
+
+    return {"count": len(values), "p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99),
+            "max": values[-1]}
+
+
+def summary():
+    """Повертає p50/p95/p99 тривалості кожного етапу за останні траси цієї сесії, у секундах"""
+    with _durations_lock:
+        snapshot = {name: list(values) for name, values in _durations.items() if values}
+    return {name: _percentiles(values) for name, values in sorted(snapshot.items())}
+
+
+def summarize_file(filename=const.TRACE_FILENAME):
+    """Рахує p50/p95/p99 кожного етапу за файлом трас разом з його стиснутими архівами"""
+    durations = defaultdict(list)
+    paths = [f"{filename}.{i}.gz" for i in range(const.TRACE_BACKUP_COUNT, 0, -1)] + [filename]
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    durations[record["name"]].append(
+                        (int(record["endTimeUnixNano"]) - int(record["startTimeUnixNano"])) / 1e9)
+                except (ValueError, KeyError):
+                    continue
+    return {name: _percentiles(values) for name, values in sorted(durations.items())}
+
+
+if __name__ == "__main__":
+    stages = summarize_file(sys.argv[1] if len(sys.argv) > 1 else const.TRACE_FILENAME)
+    print(f"{'stage':<32}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for stage, stats in stages.items():
+        print(f"{stage:<32}{stats['count']:>8}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['p99']:>10.3f}"
+              f"{stats['max']:>10.3f}")
@@ -2,7 +2,6 @@ import asyncio
 import json
 import logging
 import os
-import random
 import re
 import time
 
@@ -10,6 +9,14 @@ import flet as ft
 
 import avroraCore
 import constants as const
+import events
+import executors
+import messages
+import textNormalizer
+import tracing
+import uiConstants as ui_const
+
+_URL_PATTERN = re.compile(r"https?://\S+")
 
 
 class UI:
@@ -17,82 +24,51 @@ class UI:
         logging.info("Initializing UI class.")
         self.page = page
         self.on_first_launch_complete = on_first_launch_complete
+        self.bus = None
         self.settings = {}
         self.settings_is_open = False
         self.info_is_open = False
-        self.statusIcon = ft.IconButton(icon=const.SPEAKING_ICON, icon_size=20, tooltip=const.STATUS_TOOLTIP,
+        self.info_table_ready = False
+        self.statusIcon = ft.IconButton(icon=ui_const.SPEAKING_ICON, icon_size=20, tooltip=const.STATUS_TOOLTIP,
                                         animate_opacity=ft.Animation(300), animate_rotation=ft.Animation(1000),
                                         offset=ft.Offset(1.48, 0), disabled=True,
                                         rotate=ft.Rotate(angle=0, alignment=ft.alignment.center), opacity=0)
         self.chat_history_filename = const.CHAT_HISTORY_FILENAME
-        self.load_chat_history()
-
-    @staticmethod
-    def generate_message_id():
-        return str(time.time_ns())
-
-    @staticmethod
-    def build_info_table():
-        logging.info("Building info table.")
-        table = ft.DataTable(columns=[ft.DataColumn(ft.Text(const.INFO_TABLE_HEADER_COMMAND)),
-                                      ft.DataColumn(ft.Text(const.INFO_TABLE_HEADER_ACTION))], data_row_min_height=10,
-                             data_row_max_height=45)
-
-        user_data_dir = os.path.dirname(const.INFO_TABLE_FILENAME)
-        os.makedirs(user_data_dir, exist_ok=True)
-
-        default_data = {}
-        try:
-            with open(const.DEFAULT_INFO_TABLE_FILENAME, "r", encoding="utf-8") as f:
-                default_data = json.load(f)
-                if not isinstance(default_data, dict):
-                    logging.error(f"Default commands table {const.DEFAULT_INFO_TABLE_FILENAME} has invalid format.")
-                    default_data = {}
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            logging.error(f"Could not load or parse default commands table: {e}", exc_info=True)
-
-        try:
-            with open(const.INFO_TABLE_FILENAME, "r", encoding="utf-8") as f:
-                user_data = json.load(f)
-            if not isinstance(user_data, dict):
-                logging.warning(
-                    f"User commands table {const.INFO_TABLE_FILENAME} has invalid format. It will be overwritten.")
-                user_data = {}
-        except (FileNotFoundError, json.JSONDecodeError):
-            logging.info(f"User commands table not found or corrupted. Will be created/overwritten from default.")
-            user_data = {}
-
-        if user_data != default_data and default_data:
-            logging.info("User commands table is outdated or missing. Updating from default.")
-            user_data = default_data
-            try:
-                with open(const.INFO_TABLE_FILENAME, "w", encoding="utf-8") as f:
-                    json.dump(user_data, f, ensure_ascii=False, indent=4)
-                logging.info("User commands table updated successfully.")
-            except IOError as e:
-                logging.error(f"Could not write updated commands table to {const.INFO_TABLE_FILENAME}: {e}",
-                              exc_info=True)
-
-        table_data = user_data
-        if not isinstance(table_data, dict): table_data = {}
-
-        for key, value in table_data.items():
-            if key[-1] == "*":
-                command_tooltip = const.TABLE_VARIANTS.get(key)
-                if command_tooltip:
-                    table.rows.append(ft.DataRow(cells=[ft.DataCell(ft.Text(key, size=10, tooltip=command_tooltip)),
-                                                        ft.DataCell(ft.Text(value, size=10))]))
-                else:
-                    logging.info(f"Adding command {key}, with tooltip {command_tooltip} to info table.")
-                    table.rows.append(
-                        ft.DataRow(cells=[ft.DataCell(ft.Text(key, size=10)), ft.DataCell(ft.Text(value, size=10))]))
-                    logging.warning("Error while building info table. No tooltip for command")
-            else:
-                table.rows.append(
-                    ft.DataRow(cells=[ft.DataCell(ft.Text(key, size=10)), ft.DataCell(ft.Text(value, size=10))]))
-                logging.info(f"Adding command {key} to info table.")
-        logging.info(f"Info table built with {len(table.rows)} rows.")
-        return table
+        self.chat_log_filename = const.CHAT_LOG_FILENAME
+        # History and index writes run on the IO lane; the lock keeps them in the order the messages arrived
+        self._history_lock = asyncio.Lock()
+        self.chat_history = []
+
+    def subscribe(self, bus):
+        """Підписує інтерфейс на події ядра"""
+        self.bus = bus
+        bus.subscribe(events.SettingsChanged, self.on_settings_changed)
+        bus.subscribe(events.ConfigReloaded, self.on_config_reloaded)
+        bus.subscribe(events.ChatMessage, lambda event: self.addToChat(event.text, event.role))
+        bus.subscribe(events.ChatCleared, lambda event: self.clearChat(None))
+        bus.subscribe(events.StatusChanged, lambda event: self.animateStatus(event.status))
+        bus.subscribe(events.WindowRequest, self.on_window_request)
+
+    _last_message_id = 0
+
+    @classmethod
+    def generate_message_id(cls):
+        # Strictly increasing even on a coarse clock, so ids stay unique and still sort by time
+        cls._last_message_id = max(time.time_ns(), cls._last_message_id + 1)
+        return str(cls._last_message_id)
+
+    async def fill_info_table(self):
+        """Заповнює таблицю команд; викликається під час першого відкриття довідки"""
+        rows = []
+        for key, value in (await avroraCore.load_commands_table()).items():
+            tooltip = const.TABLE_VARIANTS.get(key) if key.endswith("*") else None
+            if key.endswith("*") and not tooltip:
+                logging.warning("No tooltip for command '%s' in info table.", key)
+            rows.append(ft.DataRow(cells=[ft.DataCell(ft.Text(key, size=10, tooltip=tooltip)),
+                                          ft.DataCell(ft.Text(value, size=10))]))
+        self.infoTable.rows = rows
+        self.info_table_ready = True
+        logging.info("Info table built with %d rows.", len(rows))
 
     async def build_first_launch_view(self):
         """Будує та відображає початковий екран для першого запуску, щоб отримати ім'я користувача."""
@@ -100,7 +76,7 @@ class UI:
         self.page.clean()
         self.page.vertical_alignment = ft.MainAxisAlignment.CENTER
         self.page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
-        self.page.bgcolor = const.COLORS_DARK["MAINBGCOLOR"]
+        self.page.bgcolor = ui_const.COLORS_DARK["MAINBGCOLOR"]
         self.page.title = const.APP_NAME
 
         self.firstLaunchL = ft.Text(value=const.FIRST_LAUNCH_LABEL, size=20, text_align=const.ALIGN_CENTER, width=350)
@@ -139,6 +115,7 @@ class UI:
     async def build_ui(self):
         logging.info("Building main UI components.")
         self.settings = await avroraCore.load_settings()
+        await self.load_chat_history()
         self.page.fonts = {"Tektur": const.TEKTUR_FONT_PATH, "TekturBold": const.TEKTUR_BOLD_FONT_PATH}
         self.page.title = const.APP_NAME
         self.page.window.width = const.WINDOW_WIDTH
@@ -150,19 +127,21 @@ class UI:
         self.page.vertical_alignment = ft.MainAxisAlignment.CENTER
         self.page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
 
-        accent_color = self.settings.get("accent_color", const.DEEP_PURPLE_400)
+        accent_color = ui_const.ACCENT_COLORS.get(self.settings.get("accent_color_name"), ui_const.DEEP_PURPLE_400)
         self.page.theme = ft.Theme(color_scheme_seed=accent_color, font_family=const.FONT_FAMILY)
         self.page.dark_theme = ft.Theme(color_scheme_seed=accent_color, font_family=const.FONT_FAMILY)
 
         self.page.theme_mode = ft.ThemeMode.DARK if self.settings.get("theme") == "dark" else ft.ThemeMode.LIGHT
 
         self.settingsMenu = ft.Container(width=420, height=510, border_radius=10, offset=ft.Offset(0, -0.20),
-                                         bgcolor=const.INITIATION_COLOR, border=ft.border.all(2, ft.Colors.PRIMARY),
+                                         bgcolor=ui_const.INITIATION_COLOR, border=ft.border.all(2, ft.Colors.PRIMARY),
                                          animate_offset=ft.Animation(250), padding=10)
 
         self.infoHeader = ft.Text(const.INFO_HEADER_LABEL, size=10)
 
-        self.infoTable = self.build_info_table()
+        self.infoTable = ft.DataTable(columns=[ft.DataColumn(ft.Text(const.INFO_TABLE_HEADER_COMMAND)),
+                                               ft.DataColumn(ft.Text(const.INFO_TABLE_HEADER_ACTION))],
+                                      data_row_min_height=10, data_row_max_height=45)
 
         self.multipleCommandsHelp = ft.Markdown(const.MULTIPLE_COMMAND_VARIANTS_HELP_LABEL, selectable=True,
                                                 extension_set=const.MARKDOWN_EXTENSION_SET,
@@ -186,7 +165,7 @@ class UI:
         self.infoMenuDivider = ft.Divider(height=1, thickness=2)
 
         self.infoMenu = ft.Container(width=420, height=510, border_radius=10, offset=ft.Offset(-2.08, -0.20),
-                                     bgcolor=const.INITIATION_COLOR, border=ft.border.all(2, ft.Colors.PRIMARY),
+                                     bgcolor=ui_const.INITIATION_COLOR, border=ft.border.all(2, ft.Colors.PRIMARY),
                                      animate_offset=ft.Animation(250), padding=10)
         self.nameTlow = ft.Text(value=const.APP_FULL_NAME, text_align=const.ALIGN_CENTER, width=160, size=10)
         self.nameT = ft.Text(value=const.APP_NAME, text_align=const.ALIGN_CENTER, width=160, size=29)
@@ -202,7 +181,7 @@ class UI:
         self.chat_input = ft.TextField(hint_text=const.SEND_MSG_FIELD_LABEL, expand=True,
             on_submit=self.handle_text_command, border_radius=20, )
 
-        self.send_button = ft.IconButton(icon=const.SEND_ICON, icon_size=20, tooltip=const.SEND_BUTTON_LABEL,
+        self.send_button = ft.IconButton(icon=ui_const.SEND_ICON, icon_size=20, tooltip=const.SEND_BUTTON_LABEL,
             on_click=self.handle_text_command, )
 
         self.input_row = ft.Row(controls=[self.chat_input, self.send_button],
@@ -226,8 +205,9 @@ class UI:
 
         self.accent_color_dropdown = ft.Dropdown(label=const.ACCENT_COLOR_LABEL,
                                                  options=[ft.dropdown.Option(color_name) for color_name in
-                                                          const.ACCENT_COLORS.keys()],
-                                                 value=self.settings.get("accent_color_name", "Deep Purple"),
+                                                          ui_const.ACCENT_COLORS.keys()],
+                                                 value=self.settings.get("accent_color_name",
+                                                                         const.DEFAULT_ACCENT_COLOR),
                                                  on_change=self.switch_accent_color)
 
         self.CityI = ft.TextField(label=const.CITY_LABEL, value=self.settings.get("city") or "",
@@ -246,6 +226,11 @@ class UI:
                                         label_position=ft.LabelPosition.RIGHT,
                                         on_change=self.update_settings)
 
+        self.pasteTextCB = ft.Checkbox(label=const.PASTE_TEXT_CHECKBOX_LABEL,
+                                       value=self.settings.get("pastetext", True),
+                                       label_position=ft.LabelPosition.RIGHT,
+                                       on_change=self.update_settings)
+
         self.resetSettingsButton = ft.ElevatedButton(text=const.RESET_SETTINGS_BUTTON_LABEL, width=200, height=30,
                                                      on_click=self.resetSettings)
 
@@ -263,10 +248,10 @@ class UI:
         self.passiveL = ft.TextField(value=const.SETTINGS_LABEL, text_align=const.ALIGN_CENTER, border_width=0,
                                      border_radius=10)
 
-        self.infoB = ft.IconButton(icon=const.INFO_ICON, icon_size=20, tooltip="Команди", on_click=self.openInfo,
+        self.infoB = ft.IconButton(icon=ui_const.INFO_ICON, icon_size=20, tooltip="Команди", on_click=self.openInfo,
                                    offset=ft.Offset(0, -1))
 
-        self.settingsB = ft.IconButton(icon=const.SETTINGS_ICON, icon_size=20, tooltip="Налаштування",
+        self.settingsB = ft.IconButton(icon=ui_const.SETTINGS_ICON, icon_size=20, tooltip="Налаштування",
                                        on_click=self.openSettings, offset=ft.Offset(0, -1))
 
         self.CCmLabel = ft.TextField(value=const.CUSTOM_COMMANDS_LABEL, text_align=const.ALIGN_CENTER, border_width=0,
@@ -296,7 +281,7 @@ class UI:
                                                       self.CCmDeleteB, self.CCmButtonsRow])
 
         self.CCm = ft.Container(width=425, height=510, border_radius=10, padding=10, alignment=ft.alignment.center,
-                                content=self.CCmCol, animate_offset=ft.Animation(250), bgcolor=const.INITIATION_COLOR,
+                                content=self.CCmCol, animate_offset=ft.Animation(250), bgcolor=ui_const.INITIATION_COLOR,
                                 border=ft.border.all(2, ft.Colors.PRIMARY), offset=ft.Offset(-1.03, -1.25))
 
         self.CCmOpen = ft.ElevatedButton(text=const.CUSTOM_COMMANDS_BUTTON_LABEL, width=200, height=30,
@@ -322,7 +307,8 @@ class UI:
                                                self.TGPath, self.selectTGFile, self.useTGOnlineCB, self.settingsDivider,
                                                self.settingsGroupPermissions, self.permisionsToControlPCPowerCB,
                                                self.resetSettingsButton, self.settingsDivider, self.settingsGroupChat,
-                                               self.clearChatButton, self.silentModeCB, self.settingsDivider, self.settingsGroupCC,
+                                               self.clearChatButton, self.silentModeCB, self.pasteTextCB,
+                                               self.settingsDivider, self.settingsGroupCC,
                                                self.CCmOpen, self.settingsDivider], scroll="auto")
         self.settingsMenu.content = self.settingsCol
 
@@ -395,18 +381,61 @@ class UI:
         self.settings["num_headlines"] = int(self.NewsHeadersCountS.value)
         self.settings["theme"] = "dark" if self.themeS.value else "light"
         self.settings["silentmode"] = self.silentModeCB.value
+        self.settings["pastetext"] = self.pasteTextCB.value
 
         await avroraCore.save_settings(self.settings)
 
         self.selectTGFile.disabled = self.settings.get("tgo", False)
         self.selectTGFile.update()
 
+    async def refresh_cc_dropdown(self):
+        """Перебудовує список власних команд"""
         self.CCmDropdownOptions = [ft.dropdown.Option("", text=const.NEW_COMMAND_LABEL)]
         for key in (await avroraCore.load_cc()).keys():
             self.CCmDropdownOptions.append(ft.dropdown.Option(key, text=key))
 
         self.CCmDropdown.options = self.CCmDropdownOptions
         self.CCmDropdown.update()
+        # Custom commands are listed in the info table too, so it is rebuilt on the next opening
+        self.info_table_ready = False
+
+    async def on_settings_changed(self, event):
+        """Показує в налаштуваннях зміни, які зробило ядро, не зберігаючи їх удруге"""
+        await self._show_settings(event.changes)
+
+    async def on_config_reloaded(self, event):
+        """Оновлює лише ті частини інтерфейсу, яких торкнулося перечитування налаштувань"""
+        await self._show_settings({key: value for key, value in event.settings.items()
+                                   if self.settings.get(key) != value})
+        await self.refresh_cc_dropdown()
+
+    async def _show_settings(self, changes):
+        self.settings.update(changes)
+        widgets = {"name": self.YourNameI, "city": self.CityI, "silentmode": self.silentModeCB,
+                   "num_headlines": self.NewsHeadersCountS, "music": self.musicLinkI, "tgo": self.useTGOnlineCB,
+                   "pcpower": self.permisionsToControlPCPowerCB, "pastetext": self.pasteTextCB}
+        for key, widget in widgets.items():
+            if key in changes:
+                widget.value = changes[key]
+                widget.update()
+        if "tgpath" in changes:
+            self.TGPath.value = f"{const.TG_PATH_LABEL_PREFIX}{changes['tgpath']}"
+        if "tgo" in changes:
+            self.selectTGFile.disabled = changes["tgo"]
+        if "theme" in changes:
+            self.themeS.value = changes["theme"] == const.THEME_DARK
+            self.themeS.update()
+            await self._apply_theme_mode(changes["theme"])
+        if "accent_color_name" in changes:
+            self.accent_color_dropdown.value = changes["accent_color_name"]
+            self.accent_color_dropdown.update()
+            await self._apply_accent_color(changes["accent_color_name"])
+        self.page.update()
+
+    async def on_window_request(self, event):
+        self.page.window.minimized = event.minimized
+        self.page.window.focused = event.focused
+        self.page.update()
 
     def openSettings(self, e):
         if not self.settings_is_open and not self.info_is_open:
@@ -421,9 +450,11 @@ class UI:
             self.infoB.disabled = False
         self.page.update()
 
-    def openInfo(self, e):
+    async def openInfo(self, e):
         if not self.info_is_open and not self.settings_is_open:
             logging.info("Opening info menu.")
+            if not self.info_table_ready:
+                await self.fill_info_table()
             self.infoMenu.offset = ft.Offset(-1.029, -0.20)
             self.info_is_open = True
             self.settingsB.disabled = True
@@ -446,6 +477,7 @@ class UI:
         self.permisionsToControlPCPowerCB.value = False
         self.CityI.value = ""
         self.silentModeCB.value = False
+        self.pasteTextCB.value = True
         self.NewsHeadersCountS.value = 5
         await self.update_settings(None)
         logging.info("Settings have been reset to default.")
@@ -459,42 +491,36 @@ class UI:
             await asyncio.sleep(delay)
         return False
 
-    async def switch_theme(self, e):
-        """Handles the theme switch, updates the page, and saves the setting."""
-        new_theme_str = "dark" if self.themeS.value else "light"
-        self.page.theme_mode = ft.ThemeMode.DARK if self.themeS.value else ft.ThemeMode.LIGHT
-        logging.info(f"Theme switched to {new_theme_str}.")
-
-        self.settings['theme'] = new_theme_str
-        await avroraCore.save_settings(self.settings)
-
+    async def _apply_theme_mode(self, theme):
+        self.page.theme_mode = ft.ThemeMode.DARK if theme == const.THEME_DARK else ft.ThemeMode.LIGHT
+        logging.info(f"Theme switched to {theme}.")
         await self.wait_for_theme_initialization()
-
-        self.update_chat_from_history()
         await self.apply_and_update_theme()
 
-    async def switch_accent_color(self, e):
-        """Handles the accent color switch, updates the theme, and saves the setting."""
-        color_name = self.accent_color_dropdown.value
-        color_value = const.ACCENT_COLORS[color_name]
+    async def _apply_accent_color(self, color_name):
+        color_value = ui_const.ACCENT_COLORS[color_name]
         logging.info(f"Accent color switched to {color_name}.")
-
         self.page.theme.color_scheme_seed = color_value
         self.page.dark_theme.color_scheme_seed = color_value
+        await self.wait_for_theme_initialization()
+        await self.apply_and_update_theme()
 
-        self.settings['accent_color_name'] = color_name
-        self.settings['accent_color'] = color_value
+    async def switch_theme(self, e):
+        """Handles the theme switch, updates the page, and saves the setting."""
+        self.settings['theme'] = const.THEME_DARK if self.themeS.value else const.THEME_LIGHT
         await avroraCore.save_settings(self.settings)
+        await self._apply_theme_mode(self.settings['theme'])
 
-        await self.wait_for_theme_initialization()
-
-        self.update_chat_from_history()
-        self.page.update()
-        await self.apply_and_update_theme()
+    async def switch_accent_color(self, e):
+        """Handles the accent color switch, updates the theme, and saves the setting."""
+        self.settings['accent_color_name'] = self.accent_color_dropdown.value
+        await avroraCore.save_settings(self.settings)
+        await self._apply_accent_color(self.settings['accent_color_name'])
 
     async def open_CCm(self, e):
         logging.info("Opening Custom Commands menu.")
         await self.update_settings(None)
+        await self.refresh_cc_dropdown()
         self.openSettings(None)
         self.settingsB.disabled = True
         self.infoB.disabled = True
@@ -531,6 +557,7 @@ class UI:
         self.CCmActionI.value = ""
         self.CCmDropdown.value = self.CCmDropdownOptions[0]
         await avroraCore.save_cc(json_file)
+        await self.refresh_cc_dropdown()
         logging.info(f"Successfully deleted custom command: '{command_to_delete}'")
         self.CCmActionI.update()
         self.CCmNameI.update()
@@ -557,21 +584,21 @@ class UI:
         self.page.update()
 
     async def animateStatus(self, status):
-        logging.debug(f"Animating status to: '{status}'")
+        logging.debug("Animating status to: '%s'", status)
         if status == const.STATUS_THINKING:
-            self.statusIcon.icon = const.LOADING_ICON
+            self.statusIcon.icon = ui_const.LOADING_ICON
             self.statusIcon.animate_rotation = ft.Animation(1000)
             self.statusIcon.rotate = ft.Rotate(angle=360, alignment=ft.alignment.center)
             self.statusIcon.opacity = 1
         elif status == const.STATUS_LISTENING:
-            self.statusIcon.icon = const.MIC_ICON
+            self.statusIcon.icon = ui_const.MIC_ICON
             self.statusIcon.opacity = 0
             await asyncio.sleep(0.1)
             self.statusIcon.animate_rotation = None
             self.statusIcon.rotate = ft.Rotate(angle=0, alignment=ft.alignment.center)
             self.statusIcon.opacity = 1
         elif status == const.STATUS_SPEAKING:
-            self.statusIcon.icon = const.SPEAKING_ICON
+            self.statusIcon.icon = ui_const.SPEAKING_ICON
             self.statusIcon.opacity = 0
             await asyncio.sleep(0.1)
             self.statusIcon.animate_rotation = None
@@ -584,7 +611,26 @@ class UI:
         await asyncio.sleep(0.1)
         self.page.update()
 
-    def _create_chat_message(self, text, user, message_id=None):
+    @staticmethod
+    def _text_with_links(text, text_color, text_align):
+        """Створює текст повідомлення, у якому посилання можна натиснути"""
+        if not _URL_PATTERN.search(text):
+            return ft.Text(value=text, selectable=True, text_align=text_align, overflow=ft.TextOverflow.CLIP)
+        spans = []
+        last_end = 0
+        for match in _URL_PATTERN.finditer(text):
+            start, end = match.span()
+            url = match.group(0)
+            if start > last_end:
+                spans.append(ft.TextSpan(text[last_end:start], ft.TextStyle(color=text_color)))
+            spans.append(ft.TextSpan(url, ft.TextStyle(color=ft.Colors.BLUE_400,
+                                                       decoration=ft.TextDecoration.UNDERLINE), url=url))
+            last_end = end
+        if last_end < len(text):
+            spans.append(ft.TextSpan(text[last_end:], ft.TextStyle(color=text_color)))
+        return ft.Text(spans=spans, selectable=True, text_align=text_align, overflow=ft.TextOverflow.CLIP)
+
+    def _create_chat_message(self, text, user, message_id=None, payload=None):
         active_theme = self.page.dark_theme if self.page.theme_mode == ft.ThemeMode.DARK else self.page.theme
 
         try:
@@ -604,7 +650,7 @@ class UI:
 
         except Exception as e:
             logging.warning(f"Failed to get colors from theme: {e}, using fallback colors")
-            fallback_colors = const.CHAT_FALLBACK_COLORS
+            fallback_colors = ui_const.CHAT_FALLBACK_COLORS
             if user == const.USER_ROLE:
                 bubble_color = fallback_colors["user_bubble"]
                 text_color = fallback_colors["user_text"]
@@ -615,41 +661,8 @@ class UI:
                 bubble_color = fallback_colors["system_bubble"]
                 text_color = fallback_colors["system_text"]
 
-        url_pattern = re.compile(r"https?://\S+")
-        spans = []
-
-        if url_pattern.search(text):
-            last_end = 0
-            for match in url_pattern.finditer(text):
-                start, end = match.span()
-                url = match.group(0)
-                if start > last_end:
-                    spans.append(ft.TextSpan(text[last_end:start], ft.TextStyle(color=text_color)))
-                spans.append(
-                    ft.TextSpan(url, ft.TextStyle(color=ft.Colors.BLUE_400, decoration=ft.TextDecoration.UNDERLINE),
-                                url=url))
-                last_end = end
-            if last_end < len(text):
-                spans.append(ft.TextSpan(text[last_end:], ft.TextStyle(color=text_color)))
-            if user == const.USER_ROLE:
-                text_widget = ft.Text(spans=spans, selectable=True, text_align=const.ALIGN_RIGHT,
-                                      overflow=ft.TextOverflow.CLIP)
-            elif user == const.PROGRAM_ROLE:
-                text_widget = ft.Text(spans=spans, selectable=True, text_align=const.ALIGN_LEFT,
-                                      overflow=ft.TextOverflow.CLIP)
-            else:
-                text_widget = ft.Text(spans=spans, selectable=True, text_align=const.ALIGN_CENTER,
-                                      overflow=ft.TextOverflow.CLIP)
-        else:
-            if user == const.USER_ROLE:
-                text_widget = ft.Text(value=text, selectable=True, text_align=const.ALIGN_RIGHT,
-                                      overflow=ft.TextOverflow.CLIP)
-            elif user == const.PROGRAM_ROLE:
-                text_widget = ft.Text(value=text, selectable=True, text_align=const.ALIGN_LEFT,
-                                      overflow=ft.TextOverflow.CLIP)
-            else:
-                text_widget = ft.Text(value=text, selectable=True, text_align=const.ALIGN_CENTER,
-                                      overflow=ft.TextOverflow.CLIP)
+        text_align = (const.ALIGN_RIGHT if user == const.USER_ROLE else const.ALIGN_LEFT if user == const.PROGRAM_ROLE
+                      else const.ALIGN_CENTER)
         author = ft.Text(text_align=const.ALIGN_LEFT, selectable=True, weight=ft.FontWeight.BOLD)
         if user == const.USER_ROLE:
             author.value = self.settings.get('name', '')
@@ -659,56 +672,36 @@ class UI:
         alignment = (
             ft.MainAxisAlignment.END if user == const.USER_ROLE else ft.MainAxisAlignment.START if user == const.PROGRAM_ROLE else ft.MainAxisAlignment.CENTER)
 
-        if text.startswith("Прогноз погоди") and user == const.PROGRAM_ROLE:
-            text_split = text.split(".")
-            weather_type = text_split[1].replace(" На небі ", "").lower()
-            temperature = text_split[0].split(":")[1].split(" ")[2]
-            weather_icon = const.WEATHER_ICONS.get(weather_type, const.INFO_ICON)
-            forecast_sample = ft.Container(ft.Column(controls=[
-                ft.Text(const.WEATHER_HEADER_LABEL.format(self.settings.get("city", "")), text_align=const.ALIGN_CENTER,
-                        size=15), ft.Row(controls=[ft.Icon(weather_icon, size=35, tooltip=weather_type)], spacing=20),
-                ft.Row(controls=[ft.Icon(const.THERMOSTAT_ICON, size=35, tooltip="Температура"),
+        kind = payload.get("kind") if payload else const.MESSAGE_KIND_TEXT
+        if kind == const.MESSAGE_KIND_WEATHER:
+            weather_type = str(payload["condition"]).lower()
+            temperature = payload["temperature"]
+            weather_icon = ui_const.WEATHER_ICONS.get(weather_type, ui_const.INFO_ICON)
+            content = [author, ft.Container(ft.Column(controls=[
+                ft.Text(const.WEATHER_HEADER_LABEL.format(payload["city"]), text_align=const.ALIGN_CENTER, size=15),
+                ft.Row(controls=[ft.Icon(weather_icon, size=35, tooltip=weather_type)], spacing=20),
+                ft.Row(controls=[ft.Icon(ui_const.THERMOSTAT_ICON, size=35, tooltip="Температура"),
                                  ft.Text(f": {temperature}℃", size=35, text_align=const.ALIGN_LEFT)]),
                 ft.Text(f"{weather_type}, температура {temperature}℃", size=15, text_align=const.ALIGN_LEFT)],
-                spacing=10), expand=True, expand_loose=True)
-
-            new_message = ft.Row(alignment=alignment, controls=[
-                ft.Container(content=ft.Column(controls=[author, forecast_sample], spacing=5), bgcolor=bubble_color,
-                             border_radius=10, padding=10, margin=5, expand=True, expand_loose=True)])
-
-        elif text.startswith("Ось останні ") and user == const.PROGRAM_ROLE:
-            text_split = text.split("\n")
-            text_widget = [author]
-            for i in range(0, len(text_split)):
-                if len(text_split[i]) > 1:
-                    spans = []
-                    if text_split[i][1] == ".":
-                        text_widget.append(ft.Text(value=text_split[i], selectable=True, text_align=const.ALIGN_LEFT))
-                        text_widget.append(ft.Divider(height=1, thickness=3, color=ft.Colors.PRIMARY))
-                    elif url_pattern.search(text_split[i]):
-                        last_end = 0
-                        for match in url_pattern.finditer(text_split[i]):
-                            start, end = match.span()
-                            url = match.group(0)
-                            if start > last_end:
-                                spans.append(ft.TextSpan(text_split[i][last_end:start], ft.TextStyle(color=text_color)))
-                            spans.append(ft.TextSpan(url, ft.TextStyle(color=ft.Colors.BLUE_400,
-                                                                       decoration=ft.TextDecoration.UNDERLINE),
-                                                     url=url))
-                            last_end = end
-                        if last_end < len(text_split[i]):
-                            spans.append(ft.TextSpan(text_split[i][last_end:], ft.TextStyle(color=text_color)))
-                        text_widget.append(ft.Text(spans=spans, selectable=True, text_align=const.ALIGN_LEFT))
-                    else:
-                        text_widget.append(ft.Text(value=text_split[i], selectable=True, text_align=const.ALIGN_LEFT))
-            new_message = ft.Row(alignment=alignment, controls=[
-                ft.Container(content=ft.Column(controls=text_widget, spacing=5), bgcolor=bubble_color, border_radius=10,
-                             padding=10, margin=5, expand=True, expand_loose=True)])
-
+                spacing=10), expand=True, expand_loose=True)]
+        elif kind == const.MESSAGE_KIND_NEWS:
+            content = [author, ft.Text(const.NEWS_HEADER_LABEL, size=15, weight=ft.FontWeight.BOLD)]
+            for i, headline in enumerate(payload["headlines"], 1):
+                content.append(ft.Text(value=f"{i}. {headline}", selectable=True, text_align=const.ALIGN_LEFT))
+                content.append(ft.Divider(height=1, thickness=3, color=ft.Colors.PRIMARY))
+            content.append(self._text_with_links(f"{const.NEWS_SOURCE_LABEL}{payload['source']}", text_color,
+                                                 const.ALIGN_LEFT))
+        elif kind == const.MESSAGE_KIND_TODO:
+            content = [author, ft.Text(const.TODO_HEADER_LABEL, size=15, weight=ft.FontWeight.BOLD)]
+            for task in payload["tasks"]:
+                content.append(ft.Row(controls=[ft.Icon(ui_const.TODO_ITEM_ICON, size=18),
+                                                ft.Text(value=task, selectable=True, expand=True)]))
         else:
-            new_message = ft.Row(alignment=alignment, controls=[
-                ft.Container(content=ft.Column(controls=[author, text_widget], spacing=5), bgcolor=bubble_color,
-                             border_radius=10, padding=10, margin=5, expand=True, expand_loose=True)])
+            content = [author, self._text_with_links(text, text_color, text_align)]
+
+        new_message = ft.Row(alignment=alignment, controls=[
+            ft.Container(content=ft.Column(controls=content, spacing=5), bgcolor=bubble_color, border_radius=10,
+                         padding=10, margin=5, expand=True, expand_loose=True)])
 
         if message_id:
             new_message.data = message_id
@@ -716,62 +709,116 @@ class UI:
         return new_message
 
     async def addToChat(self, text, user):
-        logging.debug(f"Adding to chat: user='{user}', text='{text}'")
-        new_message = self._create_chat_message(text, user)
-        self.msgsCol.controls.append(new_message)
-        self.save_chat_history(text, user)
-        self.msgsCol.update()
-        self.page.update()
+        logging.debug("Adding to chat: user='%s', text='%s'", user, text)
+        with tracing.span("ui_flush", role=user):
+            payload = messages.payload_of(text)
+            new_message = self._create_chat_message(text, user, payload=payload)
+            self.msgsCol.controls.append(new_message)
+            self.msgsCol.update()
+            self.page.update()
+            await self.save_chat_history(text, user, payload)
         await asyncio.sleep(0.1)
         self.msgsCol.scroll_to(offset=-1, duration=300)
         self.page.update()
 
-    def on_startup(self):
-        self.load_chat_history()
+    async def on_startup(self):
+        await self.load_chat_history()
         self.update_chat_from_history()
 
-    def clearChat(self, e):
+    async def clearChat(self, e):
         logging.info("Clearing chat history.")
         self.msgsCol.controls.clear()
         self.chat_history.clear()
-        self._save_history_to_file()
+        avroraCore.chat_index.clear()
         self.msgsCol.update()
         self.page.update()
+        async with self._history_lock:
+            await executors.IO.run(self._write_chat_log, [])
+            await executors.IO.run(avroraCore.chat_index.clear_log)
 
-    def save_chat_history(self, text, user):
+    async def save_chat_history(self, text, user, payload=None):
         logging.debug("Saving new message to chat history.")
-        new_message = {"text": text, "user": user, "id": self.generate_message_id()}
+        new_message = {"text": str(text), "user": user, "id": self.generate_message_id()}
+        if payload:
+            new_message["payload"] = payload
         self.chat_history.append(new_message)
-        self._save_history_to_file()
+        index_line = avroraCore.chat_index.add(new_message)
+        log_line = json.dumps(new_message, ensure_ascii=False) + "\n"
+        async with self._history_lock:
+            await executors.IO.run(self._append_to_chat_log, log_line)
+            await executors.IO.run(avroraCore.chat_index.append_to_log, index_line)
 
-    def _save_history_to_file(self):
-        logging.debug(f"Writing chat history to file: {self.chat_history_filename}")
-        with open(self.chat_history_filename, "w", encoding="utf-8") as f:
-            json.dump(self.chat_history, f, ensure_ascii=False, indent=4)
-
-    def load_chat_history(self):
-        logging.info(f"Loading chat history from {self.chat_history_filename}")
+    def _append_to_chat_log(self, line):
+        try:
+            with open(self.chat_log_filename, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            logging.error("Failed to append to chat history %s: %s", self.chat_log_filename, e, exc_info=True)
+
+    def _write_chat_log(self, history):
+        """Атомарно переписує журнал чату; потрібно лише під час імпорту старої історії та очищення"""
+        logging.debug("Writing chat history to file: %s", self.chat_log_filename)
+        tmp_filename = f"{self.chat_log_filename}.tmp"
+        with open(tmp_filename, "w", encoding="utf-8") as f:
+            for message in history:
+                f.write(json.dumps(message, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, self.chat_log_filename)
+
+    async def load_chat_history(self):
+        """Читає історію чату і завантажує індекс пошуку в пулі IO, щоб не блокувати цикл подій"""
+        async with self._history_lock:
+            self.chat_history = await executors.IO.run(self._read_chat_history)
+
+    def _read_chat_history(self):
+        if os.path.exists(self.chat_log_filename):
+            logging.info("Loading chat history from %s", self.chat_log_filename)
+            chat_history = []
+            with open(self.chat_log_filename, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        chat_history.append(json.loads(line))
+                    except ValueError:
+                        logging.warning("Skipping corrupted line in chat history '%s'.", self.chat_log_filename)
+        else:
+            chat_history = self._import_legacy_history()
+        try:
+            avroraCore.chat_index.load(chat_history)
+        except (OSError, KeyError, TypeError) as e:
+            logging.error(f"Failed to load chat index: {e}", exc_info=True)
+        return chat_history
+
+    def _import_legacy_history(self):
+        """Переносить історію зі старого файлу JSON у журнал, додаючи id повідомленням, у яких його немає"""
+        chat_history = []
         if os.path.exists(self.chat_history_filename):
             with open(self.chat_history_filename, "r", encoding="utf-8") as f:
                 try:
-                    self.chat_history = json.load(f)
-                    if isinstance(self.chat_history, list) and all(isinstance(item, str) for item in self.chat_history):
-                        new_chat_history = []
-                        for message in self.chat_history:
-                            new_chat_history.append(
-                                {"text": message, "user": const.PROGRAM_ROLE, "id": self.generate_message_id()})
-                        self.chat_history = new_chat_history
-                    elif isinstance(self.chat_history, list) and all(
-                            isinstance(item, dict) for item in self.chat_history):
-                        for message in self.chat_history:
+                    chat_history = json.load(f)
+                    if isinstance(chat_history, list) and all(isinstance(item, str) for item in chat_history):
+                        chat_history = [{"text": message, "user": const.PROGRAM_ROLE, "id": self.generate_message_id()}
+                                        for message in chat_history]
+                    elif isinstance(chat_history, list) and all(
+                            isinstance(item, dict) for item in chat_history):
+                        for message in chat_history:
                             if "id" not in message:
                                 message["id"] = self.generate_message_id()
+                    else:
+                        chat_history = []
                 except json.JSONDecodeError:
                     logging.error(f"Failed to decode chat history file: {self.chat_history_filename}", exc_info=True)
-                    self.chat_history = []
+                    chat_history = []
+            logging.info("Imported %d messages from '%s'.", len(chat_history), self.chat_history_filename)
         else:
             logging.info("Chat history file not found, starting with empty history.")
-            self.chat_history = []
+        try:
+            self._write_chat_log(chat_history)
+        except OSError as e:
+            logging.error(f"Failed to write chat history log: {e}", exc_info=True)
+        return chat_history
 
     def update_chat_from_history(self):
         self.msgsCol.controls.clear()
@@ -779,7 +826,7 @@ class UI:
             text = message["text"]
             user = message["user"]
             message_id = message["id"]
-            new_message = self._create_chat_message(text, user, message_id)
+            new_message = self._create_chat_message(text, user, message_id, message.get("payload"))
             self.msgsCol.controls.append(new_message)
         self.page.update()
 
@@ -789,6 +836,7 @@ class UI:
         for i in command:
             temp[i[0]] = i[1]
         await avroraCore.save_cc(temp)
+        await self.refresh_cc_dropdown()
 
     async def handle_text_command(self, e):
         """Обробляє команди, введені в текстове поле."""
@@ -796,21 +844,23 @@ class UI:
         if not command_text:
             return
         self.chat_input.value = ""
-        await self.addToChat(command_text, const.USER_ROLE)
-        logging.info(f"Text command received: {command_text}.")
-        ans, result_message = await avroraCore.what_command(command_text.lower(), self, self.page, self.settings)
-
-        logging.info(f"what_command returned: ans='{ans}', message='{result_message}'")
-        if ans == 1:
-            await avroraCore.tts(const.RESPONSE_CLARIFY, on_status_change=None)
-            result_message = const.RESPONSE_CLARIFY
-        elif ans == "standard":
-            ans_random = random.randint(0, 2)
-            generic_responses = [resp.format(self.settings.get('name', '')) for resp in
-                                 const.GENERIC_AFFIRMATIVE_RESPONSES]
-            logging.info("Standard response sent.")
-            result_message = generic_responses[ans_random]
-            await avroraCore.tts(result_message, on_status_change=None)
-        await  self.addToChat(result_message, const.PROGRAM_ROLE)
+        avroraCore.stop_speaking()
+        avroraCore.use_bus(self.bus)
+        with tracing.trace("text_command"):
+            await self.addToChat(command_text, const.USER_ROLE)
+            logging.info("Text command received: %s.", command_text)
+            with tracing.span("normalize"):
+                utterance = textNormalizer.normalize(command_text)
+            ans, result_message = await avroraCore.dispatch(utterance, self.settings)
+
+            logging.info("dispatch returned: ans='%s', message='%s'", ans, result_message)
+            if ans == 1:
+                await avroraCore.tts(const.RESPONSE_CLARIFY)
+                result_message = const.RESPONSE_CLARIFY
+            elif ans == "standard":
+                logging.info("Standard response sent.")
+                result_message = avroraCore.affirmative_response(self.settings)
+                await avroraCore.tts(result_message)
+            await self.addToChat(result_message, const.PROGRAM_ROLE)
 
-        self.page.update()
+            self.page.update()
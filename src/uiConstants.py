@@ -0,0 +1,47 @@
+import flet as ft
+
+# Base Colors (used for themes)
+DEEP_PURPLE_400 = ft.Colors.DEEP_PURPLE_400
+PURPLE_400 = ft.Colors.PURPLE_400
+DEEP_PURPLE_500 = ft.Colors.DEEP_PURPLE_500
+INITIATION_COLOR = ft.Colors.SURFACE_CONTAINER_HIGHEST
+
+# Theme Colors
+COLORS_DARK = {"BGCOLOR": "#2f0c3d", "MAINBGCOLOR": "#151218", "MAINCOLOR": ft.Colors.PURPLE_300,
+               "ICON_COLOR": ft.Colors.PURPLE_300, }
+
+COLORS_LIGHT = {"BGCOLOR": "#f3e5f5", "MAINBGCOLOR": "#fafafa", "MAINCOLOR": ft.Colors.DEEP_PURPLE_400,
+                "ICON_COLOR": ft.Colors.PURPLE_600, }
+
+ACCENT_COLORS = {"Deep Purple": ft.Colors.DEEP_PURPLE_400, "Indigo": ft.Colors.INDIGO_400, "Blue": ft.Colors.BLUE_400,
+                 "Teal": ft.Colors.TEAL_400, "Green": ft.Colors.GREEN_400, "Orange": ft.Colors.ORANGE_400,
+                 "Pink": ft.Colors.PINK_400, }
+
+CHAT_FALLBACK_COLORS = {"user_bubble": ft.Colors.PRIMARY_CONTAINER, "user_text": ft.Colors.ON_PRIMARY_CONTAINER,
+                        "bot_bubble": ft.Colors.SECONDARY_CONTAINER, "bot_text": ft.Colors.ON_SECONDARY_CONTAINER,
+                        "system_bubble": ft.Colors.TERTIARY_CONTAINER, "system_text": ft.Colors.ON_TERTIARY_CONTAINER}
+
+# UI Icons
+INFO_ICON = ft.Icons.INFO
+SETTINGS_ICON = ft.Icons.SETTINGS
+MIC_ICON = ft.Icons.MIC_NONE
+LOADING_ICON = ft.Icons.AUTORENEW_ROUNDED
+SPEAKING_ICON = ft.Icons.VOLUME_UP_OUTLINED
+SUNNY_ICON = ft.Icons.SUNNY
+CLOUDY_ICON = ft.Icons.WB_CLOUDY
+WATER_DROP_ICON = ft.Icons.WATER_DROP
+THUNDER_STORM_ICON = ft.Icons.THUNDERSTORM
+CLOUDY_SNOWING_ICON = ft.Icons.CLOUDY_SNOWING
+FOGGY_ICON = ft.Icons.FOGGY
+THERMOSTAT_ICON = ft.Icons.DEVICE_THERMOSTAT
+SEND_ICON = ft.Icons.SEND
+TODO_ITEM_ICON = ft.Icons.CHECK_BOX_OUTLINE_BLANK
+
+# Icons of weather
+WEATHER_ICONS = {"ясно": SUNNY_ICON, "сонячно": SUNNY_ICON, "мінлива хмарність": CLOUDY_ICON, "хмарно": CLOUDY_ICON,
+                 "похмуро": CLOUDY_ICON, "туман": FOGGY_ICON, "мгла": FOGGY_ICON, "дощ": WATER_DROP_ICON,
+                 "легкий дощ": WATER_DROP_ICON, "злива": THUNDER_STORM_ICON, "гроза": THUNDER_STORM_ICON,
+                 "сніг": CLOUDY_SNOWING_ICON, "легкий сніг": CLOUDY_SNOWING_ICON, "мокрий сніг": CLOUDY_SNOWING_ICON,
+                 "хуртовина": CLOUDY_SNOWING_ICON, "град": CLOUDY_SNOWING_ICON,
+                 "невеликий дощ з грозою": THUNDER_STORM_ICON, "дощ зі снігом": CLOUDY_SNOWING_ICON,
+                 "змінна хмарність": CLOUDY_ICON}
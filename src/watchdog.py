@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+import constants as const
+import metrics
+
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _describe(frame):
+    return f"{os.path.basename(frame.filename)}:{frame.lineno} in {frame.name}"
+
+
+def _blocking_site(stack):
+    """Повертає найглибший рядок коду самої програми в стеку, тобто місце, звідки зроблено блокуючий виклик"""
+    for frame in reversed(stack):
+        if os.path.dirname(os.path.abspath(frame.filename)) == _SRC_DIR and frame.filename != __file__:
+            return _describe(frame)
+    return _describe(stack[-1]) if stack else "unknown"
+
+
+class LoopWatchdog:
+    """Стежить з окремого потоку, чи цикл подій вчасно прокидається, і повідомляє, на якому рядку він завис
+
+    Цикл подій кожні interval секунд відмічається, що живий. Якщо відмітка запізнюється більше ніж на threshold,
+    потік знімає стек головного потоку, поки той ще заблокований, і запам'ятовує задачу, яка тоді виконувалася.
+    """
+
+    def __init__(self, threshold=const.WATCHDOG_THRESHOLD, interval=const.WATCHDOG_INTERVAL, keep=const.WATCHDOG_KEEP):
+        self.threshold = threshold
+        self.interval = interval
+        self._loop = None
+        self._loop_thread = None
+        self._expected = 0.0
+        self._handle = None
+        self._stall = None
+        self._stalls = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Запускає спостереження; викликається з потоку циклу подій"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._schedule()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="avrora-watchdog", daemon=True)
+        self._thread.start()
+        logging.info("Event loop watchdog started.")
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        logging.info("Event loop watchdog stopped.")
+
+    def _schedule(self):
+        self._expected = time.perf_counter() + self.interval
+        self._handle = self._loop.call_later(self.interval, self._heartbeat)
+
+    def _heartbeat(self):
+        lag = max(0.0, time.perf_counter() - self._expected)
+        metrics.LOOP_LAG.observe(lag)
+        with self._lock:
+            stall, self._stall = self._stall, None
+        if stall is not None:
+            self._finish(stall, lag)
+        self._schedule()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            blocked_for = time.perf_counter() - self._expected
+            if blocked_for < self.threshold or self._stall is not None:
+                continue
+            try:
+                stall = self._capture(blocked_for)
+            except Exception as e:
+                logging.error("Watchdog could not capture the event loop stack: %s", e)
+                continue
+            if stall is None:
+                continue
+            with self._lock:
+                self._stall = stall
+            logging.warning("Event loop blocked for %.2fs at %s (task %s, calling %s):\n%s", blocked_for,
+                            stall["site"], stall["task"], stall["call"], "".join(stall["stack"]))
+
+    def _capture(self, blocked_for):
+        frame = sys._current_frames().get(self._loop_thread)
+        if frame is None:
+            return None
+        stack = traceback.extract_stack(frame)
+        task = asyncio.current_task(self._loop)
+        task_name = f"{task.get_name()} ({task.get_coro().__qualname__})" if task is not None else "callback"
+        return {"started": time.time() - blocked_for, "duration": None, "site": _blocking_site(stack),
+                "call": _describe(stack[-1]) if stack else "unknown", "task": task_name,
+                "stack": traceback.format_list(stack)}
+
+    def _finish(self, stall, duration):
+        stall["duration"] = duration
+        metrics.LOOP_STALLS.inc(site=stall["site"])
+        metrics.LOOP_STALL_DURATION.observe(duration)
+        with self._lock:
+            self._stalls.append(stall)
+        logging.warning("Event loop was blocked for %.2fs at %s.", duration, stall["site"])
+
+    def recent(self):
+        """Повертає останні блокування циклу подій, від найновішого"""
+        with self._lock:
+            return list(reversed(self._stalls))